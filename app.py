@@ -1,13 +1,30 @@
 import os
+import click
 from dotenv import load_dotenv
-from flask import Flask, jsonify
-from flask_smorest import Api
-from flask_jwt_extended import JWTManager
-from mongoengine import connect, get_db
-import certifi
 
+# Before the project imports: several modules read their settings on import.
 load_dotenv()
-app = Flask(__name__)
+
+from flask import Flask, jsonify, request
+from flask_smorest import Api
+from flask_jwt_extended import JWTManager
+from werkzeug.middleware.proxy_fix import ProxyFix
+from mongoengine import connect, disconnect
+from models.indexes import (
+    ensure_indexes,
+    ensure_indexes_in_background,
+    require_unique_indexes,
+)
+from resources import compression, health, metrics, query_tracker
+from resources.openapi import PrebuiltSpecApi
+from resources.ratelimit import add_rate_limit_headers, check_rate_limit
+from resources.auth_resource import blp as AuthBlueprint
+from resources.tribe_resource import blp as TribeBlueprint
+from resources.artist_resource import blp as ArtistBlueprint
+from resources.artifact_resource import blp as ArtifactBlueprint
+from resources.diagnostics_resource import blp as DiagnosticsBlueprint
+from resources.search_resource import blp as SearchBlueprint
+from resources.stats_resource import blp as StatsBlueprint
 
 
 # ─── Mongo
@@ -15,67 +32,234 @@ def _mongo_tls_enabled() -> bool:
     return os.getenv("MONGO_TLS", "true").lower() == "true"
 
 
-connect(
-    host=os.getenv("MONGO_URI"),
-    uuidRepresentation="standard",
-    tls=_mongo_tls_enabled(),
-tlsCAFile=certifi.where() if _mongo_tls_enabled() else None,
+def _mongo_client_class() -> dict:
+    # MONGO_CLIENT=mongomock serves from an in-memory stand-in (benchmarks,
+    # demos); mongomock is not installed by requirements.txt.
+    if os.getenv("MONGO_CLIENT", "pymongo").lower() == "mongomock":
+        import mongomock
 
-)
+        return {"mongo_client_class": mongomock.MongoClient}
+    return {}
 
-# ─── JWT
-app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY")
-jwt = JWTManager(app)
-
-# ─── Basic Swagger info
-app.config.update(
-    API_TITLE="Aboriginal Art API",
-    API_VERSION="1.0",
-    OPENAPI_VERSION="3.0.2",
-    OPENAPI_URL_PREFIX="",
-    OPENAPI_JSON_PATH="openapi.json",
-    OPENAPI_SWAGGER_UI_PATH="docs",
-    OPENAPI_SWAGGER_UI_URL="https://cdn.jsdelivr.net/npm/swagger-ui-dist@4.18.0/",
-)
 
-# ─── BearerAuth scheme & global requirement
-security_schemes = {
-    "BearerAuth": {"type": "http", "scheme": "bearer", "bearerFormat": "JWT"}
-}
-global_security = [{"BearerAuth": []}]
+def _mongo_pool_options() -> dict:
+    # Per process: each worker holds up to maxPoolSize connections per server.
+    options = {
+        "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+        "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+    }
+    if os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS"):
+        options["waitQueueTimeoutMS"] = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS"))
+    return options
+
+
+def _mongo_tls_options() -> dict:
+    if not _mongo_tls_enabled():
+        return {"tls": False}
+    import certifi  # ~35ms to import: only when TLS is on
+
+    return {"tls": True, "tlsCAFile": certifi.where()}
+
+
+def connect_db():
+    """(Re)connect the default alias.
+
+    The client connects on first use (``connect=False``): no SRV lookup,
+    server selection or TLS handshake at import time.
+    """
+    disconnect()
+    health.pool.clear()  # counts inherited across a fork are not ours
+    connect(
+        host=os.getenv("MONGO_URI"),
+        uuidRepresentation="standard",
+        connect=False,
+        event_listeners=[
+            *metrics.event_listeners(),
+            query_tracker.listener,
+            health.pool,
+        ],
+        **_mongo_tls_options(),
+        **_mongo_pool_options(),
+        **_mongo_client_class(),
+    )
+
+
+def _ensure_indexes_enabled():
+    return os.getenv("MONGO_ENSURE_INDEXES", "true").lower() == "true"
+
+
+def init_db():
+    """Connect, then build the indexes declared on the models in the background.
+
+    Neither step waits on MongoDB, so the app boots (and ``/health/ready``
+    answers 503) while it is unreachable. ``MONGO_ENSURE_INDEXES=false`` skips
+    the indexes. A pymongo client (and the index thread) must not be used on
+    both sides of a fork: pre-fork servers that import the app before forking
+    set ``MONGO_CONNECT_AFTER_FORK=true`` and call this in each worker.
+    """
+    connect_db()
+    if _ensure_indexes_enabled():
+        ensure_indexes_in_background()
+
+
+def _require_unique_indexes():
+    # Nothing but the unique indexes enforces Tribe.name and User.username.
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        require_unique_indexes()
+
 
-api = Api(
-    app,
-    spec_kwargs={
+# ─── CLI
+def _register_commands(app):
+    @app.cli.command("ensure-indexes")
+    def ensure_indexes_command():
+        """Create every MongoDB index declared on the models."""
+        ensure_indexes()
+
+    @app.cli.command("rebuild-read-model")
+    def rebuild_read_model_command():
+        """Backfill the artist/tribe snapshots embedded in every artifact."""
+        from resources.read_model import rebuild_snapshots
+
+        print(f"Rebuilt snapshots for {rebuild_snapshots()} artists.")
+
+    @app.cli.command("rebuild-related")
+    def rebuild_related_command():
+        """Rebuild the related-artifacts matrix (saved to RELATED_INDEX_PATH)."""
+        from resources.related import index
+
+        index.build()
+        print(f"Indexed {len(index.rows)} artifacts.")
+
+    @app.cli.command("write-openapi")
+    @click.argument("path", default="openapi.json")
+    def write_openapi_command(path):
+        """Write the OpenAPI document to serve with OPENAPI_SPEC_PATH."""
+        documented = Flask(__name__)
+        spec = register_api(documented).spec.to_dict()
+        with open(path, "w") as fh:
+            fh.write(documented.json.dumps(spec, indent=2, sort_keys=False) + "\n")
+        print(f"Wrote {path}")
+
+
+# ─── Simple health & root (see resources/health.py)
+def _register_health(app):
+    @app.get("/")
+    def index():
+        return jsonify(status="OK", message="Server is running")
+
+    @app.get("/health/live")
+    def liveness():
+        return jsonify(status="OK", pool=health.pool.snapshot())
+
+    # /health/db is the former database check, kept for existing probes.
+    @app.get("/health/ready")
+    @app.get("/health/db")
+    def readiness():
+        db = health.check()
+        body = jsonify(
+            status="OK" if db["ok"] else "ERROR",
+            db_status="OK" if db["ok"] else "ERROR",
+            db=db,
+            pool=health.pool.snapshot(),
+        )
+        return body, 200 if db["ok"] else 503
+
+
+# ─── API & OpenAPI docs
+def register_api(app, spec_path=None):
+    """Mount the blueprints. The OpenAPI document is served from
+    ``spec_path`` when given (see resources/openapi.py), else generated."""
+    # ─── Basic Swagger info
+    app.config.update(
+        API_TITLE="Aboriginal Art API",
+        API_VERSION="1.0",
+        OPENAPI_VERSION="3.0.2",
+        OPENAPI_URL_PREFIX="",
+        OPENAPI_JSON_PATH="openapi.json",
+        OPENAPI_SWAGGER_UI_PATH="docs",
+        OPENAPI_SWAGGER_UI_URL="https://cdn.jsdelivr.net/npm/swagger-ui-dist@4.18.0/",
+    )
+
+    # ─── BearerAuth scheme & global requirement
+    security_schemes = {
+        "BearerAuth": {"type": "http", "scheme": "bearer", "bearerFormat": "JWT"}
+    }
+    global_security = [{"BearerAuth": []}]
+    spec_kwargs = {
         "components": {"securitySchemes": security_schemes},
         "security": global_security,
-    },
-)
+    }
+    if spec_path:
+        api = PrebuiltSpecApi(app, spec_path, spec_kwargs=spec_kwargs)
+    else:
+        api = Api(app, spec_kwargs=spec_kwargs)
 
-# ─── Blueprint registration
-from resources.auth_resource import blp as AuthBlueprint
-from resources.tribe_resource import blp as TribeBlueprint
-from resources.artist_resource import blp as ArtistBlueprint
-from resources.artifact_resource import blp as ArtifactBlueprint
+    # ─── Blueprint registration
+    api.register_blueprint(AuthBlueprint)
+    api.register_blueprint(TribeBlueprint)
+    api.register_blueprint(ArtistBlueprint)
+    api.register_blueprint(ArtifactBlueprint)
+    api.register_blueprint(DiagnosticsBlueprint)
+    api.register_blueprint(SearchBlueprint)
+    api.register_blueprint(StatsBlueprint)
+    return api
+
+
+def create_app():
+    """Build the application.
+
+    Under gunicorn (``gunicorn -c gunicorn.conf.py``) each worker imports this
+    module after the fork, so each opens its own connection pool.
+    """
+    app = Flask(__name__)
+    # Behind TRUSTED_PROXIES proxies, take the client address from the last
+    # X-Forwarded-For entries they appended (rate limits key on it).
+    proxies = int(os.getenv("TRUSTED_PROXIES", "0"))
+    if proxies:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies)
+    # Imported by a preloading master: the workers call init_db after forking.
+    if os.getenv("MONGO_CONNECT_AFTER_FORK", "false").lower() != "true":
+        init_db()
+    _register_commands(app)
+
+    # ─── JWT
+    app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY")
+    JWTManager(app)
+
+    # ─── Metrics (see resources/metrics.py); registered first so its timer
+    # also covers the other request hooks.
+    if metrics.METRICS_ENABLED:
+        metrics.init_app(app)
+
+        @app.get("/metrics")
+        def prometheus_metrics():
+            return app.response_class(
+                metrics.expose(), content_type=metrics.CONTENT_TYPE
+            )
+
+    # ─── Query budgets / N+1 detection (see resources/query_tracker.py)
+    query_tracker.init_app(app)
+
+    # ─── Rate limiting (see resources/ratelimit.py)
+    app.before_request(check_rate_limit)
+    app.after_request(add_rate_limit_headers)
 
-api.register_blueprint(AuthBlueprint)
-api.register_blueprint(TribeBlueprint)
-api.register_blueprint(ArtistBlueprint)
-api.register_blueprint(ArtifactBlueprint)
+    # ─── Unique indexes (see models/indexes.py): created before the first
+    # write of the process, if the background build has not got there yet.
+    if _ensure_indexes_enabled():
+        app.before_request(_require_unique_indexes)
 
+    # ─── Compression (see resources/compression.py); registered after the
+    # metrics hooks so response sizes are the compressed ones.
+    if compression.COMPRESSION:
+        compression.init_app(app)
 
-# ─── Simple health & root
-@app.get("/")
-def index():
-    return jsonify(status="OK", message="Server is running")
+    register_api(app, os.getenv("OPENAPI_SPEC_PATH"))
+    _register_health(app)
+    return app
 
 
-@app.get("/health/db")
-def db_health():
-    try:
-        return jsonify(db_status="OK", collections=get_db().list_collection_names())
-    except Exception as e:
-        return jsonify(db_status="ERROR", error=str(e)), 500
+app = create_app()
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+"""Reproducible benchmarks: synthetic dataset, scenarios, runner, comparison."""
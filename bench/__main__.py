@@ -0,0 +1,409 @@
+"""python -m bench seed | run | replay | scale | startup | compare  (see README)."""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+DEFAULT_SIZES = {"tribes": 50, "artists": 2_000, "artifacts": 20_000}
+
+
+def _configure(args):
+    """Environment for the app under test; must run before ``import app``."""
+    if args.mongomock:
+        os.environ["MONGO_CLIENT"] = "mongomock"
+        os.environ.setdefault("MONGO_URI", "mongodb://localhost/gallery_bench")
+        os.environ.setdefault("MONGO_TLS", "false")
+        os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+    if args.rate_limit:
+        os.environ.setdefault("RATE_LIMIT_BACKEND", "memory")
+    else:
+        os.environ["RATE_LIMIT_BACKEND"] = "none"
+    if args.no_cache:
+        os.environ["CACHE_BACKEND"] = "none"
+    # Count commands from the first connection on.
+    from pymongo import monitoring
+    from bench.runner import commands
+
+    monitoring.register(commands)
+
+
+def _sizes():
+    from models.artifact import Artifact
+    from models.artist import Artist
+    from models.tribe import Tribe
+
+    return {
+        "tribes": Tribe.objects.count(),
+        "artists": Artist.objects.count(),
+        "artifacts": Artifact.objects.count(),
+    }
+
+
+def _seed(args, log):
+    from bench import dataset
+
+    start = time.perf_counter()
+    dataset.seed(args.tribes, args.artists, args.artifacts, seed=args.seed)
+    log(
+        f"Seeded {args.tribes} tribes, {args.artists} artists and "
+        f"{args.artifacts} artifacts in {time.perf_counter() - start:.1f}s."
+    )
+
+
+def _targets(args, app):
+    from bench.runner import ClientTarget, HTTPTarget, WSGITarget
+
+    if args.url:
+        return [HTTPTarget(args.url)]
+    names = ("client", "wsgi") if args.target == "both" else (args.target,)
+    return [ClientTarget(app) if n == "client" else WSGITarget(app) for n in names]
+
+
+def _login(target, credentials):
+    status, body = target.request("POST", "/auth/login", json=credentials)
+    if status != 200:
+        sys.exit(f"Admin login through {target.name} failed with {status}.")
+    return json.loads(body)["access_token"]
+
+
+def cmd_seed(args):
+    _configure(args)
+    import app  # noqa: F401  (connects)
+
+    _seed(args, print)
+
+
+def cmd_run(args):
+    if args.url and args.mongomock:
+        sys.exit("--url needs the server's database: drop --mongomock.")
+    _configure(args)
+    from app import app
+    from bench import dataset, runner, scenarios
+
+    if args.seed_data:
+        _seed(args, print)
+    sizes = _sizes()
+    if not all(sizes.values()):
+        sys.exit(f"Nothing to benchmark ({sizes}): run with --seed-data first.")
+    credentials = {"username": args.admin_user, "password": args.admin_password}
+    dataset.ensure_user(**credentials, role="admin")
+
+    selected = scenarios.select(args.only)
+    # Reads against the seeded data first; writes clean up after themselves.
+    ordered = [
+        scenario
+        for group in (scenarios.READS, scenarios.AUTH, scenarios.WRITES)
+        for scenario in group
+        if scenario in selected
+    ]
+    run_id = time.strftime("%Y%m%d%H%M%S")
+    report = {
+        "meta": runner.metadata(sizes, args.seed, args.requests, args.concurrency),
+        "runs": [],
+    }
+    if args.startup_samples:
+        report["startup"] = _startup(args.startup_samples)
+    for target in _targets(args, app):
+        try:
+            ctx = scenarios.Context(
+                sizes, credentials, run_id=f"{run_id}-{target.name}", seed=args.seed
+            )
+            ctx.token = _login(target, credentials)
+            report["runs"].append(
+                runner.run_target(
+                    target,
+                    ordered,
+                    ctx,
+                    args.requests,
+                    args.concurrency,
+                    warmup=args.warmup,
+                    log=print,
+                )
+            )
+        finally:
+            target.close()
+
+    _write_report(report, args.out)
+
+
+def _write_report(report, path):
+    text = json.dumps(report, indent=2)
+    if path:
+        with open(path, "w") as fh:
+            fh.write(text + "\n")
+        print(f"Wrote {path}")
+    else:
+        print(text)
+
+
+def _startup(samples, path="/api/v1/artifacts/"):
+    from bench import startup
+
+    result = startup.measure(samples, path)
+    print(
+        f"startup  import {result['import_ms']} ms, first request "
+        f"{result['first_request_ms']} ms, spawn to first response "
+        f"{result['time_to_first_request_ms']} ms (median of {samples})"
+    )
+    return result
+
+
+def cmd_startup(args):
+    _configure(args)
+    from bench import runner
+
+    report = {
+        "meta": runner.metadata(),
+        "startup": _startup(args.samples, args.path),
+    }
+    for name, ms in report["startup"]["imports"]:
+        print(f"  {name:<40} {ms:>8.1f} ms")
+    _write_report(report, args.out)
+
+
+def cmd_replay(args):
+    if args.url and args.mongomock:
+        sys.exit("--url needs the server's database: drop --mongomock.")
+    _configure(args)
+    from app import app
+    from bench import dataset, replay, runner
+
+    if args.seed_data:
+        _seed(args, print)
+    # One bench account per role the log may name.
+    accounts = {
+        role: {"username": f"bench-{role}", "password": f"bench-{role}-password"}
+        for role in replay.ROLES
+    }
+    for role, credentials in accounts.items():
+        dataset.ensure_user(**credentials, role=role)
+    adapter = app.url_map.bind("localhost")
+
+    report = {
+        "meta": {
+            **runner.metadata(_sizes(), args.seed, None, args.concurrency),
+            "log": args.log,
+            "speed": args.speed,
+        },
+        "runs": [],
+    }
+    for target in _targets(args, app):
+        try:
+            tokens = {
+                role: _login(target, credentials)
+                for role, credentials in accounts.items()
+            }
+            with open(args.log) as fh:
+                entries = itertools.islice(replay.read_log(fh), args.limit)
+                result = replay.replay(
+                    target,
+                    entries,
+                    lambda method, path: replay.route_of(adapter, method, path),
+                    tokens,
+                    concurrency=args.concurrency,
+                    speed=args.speed,
+                )
+            result["target"] = target.name
+            result["peak_rss_mb"] = runner.peak_rss_mb()
+            report["runs"].append(result)
+            print(
+                f"{target.name:<7} {result['requests']} requests in "
+                f"{result['duration_s']}s, start lag p95 {result['lag_p95_ms']} ms"
+            )
+            for route, row in result["routes"].items():
+                print(
+                    f"  {route:<48} {row['requests']:>6}  p50 {row['p50_ms']:>8.2f} ms"
+                    f"  p95 {row['p95_ms']:>8.2f} ms  errors {row['error_rate']:.1%}"
+                )
+        finally:
+            target.close()
+    _write_report(report, args.out)
+
+
+def cmd_scale(args):
+    if args.mongomock:
+        sys.exit("gunicorn workers cannot share a mongomock database: use mongod.")
+    _configure(args)
+    from bench import dataset, runner, scaling, scenarios
+
+    import app  # noqa: F401  (connects)
+
+    if args.seed_data:
+        _seed(args, print)
+    sizes = _sizes()
+    if not all(sizes.values()):
+        sys.exit(f"Nothing to benchmark ({sizes}): run with --seed-data first.")
+    credentials = {"username": args.admin_user, "password": args.admin_password}
+    dataset.ensure_user(**credentials, role="admin")
+    selected = scenarios.select(args.only) if args.only else scenarios.READS
+
+    def make_context(target):
+        ctx = scenarios.Context(
+            sizes, credentials, run_id=time.strftime("%Y%m%d%H%M%S"), seed=args.seed
+        )
+        ctx.token = _login(target, credentials)
+        return ctx
+
+    rows = []
+    print("workers  threads      req/s  speedup  server cores  client cores")
+    for workers in args.workers:
+        row = scaling.measure(
+            workers,
+            args.threads,
+            selected,
+            make_context,
+            args.requests,
+            args.concurrency,
+            args.warmup,
+        )
+        rows.append(row)
+        speedup = row["rps"] / rows[0]["rps"] if rows[0]["rps"] else 0
+        print(
+            f"{workers:>7}  {args.threads:>7}  {row['rps']:>9.1f}  {speedup:>6.2f}x"
+            f"  {row['server_cores']!s:>12}  {row['client_cores']:>12}"
+        )
+    report = {
+        "meta": runner.metadata(sizes, args.seed, args.requests, args.concurrency),
+        "scaling": rows,
+    }
+    _write_report(report, args.out)
+
+
+def cmd_compare(args):
+    from bench.compare import compare, format_row
+
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    with open(args.current) as fh:
+        current = json.load(fh)
+    rows, regressions = compare(baseline, current, threshold=args.threshold)
+    for row in rows if args.verbose else regressions:
+        print(format_row(row))
+    print(
+        f"{len(regressions)} regression(s) over {args.threshold:.0%} "
+        f"in {len(rows)} comparisons."
+    )
+    return 1 if regressions else 0
+
+
+def _dataset_options(parser):
+    parser.add_argument("--tribes", type=int, default=DEFAULT_SIZES["tribes"])
+    parser.add_argument("--artists", type=int, default=DEFAULT_SIZES["artists"])
+    parser.add_argument("--artifacts", type=int, default=DEFAULT_SIZES["artifacts"])
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed")
+
+
+def _app_options(parser):
+    parser.add_argument(
+        "--mongomock",
+        action="store_true",
+        help="serve from an in-memory mongomock database (pip install mongomock)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        action="store_true",
+        help="turn the rate limiter on (memory unless RATE_LIMIT_BACKEND is set)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="CACHE_BACKEND=none")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="replace the data with a synthetic set")
+    _dataset_options(seed)
+    _app_options(seed)
+    seed.set_defaults(func=cmd_seed)
+
+    run = commands.add_parser("run", help="benchmark the routes, write JSON")
+    _dataset_options(run)
+    _app_options(run)
+    run.add_argument(
+        "--seed-data",
+        action="store_true",
+        help="seed before running (always needed with --mongomock)",
+    )
+    run.add_argument("--target", choices=("client", "wsgi", "both"), default="both")
+    run.add_argument("--url", help="benchmark a running server instead")
+    run.add_argument("--requests", type=int, default=200, help="per scenario")
+    run.add_argument("--concurrency", type=int, default=4)
+    run.add_argument("--warmup", type=int, default=10, help="per read scenario")
+    run.add_argument(
+        "--only", nargs="*", default=[], help="scenario name prefixes to run"
+    )
+    run.add_argument(
+        "--startup-samples",
+        type=int,
+        default=3,
+        help="cold starts to time before the run (0 skips)",
+    )
+    run.add_argument("--admin-user", default="bench-admin")
+    run.add_argument("--admin-password", default="bench-admin-password")
+    run.add_argument("--out", help="write the JSON report here")
+    run.set_defaults(func=cmd_run)
+
+    replay = commands.add_parser("replay", help="replay a JSONL request log")
+    replay.add_argument("log", help="JSONL file, one recorded request per line")
+    _dataset_options(replay)
+    _app_options(replay)
+    replay.add_argument("--seed-data", action="store_true", help="seed first")
+    replay.add_argument(
+        "--target", choices=("client", "wsgi", "both"), default="client"
+    )
+    replay.add_argument("--url", help="replay against a running server instead")
+    replay.add_argument("--concurrency", type=int, default=8)
+    replay.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="timing: 1 as recorded, 10 ten times faster, 0 as fast as possible",
+    )
+    replay.add_argument("--limit", type=int, help="replay the first N requests")
+    replay.add_argument("--out", help="write the JSON report here")
+    replay.set_defaults(func=cmd_replay)
+
+    cold = commands.add_parser("startup", help="cold start time and import profile")
+    _app_options(cold)
+    cold.add_argument("--samples", type=int, default=5)
+    cold.add_argument("--path", default="/api/v1/artifacts/", help="first request")
+    cold.add_argument("--out", help="write the JSON report here")
+    cold.set_defaults(func=cmd_startup)
+
+    scale = commands.add_parser(
+        "scale", help="throughput and CPU use per gunicorn worker count"
+    )
+    _dataset_options(scale)
+    _app_options(scale)
+    scale.add_argument("--seed-data", action="store_true", help="seed first")
+    scale.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    scale.add_argument("--threads", type=int, default=4, help="per worker")
+    scale.add_argument("--requests", type=int, default=500, help="per scenario")
+    scale.add_argument("--concurrency", type=int, default=16)
+    scale.add_argument("--warmup", type=int, default=10, help="per read scenario")
+    scale.add_argument(
+        "--only", nargs="*", default=[], help="scenario prefixes (default: reads)"
+    )
+    scale.add_argument("--admin-user", default="bench-admin")
+    scale.add_argument("--admin-password", default="bench-admin-password")
+    scale.add_argument("--out", help="write the JSON report here")
+    scale.set_defaults(func=cmd_scale)
+
+    diff = commands.add_parser("compare", help="exit 1 on regressions")
+    diff.add_argument("baseline")
+    diff.add_argument("current")
+    diff.add_argument(
+        "--threshold", type=float, default=0.1, help="relative change (0.1 = 10%%)"
+    )
+    diff.add_argument("-v", "--verbose", action="store_true", help="print every row")
+    diff.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Compare two benchmark runs and flag regressions.
+
+Latencies (p50, p95) regress when they grow by more than the threshold,
+throughput when it drops by more than it. MongoDB commands per request are
+deterministic for a given dataset, so any increase is a regression.
+"""
+
+LATENCY_KEYS = ("p50_ms", "p95_ms")
+# Cold start (bench/startup.py), compared like latencies.
+STARTUP_KEYS = ("import_ms", "time_to_first_request_ms")
+
+
+def _runs(report):
+    # Benchmark runs group by scenario, replays (bench/replay.py) by route.
+    return {
+        run["target"]: run.get("scenarios", run.get("routes"))
+        for run in report["runs"]
+    }
+
+
+def _change(before, after):
+    if not before:
+        return None
+    return (after - before) / before
+
+
+def compare(baseline, current, threshold=0.1):
+    """``(rows, regressions)`` for every scenario present in both reports.
+
+    A row is ``(target, scenario, metric, before, after, relative change)``.
+    """
+    rows, regressions = [], []
+    if baseline.get("startup") and current.get("startup"):
+        for key in STARTUP_KEYS:
+            before, after = baseline["startup"][key], current["startup"][key]
+            row = ("startup", "cold start", key, before, after, _change(before, after))
+            rows.append(row)
+            if row[-1] is not None and row[-1] > threshold:
+                regressions.append(row)
+    before_runs = _runs(baseline)
+    for target, scenarios in _runs(current).items():
+        for name, after in scenarios.items():
+            before = before_runs.get(target, {}).get(name)
+            if before is None:
+                continue
+            for key in (*LATENCY_KEYS, "rps", "commands_per_request"):
+                if before.get(key) is None or after.get(key) is None:
+                    continue
+                change = _change(before[key], after[key])
+                row = (target, name, key, before[key], after[key], change)
+                rows.append(row)
+                if key in LATENCY_KEYS:
+                    worse = change is not None and change > threshold
+                elif key == "rps":
+                    worse = change is not None and change < -threshold
+                else:
+                    worse = after[key] > before[key]
+                if worse:
+                    regressions.append(row)
+            if after["errors"] > before["errors"]:
+                row = (target, name, "errors", before["errors"], after["errors"], None)
+                rows.append(row)
+                regressions.append(row)
+    return rows, regressions
+
+
+def format_row(row):
+    target, name, key, before, after, change = row
+    delta = "" if change is None else f"{change:+.1%}"
+    return f"{target:<7} {name:<28} {key:<21} {before:>10} → {after:<10} {delta}"
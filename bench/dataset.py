@@ -0,0 +1,115 @@
+"""Synthetic tribes → artists → artifacts, written straight to the collections.
+
+The dataset only depends on the sizes and the seed: ids are derived from a
+per-collection prefix and the document's position, so two runs of the same
+configuration benchmark the same documents.
+"""
+
+import datetime
+import random
+from bson import ObjectId
+from models.artifact import Artifact
+from models.artist import Artist
+from models.generation import Generation
+from models.indexes import ensure_indexes
+from models.tribe import Tribe
+from models.user import User
+from resources.read_model import EMBEDDED, rebuild_snapshots
+
+ERAS = ("Ancient", "Classical", "Modern", "Contemporary")
+REGIONS = ("NT", "WA", "SA", "QLD", "NSW", "VIC", "TAS")
+WORDS = (
+    "bark painting river ochre dreaming country sand spear shield basket "
+    "weaving fish turtle kangaroo emu serpent rain fire stars moon waterhole "
+    "ceremony journey ancestor dots lines crosshatch sea reef desert hills"
+).split()
+
+BATCH_SIZE = 10_000
+_PREFIXES = {"tribes": 1, "artists": 2, "artifacts": 3}
+
+
+def object_id(collection, index):
+    return ObjectId(f"{_PREFIXES[collection]:02x}{index:022x}")
+
+
+def _text(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _insert(document, rows):
+    collection = document._get_collection()
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+
+
+def seed(tribes, artists, artifacts, seed=0):
+    """Replace the gallery collections with a synthetic dataset."""
+    rng = random.Random(seed)
+    now = datetime.datetime.utcnow().replace(microsecond=0)
+    stamp = {"version": 1, "updated_at": now}
+    for document in (Tribe, Artist, Artifact, Generation):
+        document.drop_collection()
+    ensure_indexes()
+
+    _insert(
+        Tribe,
+        (
+            {
+                "_id": object_id("tribes", i),
+                "name": f"Tribe {i}",
+                "region": rng.choice(REGIONS),
+                "description": _text(rng, 8),
+                **stamp,
+            }
+            for i in range(tribes)
+        ),
+    )
+    _insert(
+        Artist,
+        (
+            {
+                "_id": object_id("artists", i),
+                "name": f"Artist {i}",
+                "bio": _text(rng, 12),
+                "tribe": object_id("tribes", rng.randrange(tribes)),
+                "active_years": [start, start + rng.randint(5, 40)],
+                **stamp,
+            }
+            for i, start in ((i, rng.randint(1900, 2000)) for i in range(artists))
+        ),
+    )
+    _insert(
+        Artifact,
+        (
+            {
+                "_id": object_id("artifacts", i),
+                "title": _text(rng, 3).title(),
+                "description": _text(rng, 15),
+                "image_url": f"https://img.example/{i}.jpg",
+                "artist": object_id("artists", rng.randrange(artists)),
+                "era": rng.choice(ERAS),
+                "created_date": datetime.datetime(
+                    rng.randint(1900, 2024), rng.randint(1, 12), rng.randint(1, 28)
+                ),
+                **stamp,
+            }
+            for i in range(artifacts)
+        ),
+    )
+    if EMBEDDED:
+        rebuild_snapshots()
+    return {"tribes": tribes, "artists": artists, "artifacts": artifacts}
+
+
+def ensure_user(username, password, role="user"):
+    """(Re)create an account for the benchmark to log in with."""
+    User.objects(username=username).delete()
+    user = User(username=username, role=role)
+    user.set_password(password)
+    user.save()
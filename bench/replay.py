@@ -0,0 +1,130 @@
+"""Replay a recorded JSONL request log against a target.
+
+One request per line::
+
+    {"ts": 1718000000.25, "method": "GET", "path": "/api/v1/artifacts/",
+     "query": {"era": "Modern"}, "body": null, "role": "user"}
+
+``ts`` (epoch seconds or ISO 8601) is optional; without it requests are sent
+back to back. ``query`` is a dict or a query string, ``body`` is sent as
+JSON, and ``role`` (``admin``, ``user`` or null) picks the bench account
+whose token authenticates the request.
+
+Requests start at their recorded offsets divided by ``speed`` (2 = twice as
+fast, 0 = as fast as the clients allow) on a pool of ``concurrency``
+threads. When every thread is busy a request starts late; the lag is
+reported, since a replay that cannot keep up no longer reproduces the
+recorded load.
+"""
+
+import collections
+import datetime
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+from werkzeug.exceptions import HTTPException
+
+from bench.runner import percentile, summarize
+
+ROLES = ("admin", "user")
+
+
+def _timestamp(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+
+def read_log(lines):
+    """Parse log lines into request dicts; blank lines are skipped."""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+            query = entry.get("query") or ""
+            if isinstance(query, dict):
+                query = urlencode(query, doseq=True)
+            yield {
+                "ts": _timestamp(entry.get("ts")),
+                "method": entry.get("method", "GET").upper(),
+                "path": entry["path"] + (f"?{query}" if query else ""),
+                "body": entry.get("body"),
+                "role": entry.get("role"),
+            }
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(f"Line {number}: invalid log entry ({exc})") from None
+
+
+def route_of(adapter, method, path):
+    """The URL rule serving ``path`` (``METHOD /rule``), or the path itself."""
+    try:
+        rule, _ = adapter.match(path.partition("?")[0], method, return_rule=True)
+        return f"{method} {rule.rule}"
+    except HTTPException:
+        return f"{method} {path.partition('?')[0]}"
+
+
+def replay(target, entries, route, tokens, concurrency=4, speed=1.0):
+    """Send ``entries`` in order; ``{"routes": {route: summary}, ...}``.
+
+    ``route(method, path)`` groups requests, ``tokens`` maps a role to a JWT.
+    """
+    latencies = collections.defaultdict(list)
+    statuses = collections.defaultdict(collections.Counter)
+    lags, lock = [], threading.Lock()
+    # Bounds the requests scheduled ahead of the clients (and their memory).
+    slots = threading.BoundedSemaphore(concurrency * 2)
+
+    def send(entry, due):
+        try:
+            lag = time.perf_counter() - due
+            token = tokens.get(entry["role"])
+            headers = {"Authorization": f"Bearer {token}"} if token else None
+            start = time.perf_counter()
+            try:
+                status, _ = target.request(
+                    entry["method"], entry["path"], json=entry["body"], headers=headers
+                )
+            except OSError:  # refused/reset connection: counted as an error
+                status = 599
+            elapsed = time.perf_counter() - start
+            key = route(entry["method"], entry["path"])
+            with lock:
+                latencies[key].append(elapsed)
+                statuses[key][status] += 1
+                lags.append(lag)
+        finally:
+            slots.release()
+
+    start = time.perf_counter()
+    first = None
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for entry in entries:
+            due = time.perf_counter()
+            if speed and entry["ts"] is not None:
+                first = entry["ts"] if first is None else first
+                due = start + (entry["ts"] - first) / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            slots.acquire()
+            pool.submit(send, entry, due)
+    wall = time.perf_counter() - start
+
+    lags.sort()
+    return {
+        "requests": len(lags),
+        "duration_s": round(wall, 3),
+        "lag_p95_ms": None if not lags else round(percentile(lags, 95) * 1000, 3),
+        "lag_max_ms": None if not lags else round(lags[-1] * 1000, 3),
+        "routes": {
+            key: summarize(latencies[key], statuses[key], wall)
+            for key in sorted(latencies)
+        },
+    }
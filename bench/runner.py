@@ -0,0 +1,245 @@
+"""Send scenarios to a target from concurrent clients and measure them.
+
+A target is the Flask test client (in-process, no sockets: the cost of the
+app alone), a threaded werkzeug server started on a free local port, or any
+base URL. Each client thread owns its test client or ``requests.Session``
+and reads every body to the end, so streamed exports are timed in full.
+"""
+
+import collections
+import itertools
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from pymongo import monitoring
+
+# Environment recorded with every run: the switches that change the numbers.
+ENV_FLAGS = (
+    "ARTIFACT_READ_MODEL",
+    "CACHE_BACKEND",
+    "COMPRESSION",
+    "FAST_SERIALIZATION",
+    "METRICS_ENABLED",
+    "MONGO_CLIENT",
+    "PASSWORD_HASH_METHOD",
+    "QUERY_TRACKING",
+    "RATE_LIMIT_BACKEND",
+    "SEARCH_BACKEND",
+)
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts every MongoDB command; register before the app connects.
+
+    mongomock publishes no command events, so the count stays 0 against it.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        with self._lock:
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+commands = CommandCounter()
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of already sorted ``values``."""
+    if not values:
+        return None
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+# ─── Targets
+# `request` returns (status, body bytes) once the whole body is read.
+class ClientTarget:
+    name = "client"
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def request(self, method, path, json=None, headers=None):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=json, headers=headers)
+        return response.status_code, response.get_data()
+
+    def close(self):
+        pass
+
+
+class HTTPTarget:
+    name = "url"
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+        self._local = threading.local()
+
+    def request(self, method, path, json=None, headers=None):
+        import requests
+
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        response = session.request(
+            method, self.base_url + path, json=json, headers=headers
+        )
+        return response.status_code, response.content
+
+    def close(self):
+        pass
+
+
+class WSGITarget(HTTPTarget):
+    """The app behind a threaded werkzeug server on a free local port."""
+
+    name = "wsgi"
+
+    def __init__(self, app):
+        from werkzeug.serving import WSGIRequestHandler, make_server
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_request(self, *args, **kwargs):
+                pass
+
+        self._server = make_server(
+            "127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler
+        )
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        super().__init__(f"http://127.0.0.1:{self._server.server_port}")
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# ─── Running
+def _send(target, scenario, ctx, i):
+    path, body = scenario.request(ctx, i)
+    headers = {"Authorization": f"Bearer {ctx.token}"} if scenario.auth else None
+    return target.request(scenario.method, path, json=body, headers=headers)
+
+
+def run_scenario(target, scenario, ctx, requests, concurrency, warmup=0):
+    """Send ``requests`` requests from ``concurrency`` threads; summarize them.
+
+    Warm-up requests (reads only: writes consume the ids they create) are
+    sent first and not measured.
+    """
+    if scenario.method == "GET":
+        for i in range(warmup):
+            _send(target, scenario, ctx, i)
+
+    numbers = itertools.count()
+    latencies, statuses, lock = [], collections.Counter(), threading.Lock()
+
+    def client():
+        while (i := next(numbers)) < requests:
+            start = time.perf_counter()
+            status, body = _send(target, scenario, ctx, i)
+            elapsed = time.perf_counter() - start
+            if scenario.capture and status < 400:
+                ctx.capture(scenario.capture, json.loads(body))
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    sent_before = commands.count
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    return summarize(latencies, statuses, wall, commands.count - sent_before)
+
+
+def summarize(latencies, statuses, wall, sent=None):
+    """Latency percentiles (``latencies`` in seconds), throughput and errors."""
+    ms = sorted(value * 1000 for value in latencies)
+    n = len(ms)
+    errors = sum(count for status, count in statuses.items() if status >= 400)
+    return {
+        "requests": n,
+        "errors": errors,
+        "error_rate": round(errors / n, 4) if n else None,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "rps": round(n / wall, 1) if wall else None,
+        "p50_ms": _round(percentile(ms, 50)),
+        "p95_ms": _round(percentile(ms, 95)),
+        "p99_ms": _round(percentile(ms, 99)),
+        "mean_ms": _round(sum(ms) / n if n else None),
+        "max_ms": _round(ms[-1] if ms else None),
+        "mongo_commands": sent,
+        "commands_per_request": round(sent / n, 2) if n and sent is not None else None,
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
+
+
+def run_target(target, scenarios, ctx, requests, concurrency, warmup=0, log=None):
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = result = run_scenario(
+            target, scenario, ctx, requests, concurrency, warmup
+        )
+        if log:
+            log(
+                f"{target.name:<7} {scenario.name:<28} "
+                f"p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+                f"{result['rps']:>8.1f} req/s  errors {result['errors']}"
+            )
+    return {"target": target.name, "scenarios": results, "peak_rss_mb": peak_rss_mb()}
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(sizes=None, seed=None, requests=None, concurrency=None):
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "sizes": sizes,
+        "seed": seed,
+        "requests": requests,
+        "concurrency": concurrency,
+        "env": {flag: os.getenv(flag) for flag in ENV_FLAGS if os.getenv(flag)},
+    }
@@ -0,0 +1,139 @@
+"""Throughput against gunicorn worker count: how many cores the app can use.
+
+For each worker count, gunicorn is started from gunicorn.conf.py on a free
+local port and the same scenarios are sent over HTTP. Requests per second
+are reported next to the CPU time the server processes used during the run
+(read from /proc, so Linux only) and the CPU time of this load generator:
+when the client is near one full core, it is the bottleneck and the numbers
+say nothing more about the server.
+"""
+
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from bench.runner import HTTPTarget, run_target
+
+ROOT = Path(__file__).resolve().parent.parent
+_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _stat(pid):
+    with open(f"/proc/{pid}/stat") as fh:
+        # The command name may contain spaces: split after its closing ")".
+        return fh.read().rpartition(")")[2].split()
+
+
+def server_cpu_seconds(master):
+    """User + system CPU of the gunicorn master and its workers (or None)."""
+    if not os.path.isdir("/proc"):
+        return None
+    total = 0
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            fields = _stat(entry)
+        except OSError:  # exited meanwhile
+            continue
+        # fields[1] is the parent pid, [11]/[12] utime/stime in clock ticks
+        if int(entry) == master or int(fields[1]) == master:
+            total += int(fields[11]) + int(fields[12])
+    return total / _TICKS
+
+
+def _client_cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def start_server(workers, threads, timeout=60):
+    port = _free_port()
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "GUNICORN_THREADS": str(threads),
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "MONGO_ENSURE_INDEXES": "false",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    target = HTTPTarget(f"http://127.0.0.1:{port}")
+    deadline = time.monotonic() + timeout
+    # Ready once every worker has booted: each answers on its own.
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            if target.request("GET", "/")[0] == 200 and _booted(process.pid, workers):
+                return process, target
+        except OSError:
+            pass
+        time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError(f"gunicorn with {workers} workers did not start")
+
+
+def _booted(master, workers):
+    if not os.path.isdir("/proc"):
+        return True
+    children = 0
+    for entry in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            children += int(_stat(entry)[1]) == master
+        except OSError:
+            continue
+    return children >= workers
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def measure(workers, threads, scenarios, make_context, requests, concurrency, warmup):
+    """One row of the scaling report."""
+    process, target = start_server(workers, threads)
+    try:
+        ctx = make_context(target)
+        server_before = server_cpu_seconds(process.pid)
+        client_before = _client_cpu_seconds()
+        start = time.perf_counter()
+        run = run_target(target, scenarios, ctx, requests, concurrency, warmup)
+        wall = time.perf_counter() - start
+        server_after = server_cpu_seconds(process.pid)
+        client_cpu = _client_cpu_seconds() - client_before
+    finally:
+        stop_server(process)
+
+    reads = {scenario.name for scenario in scenarios if scenario.method == "GET"}
+    sent = sum(
+        result["requests"] + (warmup if name in reads else 0)
+        for name, result in run["scenarios"].items()
+    )
+    server_cpu = None if server_before is None else server_after - server_before
+    return {
+        "workers": workers,
+        "threads": threads,
+        "rps": round(sent / wall, 1),
+        "server_cores": None if server_cpu is None else round(server_cpu / wall, 2),
+        "client_cores": round(client_cpu / wall, 2),
+        "scenarios": run["scenarios"],
+    }
@@ -0,0 +1,206 @@
+"""The requests each benchmark scenario sends.
+
+A scenario maps a request number to ``(path, json body)``. Reads pick their
+documents with a seeded RNG from the synthetic dataset (bench/dataset.py);
+writes create their own documents, then update and delete exactly those, so
+a run leaves the seeded dataset as it found it apart from ``updated_at``
+stamps and versions.
+"""
+
+import random
+from bench.dataset import ERAS, REGIONS, WORDS, object_id
+
+API = "/api/v1"
+BULK_SIZE = 20
+
+
+class Context:
+    """Dataset sizes, the admin token and the ids created by write scenarios."""
+
+    def __init__(self, sizes, credentials, token=None, run_id="0", seed=0):
+        self.sizes, self.credentials, self.token = sizes, credentials, token
+        self.run_id = run_id
+        self.created = {}  # capture name -> [id, ...] in creation order
+        self._rng = random.Random(seed)
+
+    def pick(self, collection):
+        return str(object_id(collection, self._rng.randrange(self.sizes[collection])))
+
+    def word(self):
+        return self._rng.choice(WORDS)
+
+    def created_id(self, name, i, missing="0" * 24):
+        ids = self.created.get(name, [])
+        return ids[i] if i < len(ids) else missing
+
+    def capture(self, name, payload):
+        if "items" in payload:  # bulk result
+            ids = [item["id"] for item in payload["items"] if item["status"] < 400]
+            self.created.setdefault(name, []).append(ids)
+        else:
+            self.created.setdefault(name, []).append(payload["id"])
+
+
+class Scenario:
+    def __init__(self, name, method, request, auth=False, capture=None):
+        self.name, self.method, self.auth = name, method, auth
+        self.request = request  # (ctx, i) -> (path, json body or None)
+        self.capture = capture  # store the created id(s) under this name
+
+
+def _get(name, path):
+    return Scenario(name, "GET", lambda ctx, i: (path(ctx, i), None))
+
+
+def _crud(entity, new):
+    """Create, bulk create, update, bulk update, delete and bulk delete."""
+
+    def bulk_ids(ctx, i):
+        return ctx.created_id(f"{entity}.bulk", i, missing=[])
+
+    return [
+        Scenario(
+            f"{entity}.create",
+            "POST",
+            lambda ctx, i: (f"{API}/{entity}/", new(ctx, i)),
+            auth=True,
+            capture=entity,
+        ),
+        Scenario(
+            f"{entity}.bulk_create",
+            "POST",
+            lambda ctx, i: (
+                f"{API}/{entity}/bulk",
+                [new(ctx, f"{i}.{j}") for j in range(BULK_SIZE)],
+            ),
+            auth=True,
+            capture=f"{entity}.bulk",
+        ),
+        Scenario(
+            f"{entity}.update",
+            "PUT",
+            lambda ctx, i: (
+                f"{API}/{entity}/{ctx.created_id(entity, i)}",
+                _patch(entity, i),
+            ),
+            auth=True,
+        ),
+        Scenario(
+            f"{entity}.bulk_update",
+            "PUT",
+            lambda ctx, i: (
+                f"{API}/{entity}/bulk",
+                [{"id": doc_id, **_patch(entity, i)} for doc_id in bulk_ids(ctx, i)],
+            ),
+            auth=True,
+        ),
+        Scenario(
+            f"{entity}.delete",
+            "DELETE",
+            lambda ctx, i: (f"{API}/{entity}/{ctx.created_id(entity, i)}", None),
+            auth=True,
+        ),
+        Scenario(
+            f"{entity}.bulk_delete",
+            "DELETE",
+            lambda ctx, i: (f"{API}/{entity}/bulk", {"ids": bulk_ids(ctx, i)}),
+            auth=True,
+        ),
+    ]
+
+
+def _patch(entity, i):
+    return {"bio" if entity == "artists" else "description": f"updated {i}"}
+
+
+def _new_tribe(ctx, i):
+    return {"name": f"Bench {ctx.run_id} {i}", "region": REGIONS[0]}
+
+
+def _new_artist(ctx, i):
+    return {
+        "name": f"Bench {ctx.run_id} {i}",
+        "tribe": ctx.pick("tribes"),
+        "active_years": [1960, 1990],
+    }
+
+
+def _new_artifact(ctx, i):
+    return {
+        "title": f"Bench {ctx.run_id} {i}",
+        "artist": ctx.pick("artists"),
+        "era": ERAS[0],
+    }
+
+
+READS = [
+    _get("tribes.list", lambda ctx, i: f"{API}/tribes/?limit=50"),
+    _get("tribes.list_by_region", lambda ctx, i: f"{API}/tribes/?region={REGIONS[1]}"),
+    _get("tribes.detail", lambda ctx, i: f"{API}/tribes/{ctx.pick('tribes')}"),
+    _get("tribes.export", lambda ctx, i: f"{API}/tribes/export?region={REGIONS[2]}"),
+    _get("artists.list", lambda ctx, i: f"{API}/artists/?limit=50"),
+    _get(
+        "artists.list_by_tribe",
+        lambda ctx, i: f"{API}/artists/?tribe={ctx.pick('tribes')}",
+    ),
+    _get(
+        "artists.list_by_years",
+        lambda ctx, i: f"{API}/artists/?active_from=1950&active_to=1960&limit=50",
+    ),
+    _get("artists.detail", lambda ctx, i: f"{API}/artists/{ctx.pick('artists')}"),
+    _get(
+        "artists.export",
+        lambda ctx, i: f"{API}/artists/export?tribe={ctx.pick('tribes')}",
+    ),
+    _get("artifacts.list", lambda ctx, i: f"{API}/artifacts/?limit=50"),
+    _get(
+        "artifacts.list_by_tribe",
+        lambda ctx, i: f"{API}/artifacts/?tribe={ctx.pick('tribes')}&limit=50",
+    ),
+    _get(
+        "artifacts.list_sorted",
+        lambda ctx, i: f"{API}/artifacts/?sort=-created_date&limit=50",
+    ),
+    _get(
+        "artifacts.list_sparse",
+        lambda ctx, i: f"{API}/artifacts/?fields=title,era&limit=50",
+    ),
+    _get("artifacts.detail", lambda ctx, i: f"{API}/artifacts/{ctx.pick('artifacts')}"),
+    _get(
+        "artifacts.export",
+        lambda ctx, i: f"{API}/artifacts/export?artist={ctx.pick('artists')}",
+    ),
+    _get(
+        "artifacts.related",
+        lambda ctx, i: f"{API}/artifacts/{ctx.pick('artifacts')}/related",
+    ),
+    _get("search", lambda ctx, i: f"{API}/search?q={ctx.word()}"),
+    _get("stats.artifacts_by_era", lambda ctx, i: f"{API}/stats/artifacts/by-era"),
+]
+
+AUTH = [
+    Scenario(
+        "auth.register",
+        "POST",
+        lambda ctx, i: (
+            "/auth/register",
+            {"username": f"bench-{ctx.run_id}-{i}", "password": "bench"},
+        ),
+    ),
+    Scenario("auth.login", "POST", lambda ctx, i: ("/auth/login", ctx.credentials)),
+]
+
+WRITES = [
+    *_crud("tribes", _new_tribe),
+    *_crud("artists", _new_artist),
+    *_crud("artifacts", _new_artifact),
+]
+
+SCENARIOS = {s.name: s for s in (*READS, *AUTH, *WRITES)}
+
+
+def select(patterns):
+    """Scenarios whose name starts with one of ``patterns`` (all if empty)."""
+    if not patterns:
+        return list(SCENARIOS.values())
+    return [s for s in SCENARIOS.values() if s.name.startswith(tuple(patterns))]
@@ -0,0 +1,96 @@
+"""Cold start: import-time profile and time to first request.
+
+Each sample starts a fresh interpreter that imports the app and sends one
+request through the test client, with the environment of the benchmark
+(``MONGO_URI``, ``OPENAPI_SPEC_PATH``, ...).
+Time to first request runs from spawning the process to receiving that
+response, so it includes interpreter start-up, imports, building the app,
+the first MongoDB connection and the first query. One more start under
+``python -X importtime`` (which slows imports down) lists the slowest of
+the app's direct imports.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().get(sys.argv[1])
+response.get_data()
+done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_request_ms": (done - imported) * 1000,
+    "status": response.status_code,
+}), flush=True)
+"""
+
+
+def parse_importtime(text, root="app", top=15):
+    """``[(module, cumulative ms), ...]`` imported directly by ``root``."""
+    children, found = [], []
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():  # the header line
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        # -X importtime prints children before their parent.
+        if depth == 0:
+            if name.strip() == root:
+                found = children
+            children = []
+        elif depth == 1:
+            children.append((name.strip(), int(cumulative) / 1000))
+    found.sort(key=lambda item: item[1], reverse=True)
+    return [(name, round(ms, 1)) for name, ms in found[:top]]
+
+
+def sample(path="/", profile=False):
+    flags = ["-X", "importtime"] if profile else []
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, *flags, "-c", _CHILD, path],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    line = process.stdout.readline()
+    first_response = time.perf_counter() - start
+    _, errors = process.communicate()
+    if process.returncode or not line:
+        raise RuntimeError(f"Startup sample failed:\n{errors[-2000:]}")
+    result = json.loads(line)
+    result["time_to_first_request_ms"] = first_response * 1000
+    if profile:
+        result["imports"] = parse_importtime(errors)
+    return result
+
+
+def measure(samples=3, path="/api/v1/artifacts/"):
+    """Medians over ``samples`` cold starts, and the slowest imports."""
+    runs = [sample(path) for _ in range(samples)]
+
+    def median(key):
+        return round(statistics.median(run[key] for run in runs), 1)
+
+    return {
+        "samples": samples,
+        "path": path,
+        "status": runs[-1]["status"],
+        "import_ms": median("import_ms"),
+        "first_request_ms": median("first_request_ms"),
+        "time_to_first_request_ms": median("time_to_first_request_ms"),
+        "imports": sample(path, profile=True)["imports"],
+    }
@@ -0,0 +1,39 @@
+"""Production server: ``gunicorn -c gunicorn.conf.py``.
+
+Every setting comes from the environment. ``WEB_CONCURRENCY`` worker
+processes (default: one per CPU) each run ``GUNICORN_THREADS`` threads
+(default 4), which overlap requests waiting on MongoDB; the GIL keeps each
+process to one core of Python, so throughput scales with workers. Each
+worker opens its own MongoDB pool of up to ``MONGO_MAX_POOL_SIZE``
+connections (see ``connect_db`` in app.py), so size the pool to the thread
+count and the server's connection limit to ``workers × pool size``.
+"""
+
+import multiprocessing
+import os
+
+wsgi_app = "app:app"
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '5001')}")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+worker_class = "gthread" if threads > 1 else "sync"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Recycle workers after this many requests (0 = never), staggered by 10%.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+accesslog = os.getenv("GUNICORN_ACCESS_LOG")  # "-" for stdout
+# Import the app once in the master and fork it: faster worker boot and
+# shared memory pages. The master then opens no MongoDB client and starts no
+# index thread; each worker does both after the fork.
+preload_app = os.getenv("GUNICORN_PRELOAD", "false").lower() == "true"
+if preload_app:
+    os.environ["MONGO_CONNECT_AFTER_FORK"] = "true"
+
+
+def post_fork(server, worker):
+    if preload_app:
+        import app
+
+        app.init_db()
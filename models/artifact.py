@@ -1,12 +1,40 @@
-from mongoengine import Document, StringField, ReferenceField, DateTimeField
+from mongoengine import (
+    DateTimeField,
+    EmbeddedDocumentField,
+    ReferenceField,
+    StringField,
+)
+from .versioned import VersionedDocument
 from .artist import Artist
+from .snapshot import ArtistSnapshot
 
 
-class Artifact(Document):
-    meta = {"collection": "artifacts"}
+class Artifact(VersionedDocument):
+    meta = {
+        "collection": "artifacts",
+        "auto_create_index": False,  # see models/indexes.py
+        "indexes": [
+            ("artist", "id"),
+            ("era", "created_date"),
+            ("created_date", "id"),
+            ("title", "id"),
+            # tribe fan-out of the embedded read model (resources/read_model.py)
+            {"fields": ["artist_snapshot.tribe.id"], "sparse": True},
+            # catch-up of the related-artifacts matrix (resources/related.py)
+            "updated_at",
+            # /api/v1/search (resources/search.py reads the weights from here)
+            {
+                "fields": ["$title", "$description"],
+                "weights": {"title": 10, "description": 2},
+            },
+        ],
+    }
     title = StringField(required=True)
     description = StringField()
     image_url = StringField()
     artist = ReferenceField(Artist, required=True)
     era = StringField()  # e.g. "Contemporary"
     created_date = DateTimeField()  # e.g. datetime.datetime(2024, 5, 1)
+    # Denormalized copy of `artist` (and its tribe), kept in sync on writes
+    # when ARTIFACT_READ_MODEL=embedded.
+    artist_snapshot = EmbeddedDocumentField(ArtistSnapshot)
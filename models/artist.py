@@ -1,9 +1,19 @@
-from mongoengine import Document, StringField, ReferenceField, ListField, IntField
+from mongoengine import StringField, ReferenceField, ListField, IntField
+from .versioned import VersionedDocument
 from .tribe import Tribe
 
 
-class Artist(Document):
-    meta = {"collection": "artists"}
+class Artist(VersionedDocument):
+    meta = {
+        "collection": "artists",
+        "auto_create_index": False,  # see models/indexes.py
+        "indexes": [
+            ("tribe", "id"),
+            "active_years",  # multikey: serves the active-years overlap filter
+            # /api/v1/search (resources/search.py reads the weights from here)
+            {"fields": ["$name", "$bio"], "weights": {"name": 10, "bio": 2}},
+        ],
+    }
     name = StringField(required=True)
     bio = StringField()
     tribe = ReferenceField(Tribe, required=True)
@@ -0,0 +1,14 @@
+from mongoengine import Document, StringField, IntField, DateTimeField
+
+
+class Generation(Document):
+    """Change counter of one collection, bumped after every write to it.
+
+    List routes derive their ETag and Last-Modified from it, so validating a
+    cached page costs a single `_id` lookup.
+    """
+
+    meta = {"collection": "generations", "auto_create_index": False}
+    id = StringField(primary_key=True)  # entity name, e.g. "artifacts"
+    value = IntField(default=0)
+    updated_at = DateTimeField()
@@ -0,0 +1,74 @@
+import logging
+import os
+import threading
+import time
+from .artifact import Artifact
+from .artist import Artist
+from .tribe import Tribe
+from .user import User
+
+log = logging.getLogger(__name__)
+
+# Seconds between attempts of the background build while MongoDB is down,
+# doubling from one second up to this cap.
+MONGO_INDEX_RETRY_MAX = float(os.getenv("MONGO_INDEX_RETRY_MAX", "60"))
+
+# Automatic index creation is switched off in every model's meta: MongoEngine
+# would otherwise run it lazily inside the first request that touches a
+# collection. Indexes are built here instead, from the CLI or off the boot
+# path: a background thread builds them all, and the unique ones (they
+# enforce Tribe.name and User.username) are also required before the first
+# write of the process, so uniqueness holds even if that thread is late.
+DOCUMENTS = (Tribe, Artist, Artifact, User)
+
+_unique_lock = threading.Lock()
+_unique_ready = threading.Event()
+
+
+def ensure_unique_indexes():
+    """Create the unique indexes declared in the models (idempotent)."""
+    for document in DOCUMENTS:
+        collection = document._get_collection()
+        for spec in document._meta["index_specs"]:
+            if spec.get("unique"):
+                options = {k: v for k, v in spec.items() if k != "fields"}
+                collection.create_index(spec["fields"], **options)
+
+
+def require_unique_indexes():
+    """Create the unique indexes once per process; a no-op afterwards."""
+    if _unique_ready.is_set():
+        return
+    with _unique_lock:
+        if not _unique_ready.is_set():
+            ensure_unique_indexes()
+            _unique_ready.set()
+
+
+def ensure_indexes():
+    """Create every index declared in the models' ``meta`` (idempotent)."""
+    for document in DOCUMENTS:
+        document.ensure_indexes()
+        log.info("Indexes ensured for %s", document._get_collection_name())
+
+
+def _ensure_indexes_retrying():
+    delay = 1.0
+    while True:
+        try:
+            require_unique_indexes()
+            ensure_indexes()
+            return
+        except Exception:
+            log.exception("Creating MongoDB indexes failed, retrying in %ss", delay)
+        time.sleep(delay)
+        delay = min(2 * delay, MONGO_INDEX_RETRY_MAX)
+
+
+def ensure_indexes_in_background():
+    """Build indexes on a daemon thread so app boot never waits on Mongo."""
+    thread = threading.Thread(
+        target=_ensure_indexes_retrying, name="ensure-indexes", daemon=True
+    )
+    thread.start()
+    return thread
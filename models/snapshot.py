@@ -0,0 +1,51 @@
+from mongoengine import (
+    EmbeddedDocument,
+    EmbeddedDocumentField,
+    IntField,
+    ListField,
+    ObjectIdField,
+    StringField,
+)
+
+
+class TribeSnapshot(EmbeddedDocument):
+    """Copy of the tribe fields an artifact read returns (read model)."""
+
+    id = ObjectIdField()
+    name = StringField()
+    region = StringField()
+    description = StringField()
+
+    @classmethod
+    def of(cls, tribe):
+        if tribe is None:
+            return None
+        return cls(
+            id=tribe.id,
+            name=tribe.name,
+            region=tribe.region,
+            description=tribe.description,
+        )
+
+
+class ArtistSnapshot(EmbeddedDocument):
+    """Copy of an artist, with its tribe, embedded in each of its artifacts."""
+
+    id = ObjectIdField()
+    name = StringField()
+    bio = StringField()
+    active_years = ListField(IntField())
+    tribe = EmbeddedDocumentField(TribeSnapshot)
+
+    @classmethod
+    def of(cls, artist):
+        """Snapshot of ``artist``; its ``tribe`` must already be resolved."""
+        if artist is None:
+            return None
+        return cls(
+            id=artist.id,
+            name=artist.name,
+            bio=artist.bio,
+            active_years=artist.active_years,
+            tribe=TribeSnapshot.of(artist.tribe),
+        )
@@ -1,8 +1,20 @@
-from mongoengine import Document, StringField
+from mongoengine import StringField
+from .versioned import VersionedDocument
 
 
-class Tribe(Document):
-    meta = {"collection": "tribes"}
+class Tribe(VersionedDocument):
+    meta = {
+        "collection": "tribes",
+        "auto_create_index": False,  # see models/indexes.py
+        "indexes": [
+            ("region", "id"),
+            # /api/v1/search (resources/search.py reads the weights from here)
+            {
+                "fields": ["$name", "$region", "$description"],
+                "weights": {"name": 10, "region": 5, "description": 2},
+            },
+        ],
+    }
     name = StringField(required=True, unique=True)
     region = StringField(required=True)
     description = StringField()
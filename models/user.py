@@ -1,15 +1,21 @@
 # models/user.py
+import os
 from mongoengine import Document, StringField
 from werkzeug.security import generate_password_hash, check_password_hash
 
+# werkzeug method string, cost included: e.g. "scrypt:32768:8:1" (the default)
+# or "pbkdf2:sha256:600000". Existing hashes keep verifying after a change.
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+
 
 class User(Document):
+    meta = {"auto_create_index": False}  # see models/indexes.py
     username = StringField(required=True, unique=True)
     password_hash = StringField(required=True)
     role = StringField(choices=("user", "admin"), default="user")
 
     def set_password(self, pw):
-        self.password_hash = generate_password_hash(pw)
+        self.password_hash = generate_password_hash(pw, PASSWORD_HASH_METHOD)
 
     def check_password(self, pw):
         return check_password_hash(self.password_hash, pw)
@@ -0,0 +1,52 @@
+import datetime
+from mongoengine import Document, DateTimeField, IntField, QuerySet
+
+# Covers the conditional-GET validator lookup (resources/conditional.py):
+# `_id` equality projected to these fields is answered from the index alone.
+VALIDATOR_INDEX = [("_id", 1), ("version", 1), ("updated_at", 1)]
+
+
+def now():
+    """Naive UTC timestamp truncated to what BSON dates store (milliseconds)."""
+    ts = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    return ts.replace(microsecond=ts.microsecond // 1000 * 1000)
+
+
+def stamped(update):
+    """``update`` kwargs plus the version bump every write must carry."""
+    return {**update, "inc__version": 1, "set__updated_at": now()}
+
+
+class VersionedQuerySet(QuerySet):
+    """QuerySet whose updates always bump ``version`` and ``updated_at``."""
+
+    def update(self, upsert=False, multi=True, **update):
+        return super().update(upsert=upsert, multi=multi, **stamped(update))
+
+    def modify(self, upsert=False, remove=False, **update):
+        if not remove:
+            update = stamped(update)
+        return super().modify(upsert=upsert, remove=remove, **update)
+
+
+class VersionedDocument(Document):
+    """Base for API entities: every write moves ``version`` and ``updated_at``.
+
+    New documents start at version 1. ``save`` bumps existing documents;
+    queryset updates are stamped by ``VersionedQuerySet`` and raw bulk writes
+    use ``stamped`` (resources/bulk.py).
+    """
+
+    meta = {
+        "abstract": True,
+        "queryset_class": VersionedQuerySet,
+        "indexes": [("id", "version", "updated_at")],
+    }
+    version = IntField(default=1)
+    updated_at = DateTimeField(default=now)
+
+    def save(self, *args, **kwargs):
+        if not self._created:
+            self.version = (self.version or 0) + 1
+            self.updated_at = now()
+        return super().save(*args, **kwargs)
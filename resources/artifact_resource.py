@@ -1,13 +1,38 @@
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
 from resources.auth_utils import admin_required
+from resources.pagination import paginate
+from resources.dereference import prefetch_artifacts
+from resources.cache import cached
+from resources.conditional import conditional
+from resources.export import stream_export
+from resources.serialization import render
+from resources.fieldsets import project, sparse_fieldset
+from resources.bulk import (
+    check_batch_size,
+    delete_documents,
+    existing_ids,
+    insert_documents,
+    item_result,
+    succeeded_ids,
+    summarize,
+    update_documents,
+)
+from resources.events import notify_changed
+from resources.read_model import artifact_projection, prefetch_artifact_reads
 from models.artifact import Artifact
 from models.artist import Artist
 from schemas.artifact_schema import (
     ArtifactInSchema,
     ArtifactPatchSchema,
+    ArtifactBulkPatchSchema,
     ArtifactOutSchema,
+    ArtifactFieldsArgsSchema,
+    ArtifactQueryArgsSchema,
+    ArtifactRelatedArgsSchema,
+    ArtifactExportArgsSchema,
 )
+from schemas.bulk_schema import BulkDeleteSchema, BulkResultSchema
 from mongoengine.errors import ValidationError
 from bson.errors import InvalidId
 
@@ -19,11 +44,64 @@ blp = Blueprint(
 )
 
 
+def filter_artifacts(args):
+    """Compile list query arguments into a single artifacts query."""
+    queryset = Artifact.objects
+    if "artist" in args:
+        queryset = queryset.filter(artist=args["artist"])
+    if "tribe" in args:
+        # Resolve the tribe's artists with one query, then match with $in.
+        artist_ids = list(Artist.objects(tribe=args["tribe"]).scalar("id"))
+        queryset = queryset.filter(artist__in=artist_ids)
+    if "era" in args:
+        queryset = queryset.filter(era=args["era"])
+    if "created_from" in args:
+        queryset = queryset.filter(created_date__gte=args["created_from"])
+    if "created_to" in args:
+        queryset = queryset.filter(created_date__lte=args["created_to"])
+    return queryset
+
+
+def artifact_fieldset(args):
+    return sparse_fieldset(
+        ArtifactOutSchema,
+        {
+            "": args.get("fieldset"),
+            "artist_info": args.get("artist_fieldset"),
+            "artist_info.tribe_info": args.get("tribe_fieldset"),
+        },
+    )
+
+
+def new_artifact(data, artist):
+    return Artifact(
+        title=data["title"],
+        description=data.get("description", ""),
+        image_url=data.get("image_url", ""),
+        artist=artist,
+        era=data.get("era", ""),
+        created_date=data.get("created_date"),
+    )
+
+
 @blp.route("/")
 class ArtifactsList(MethodView):
+    @cached("artifacts")
+    @conditional("artifacts")
+    @blp.arguments(ArtifactQueryArgsSchema, location="query")
     @blp.response(200, ArtifactOutSchema(many=True))
-    def get(self):
-        return list(Artifact.objects.all())
+    def get(self, args):
+        fieldset = artifact_fieldset(args)
+        projection = artifact_projection(fieldset.projection)
+        queryset = project(filter_artifacts(args), projection, args["sort"])
+        items, headers = paginate(
+            queryset, args["limit"], args.get("cursor"), args["sort"]
+        )
+        prefetch_artifact_reads(items, fieldset.projection)
+        return (
+            render(ArtifactOutSchema, items, many=True, only=fieldset.only),
+            headers,
+        )
 
     @admin_required
     @blp.arguments(ArtifactInSchema)
@@ -33,48 +111,150 @@ class ArtifactsList(MethodView):
             artist = Artist.objects.get(id=data["artist"])
         except (Artist.DoesNotExist, ValidationError, InvalidId):
             abort(404, message="Artist not found.")
-        artifact = Artifact(
-            title=data["title"],
-            description=data.get("description", ""),
-            image_url=data.get("image_url", ""),
-            artist=artist,
-            era=data.get("era", ""),
-            created_date=data.get("created_date"),
-        ).save()
-        return artifact
+        artifact = new_artifact(data, artist).save()
+        notify_changed("artifacts", artifact.id)
+        return prefetch_artifacts([artifact])[0]
+
+
+@blp.route("/bulk")
+class ArtifactsBulk(MethodView):
+    @admin_required
+    @blp.arguments(ArtifactInSchema(many=True))
+    @blp.response(200, BulkResultSchema)
+    def post(self, items):
+        check_batch_size(items)
+        artists = existing_ids(Artist, [item["artist"] for item in items])
+        results, docs = [], []
+        for index, item in enumerate(items):
+            if item["artist"] in artists:
+                docs.append((index, new_artifact(item, artists[item["artist"]])))
+            else:
+                results.append(item_result(index, 404, message="Artist not found."))
+        results += insert_documents(Artifact, docs)
+        notify_changed("artifacts", *succeeded_ids(results))
+        return summarize(results)
+
+    @admin_required
+    @blp.arguments(ArtifactBulkPatchSchema(many=True))
+    @blp.response(200, BulkResultSchema)
+    def put(self, items):
+        check_batch_size(items)
+        artists = existing_ids(Artist, [i["artist"] for i in items if "artist" in i])
+        results, updates = [], []
+        for index, item in enumerate(items):
+            fields = dict(item)
+            doc_id = fields.pop("id")
+            if "artist" in fields:
+                if fields["artist"] not in artists:
+                    results.append(item_result(index, 404, message="Artist not found."))
+                    continue
+                fields["artist"] = artists[fields["artist"]]
+            updates.append((index, doc_id, fields))
+        results += update_documents(Artifact, updates)
+        notify_changed("artifacts", *succeeded_ids(results))
+        return summarize(results)
+
+    @admin_required
+    @blp.arguments(BulkDeleteSchema)
+    @blp.response(200, BulkResultSchema)
+    def delete(self, data):
+        check_batch_size(data["ids"])
+        results = delete_documents(Artifact, data["ids"])
+        notify_changed("artifacts", *succeeded_ids(results))
+        return summarize(results)
+
+
+@blp.route("/export")
+class ArtifactsExport(MethodView):
+    @conditional("artifacts")
+    @blp.arguments(ArtifactExportArgsSchema, location="query")
+    @blp.response(
+        200,
+        ArtifactOutSchema(many=True),
+        description="NDJSON stream (default) or a JSON array, see `format`",
+    )
+    def get(self, args):
+        return stream_export(
+            filter_artifacts(args),
+            ArtifactOutSchema,
+            args["format"],
+            prefetch=prefetch_artifact_reads,
+        )
 
 
 @blp.route("/<string:artifact_id>")
 class ArtifactDetail(MethodView):
+    @cached("artifacts")
+    @conditional("artifacts")
+    @blp.arguments(ArtifactFieldsArgsSchema, location="query")
     @blp.response(200, ArtifactOutSchema)
-    def get(self, artifact_id):
+    def get(self, args, artifact_id):
+        fieldset = artifact_fieldset(args)
         try:
-            return Artifact.objects.get(id=artifact_id)
+            artifact = project(
+                Artifact.objects, artifact_projection(fieldset.projection)
+            ).get(id=artifact_id)
         except (Artifact.DoesNotExist, ValidationError, InvalidId):
             abort(404, message="Artifact not found.")
+        prefetch_artifact_reads([artifact], fieldset.projection)
+        return render(ArtifactOutSchema, artifact, only=fieldset.only)
 
     @admin_required
     @blp.arguments(ArtifactPatchSchema)
     @blp.response(200, ArtifactOutSchema)
     def put(self, data, artifact_id):
-        try:
-            art = Artifact.objects.get(id=artifact_id)
-        except (Artifact.DoesNotExist, ValidationError, InvalidId):
-            abort(404, message="Artifact not found.")
+        artist = None
         if "artist" in data:
             try:
-                data["artist"] = Artist.objects.get(id=data["artist"])
+                artist = Artist.objects.get(id=data["artist"])
             except (Artist.DoesNotExist, ValidationError, InvalidId):
                 abort(404, message="Artist not found.")
-        art.update(**data)
-        return Artifact.objects.get(id=artifact_id)
+            data["artist"] = artist
+        # One findAndModify round trip that returns the updated document.
+        try:
+            artifacts = Artifact.objects(id=artifact_id)
+            if data:
+                art = artifacts.modify(new=True, **data)
+            else:
+                art = artifacts.first()
+        except (ValidationError, InvalidId):
+            art = None
+        if art is None:
+            abort(404, message="Artifact not found.")
+        notify_changed("artifacts", artifact_id)
+        if artist is not None:
+            art._data["artist"] = artist
+        return prefetch_artifacts([art])[0]
 
     @admin_required
     @blp.response(204)
     def delete(self, artifact_id):
         try:
-            art = Artifact.objects.get(id=artifact_id)
-        except (Artifact.DoesNotExist, ValidationError, InvalidId):
+            deleted = Artifact.objects(id=artifact_id).delete()
+        except (ValidationError, InvalidId):
+            deleted = 0
+        if not deleted:
             abort(404, message="Artifact not found.")
-        art.delete()
+        notify_changed("artifacts", artifact_id)
         return "", 204
+
+
+@blp.route("/<string:artifact_id>/related")
+class ArtifactRelated(MethodView):
+    @blp.arguments(ArtifactRelatedArgsSchema, location="query")
+    @blp.response(200, ArtifactOutSchema(many=True))
+    def get(self, args, artifact_id):
+        """Most similar artifacts first, by title, description, era, artist, tribe."""
+        # Imported here so numpy loads on first use, not at worker start.
+        from resources import related
+
+        scores = related.index.related(artifact_id, args["k"])
+        if scores is None:
+            abort(404, message="Artifact not found.")
+        fieldset = artifact_fieldset(args)
+        queryset = project(Artifact.objects, artifact_projection(fieldset.projection))
+        found = {str(a.id): a for a in queryset(id__in=[i for i, _ in scores])}
+        # Deleted by another worker and not caught up yet: skip.
+        items = [found[doc_id] for doc_id, _ in scores if doc_id in found]
+        prefetch_artifact_reads(items, fieldset.projection)
+        return render(ArtifactOutSchema, items, many=True, only=fieldset.only)
@@ -1,9 +1,36 @@
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
 from resources.auth_utils import admin_required
+from resources.pagination import paginate
+from resources.dereference import prefetch_artists
+from resources.cache import cached
+from resources.conditional import conditional
+from resources.export import stream_export
+from resources.serialization import render
+from resources.fieldsets import project, sparse_fieldset
+from resources.bulk import (
+    check_batch_size,
+    delete_documents,
+    existing_ids,
+    insert_documents,
+    item_result,
+    succeeded_ids,
+    summarize,
+    update_documents,
+)
+from resources.events import notify_changed
 from models.artist import Artist
 from models.tribe import Tribe
-from schemas.artist_schema import ArtistInSchema, ArtistPatchSchema, ArtistOutSchema
+from schemas.artist_schema import (
+    ArtistInSchema,
+    ArtistPatchSchema,
+    ArtistBulkPatchSchema,
+    ArtistOutSchema,
+    ArtistFieldsArgsSchema,
+    ArtistQueryArgsSchema,
+    ArtistExportArgsSchema,
+)
+from schemas.bulk_schema import BulkDeleteSchema, BulkResultSchema
 from mongoengine.errors import ValidationError
 from bson.errors import InvalidId
 
@@ -15,11 +42,51 @@ blp = Blueprint(
 )
 
 
+def filter_artists(args):
+    """Compile list query arguments into a single artists query."""
+    queryset = Artist.objects
+    if "tribe" in args:
+        queryset = queryset.filter(tribe=args["tribe"])
+    # `active_years` is [start, end]: on an array, `$lte`/`$gte` match when
+    # any element does, i.e. start <= active_to and end >= active_from.
+    if "active_to" in args:
+        queryset = queryset.filter(active_years__lte=args["active_to"])
+    if "active_from" in args:
+        queryset = queryset.filter(active_years__gte=args["active_from"])
+    return queryset
+
+
+def artist_fieldset(args):
+    return sparse_fieldset(
+        ArtistOutSchema,
+        {"": args.get("fieldset"), "tribe_info": args.get("tribe_fieldset")},
+    )
+
+
+def new_artist(data, tribe):
+    return Artist(
+        name=data["name"],
+        bio=data.get("bio", ""),
+        tribe=tribe,
+        active_years=data["active_years"],
+    )
+
+
 @blp.route("/")
 class ArtistsList(MethodView):
+    @cached("artists")
+    @conditional("artists")
+    @blp.arguments(ArtistQueryArgsSchema, location="query")
     @blp.response(200, ArtistOutSchema(many=True))
-    def get(self):
-        return list(Artist.objects.all())
+    def get(self, args):
+        fieldset = artist_fieldset(args)
+        items, headers = paginate(
+            project(filter_artists(args), fieldset.projection),
+            args["limit"],
+            args.get("cursor"),
+        )
+        prefetch_artists(items, fieldset.projection)
+        return render(ArtistOutSchema, items, many=True, only=fieldset.only), headers
 
     @admin_required
     @blp.arguments(ArtistInSchema)
@@ -29,46 +96,127 @@ class ArtistsList(MethodView):
             tribe = Tribe.objects.get(id=artist_data["tribe"])
         except (Tribe.DoesNotExist, ValidationError, InvalidId):
             abort(404, message="Tribe not found.")
-        artist = Artist(
-            name=artist_data["name"],
-            bio=artist_data.get("bio", ""),
-            tribe=tribe,
-            active_years=artist_data["active_years"],
-        ).save()
+        artist = new_artist(artist_data, tribe).save()
+        notify_changed("artists", artist.id)
         return artist
 
 
+@blp.route("/bulk")
+class ArtistsBulk(MethodView):
+    @admin_required
+    @blp.arguments(ArtistInSchema(many=True))
+    @blp.response(200, BulkResultSchema)
+    def post(self, items):
+        check_batch_size(items)
+        tribes = existing_ids(Tribe, [item["tribe"] for item in items])
+        results, docs = [], []
+        for index, item in enumerate(items):
+            if item["tribe"] in tribes:
+                docs.append((index, new_artist(item, tribes[item["tribe"]])))
+            else:
+                results.append(item_result(index, 404, message="Tribe not found."))
+        results += insert_documents(Artist, docs)
+        notify_changed("artists", *succeeded_ids(results))
+        return summarize(results)
+
+    @admin_required
+    @blp.arguments(ArtistBulkPatchSchema(many=True))
+    @blp.response(200, BulkResultSchema)
+    def put(self, items):
+        check_batch_size(items)
+        tribes = existing_ids(Tribe, [i["tribe"] for i in items if "tribe" in i])
+        results, updates = [], []
+        for index, item in enumerate(items):
+            fields = dict(item)
+            doc_id = fields.pop("id")
+            if "tribe" in fields:
+                if fields["tribe"] not in tribes:
+                    results.append(item_result(index, 404, message="Tribe not found."))
+                    continue
+                fields["tribe"] = tribes[fields["tribe"]]
+            updates.append((index, doc_id, fields))
+        results += update_documents(Artist, updates)
+        notify_changed("artists", *succeeded_ids(results))
+        return summarize(results)
+
+    @admin_required
+    @blp.arguments(BulkDeleteSchema)
+    @blp.response(200, BulkResultSchema)
+    def delete(self, data):
+        check_batch_size(data["ids"])
+        results = delete_documents(Artist, data["ids"])
+        notify_changed("artists", *succeeded_ids(results))
+        return summarize(results)
+
+
+@blp.route("/export")
+class ArtistsExport(MethodView):
+    @conditional("artists")
+    @blp.arguments(ArtistExportArgsSchema, location="query")
+    @blp.response(
+        200,
+        ArtistOutSchema(many=True),
+        description="NDJSON stream (default) or a JSON array, see `format`",
+    )
+    def get(self, args):
+        return stream_export(
+            filter_artists(args),
+            ArtistOutSchema,
+            args["format"],
+            prefetch=prefetch_artists,
+        )
+
+
 @blp.route("/<string:artist_id>")
 class ArtistDetail(MethodView):
+    @cached("artists")
+    @conditional("artists")
+    @blp.arguments(ArtistFieldsArgsSchema, location="query")
     @blp.response(200, ArtistOutSchema)
-    def get(self, artist_id):
+    def get(self, args, artist_id):
+        fieldset = artist_fieldset(args)
         try:
-            return Artist.objects.get(id=artist_id)
+            artist = project(Artist.objects, fieldset.projection).get(id=artist_id)
         except (Artist.DoesNotExist, ValidationError, InvalidId):
             abort(404, message="Artist not found.")
+        prefetch_artists([artist], fieldset.projection)
+        return render(ArtistOutSchema, artist, only=fieldset.only)
 
     @admin_required
     @blp.arguments(ArtistPatchSchema)
     @blp.response(200, ArtistOutSchema)
     def put(self, update_data, artist_id):
-        try:
-            artist = Artist.objects.get(id=artist_id)
-        except (Artist.DoesNotExist, ValidationError, InvalidId):
-            abort(404, message="Artist not found.")
+        tribe = None
         if "tribe" in update_data:
             try:
-                update_data["tribe"] = Tribe.objects.get(id=update_data["tribe"])
+                tribe = Tribe.objects.get(id=update_data["tribe"])
             except (Tribe.DoesNotExist, ValidationError, InvalidId):
                 abort(404, message="Tribe not found.")
-        artist.update(**update_data)
-        return Artist.objects.get(id=artist_id)
+            update_data["tribe"] = tribe
+        # One findAndModify round trip that returns the updated document.
+        try:
+            artists = Artist.objects(id=artist_id)
+            if update_data:
+                artist = artists.modify(new=True, **update_data)
+            else:
+                artist = artists.first()
+        except (ValidationError, InvalidId):
+            artist = None
+        if artist is None:
+            abort(404, message="Artist not found.")
+        notify_changed("artists", artist_id)
+        if tribe is not None:
+            artist._data["tribe"] = tribe
+        return prefetch_artists([artist])[0]
 
     @admin_required
     @blp.response(204)
     def delete(self, artist_id):
         try:
-            artist = Artist.objects.get(id=artist_id)
-        except (Artist.DoesNotExist, ValidationError, InvalidId):
+            deleted = Artist.objects(id=artist_id).delete()
+        except (ValidationError, InvalidId):
+            deleted = 0
+        if not deleted:
             abort(404, message="Artist not found.")
-        artist.delete()
+        notify_changed("artists", artist_id)
         return "", 204
@@ -3,6 +3,7 @@ from flask_smorest import Blueprint, abort
 from flask import jsonify
 from flask_jwt_extended import create_access_token
 from models.user import User
+from resources.passwords import hash_password, verify_password
 from schemas.user_schema import UserRegisterSchema, UserOutSchema
 
 blp = Blueprint("Auth", "auth", url_prefix="/auth", description="Authentication")
@@ -15,8 +16,10 @@ class Register(MethodView):
     def post(self, data):
         if User.objects(username=data["username"]).first():
             abort(400, message="Username already exists.")
-        user = User(username=data["username"])
-        user.set_password(data["password"])
+        # Hashed in the bounded pool (429 when it is saturated).
+        user = User(
+            username=data["username"], password_hash=hash_password(data["password"])
+        )
         user.save()
         return user
 
@@ -25,8 +28,9 @@ class Register(MethodView):
 class Login(MethodView):
     @blp.arguments(UserRegisterSchema)
     def post(self, data):
-        user = User.objects(username=data["username"]).first()
-        if not user or not user.check_password(data["password"]):
+        users = User.objects(username=data["username"])
+        user = users.only("password_hash", "role").first()
+        if not user or not verify_password(user.password_hash, data["password"]):
             abort(401, message="Bad credentials")
         token = create_access_token(
             identity=str(user.id), additional_claims={"role": user.role}
@@ -0,0 +1,131 @@
+import os
+from bson import ObjectId
+from flask_smorest import abort
+from mongoengine.errors import ValidationError
+from mongoengine.queryset import transform
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from models.versioned import stamped
+
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "5000"))
+
+
+def check_batch_size(items):
+    if len(items) > BULK_MAX_ITEMS:
+        abort(422, message=f"At most {BULK_MAX_ITEMS} items per bulk request.")
+
+
+def item_result(index, status, doc_id=None, message=None):
+    result = {"index": index, "status": status}
+    if doc_id is not None:
+        result["id"] = str(doc_id)
+    if message is not None:
+        result["message"] = message
+    return result
+
+
+def succeeded_ids(results):
+    return [r["id"] for r in results if r["status"] < 400]
+
+
+def summarize(results):
+    results.sort(key=lambda r: r["index"])
+    ok = sum(1 for r in results if r["status"] < 400)
+    return {"succeeded": ok, "failed": len(results) - ok, "items": results}
+
+
+def existing_ids(document_cls, ids):
+    """Map every id in ``ids`` that exists in the collection to its ObjectId.
+
+    Costs a single ``$in`` query; malformed ids are simply absent.
+    """
+    oids = {i: ObjectId(i) for i in set(ids) if ObjectId.is_valid(i)}
+    found = set(document_cls.objects(id__in=list(oids.values())).scalar("id"))
+    return {i: oid for i, oid in oids.items() if oid in found}
+
+
+def _write(operation, positions, results):
+    """Run an unordered bulk ``operation``; record per-item write errors.
+
+    ``positions`` maps the index of each submitted op back to its index in
+    the request. Returns the request indexes that failed.
+    """
+    try:
+        operation()
+        return set()
+    except BulkWriteError as e:
+        failed = set()
+        for error in e.details["writeErrors"]:
+            index = positions[error["index"]]
+            status = 409 if error["code"] == 11000 else 422
+            results.append(item_result(index, status, message=error["errmsg"]))
+            failed.add(index)
+        return failed
+
+
+def insert_documents(document_cls, docs):
+    """Validate and ``insert_many(ordered=False)`` ``[(index, document), ...]``."""
+    results, sons, positions = [], [], []
+    for index, doc in docs:
+        try:
+            doc.validate()
+        except ValidationError as e:
+            results.append(item_result(index, 422, message=str(e)))
+            continue
+        sons.append(doc.to_mongo().to_dict())
+        positions.append(index)
+    if not sons:
+        return results
+
+    collection = document_cls._get_collection()
+    failed = _write(
+        lambda: collection.insert_many(sons, ordered=False), positions, results
+    )
+    for index, son in zip(positions, sons):
+        if index not in failed:
+            results.append(item_result(index, 201, son["_id"]))
+    return results
+
+
+def update_documents(document_cls, updates):
+    """Apply ``[(index, id, fields), ...]`` with one unordered ``bulk_write``."""
+    found = existing_ids(document_cls, [doc_id for _, doc_id, _ in updates])
+    not_found = f"{document_cls.__name__} not found."
+    results, ops, positions = [], [], []
+    for index, doc_id, fields in updates:
+        if doc_id not in found:
+            results.append(item_result(index, 404, message=not_found))
+            continue
+        if fields:
+            update = transform.update(
+                document_cls, **stamped({f"set__{k}": v for k, v in fields.items()})
+            )
+            ops.append(UpdateOne({"_id": found[doc_id]}, update))
+            positions.append(index)
+        else:
+            results.append(item_result(index, 200, doc_id))
+    if not ops:
+        return results
+
+    collection = document_cls._get_collection()
+    failed = _write(
+        lambda: collection.bulk_write(ops, ordered=False), positions, results
+    )
+    written = set(positions) - failed
+    for index, doc_id, _ in updates:
+        if index in written:
+            results.append(item_result(index, 200, doc_id))
+    return results
+
+
+def delete_documents(document_cls, ids):
+    """Delete ``ids`` with one ``delete_many``; missing ids are reported as 404."""
+    found = existing_ids(document_cls, ids)
+    document_cls._get_collection().delete_many({"_id": {"$in": list(found.values())}})
+    not_found = f"{document_cls.__name__} not found."
+    return [
+        item_result(index, 204, doc_id)
+        if doc_id in found
+        else item_result(index, 404, message=not_found)
+        for index, doc_id in enumerate(ids)
+    ]
@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from flask import Response, request
+from resources.conditional import revalidate
+from resources.events import entity_changed
+from resources.serialization import representation
+
+# ─── Config
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()  # memory | disk | none
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache/responses")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "4096"))
+# Writes of more documents than this evict every detail page of the entity
+# instead of writing one generation key per document.
+CACHE_INVALIDATE_MAX_IDS = int(os.getenv("CACHE_INVALIDATE_MAX_IDS", "100"))
+CACHE_TTLS = {
+    "tribes": int(os.getenv("CACHE_TTL_TRIBES", "600")),
+    "artists": int(os.getenv("CACHE_TTL_ARTISTS", "300")),
+    "artifacts": int(os.getenv("CACHE_TTL_ARTIFACTS", "120")),
+}
+
+
+class MemoryBackend:
+    """Thread-safe in-process LRU with per-entry expiry (one copy per worker)."""
+
+    def __init__(self, max_entries):
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._live(key)
+
+    def _live(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        with self._lock:
+            if self._live(key) is not None:
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def _store(self, key, value, ttl):
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskBackend:
+    """diskcache-backed store shared by every worker process on the host."""
+
+    def __init__(self, directory):
+        import diskcache
+
+        self._cache = diskcache.Cache(directory)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value, ttl=None):
+        self._cache.set(key, value, expire=ttl)
+
+    def add(self, key, value, ttl=None):
+        return self._cache.add(key, value, expire=ttl)
+
+    def clear(self):
+        self._cache.clear()
+
+
+def _make_backend(name):
+    if name == "memory":
+        return MemoryBackend(CACHE_MAX_ENTRIES)
+    if name == "disk":
+        return DiskBackend(CACHE_DIR)
+    return None
+
+
+backend = _make_backend(CACHE_BACKEND)
+
+
+def clear():
+    if backend is not None:
+        backend.clear()
+
+
+# ─── Generations
+# Every cache key embeds the random generation tokens of its scopes: the
+# entity for list routes; "<entity>:*" and "<entity>:<id>" for detail routes.
+# Invalidating a scope just replaces its token, which orphans every cached
+# variant (query strings, pages) at once; orphans then age out through
+# TTL/LRU. Tokens live in the backend itself, so a hit costs no Mongo round
+# trip, and with the disk backend a write invalidates every worker's copy.
+# A token expires with the entity's TTL: by then every entry cached under it
+# has too, and a fresh token only costs misses.
+def _generation(scope, ttl):
+    key = f"gen:{scope}"
+    token = backend.get(key)
+    if token is None:
+        backend.add(key, uuid.uuid4().hex, ttl)
+        token = backend.get(key)
+    return token
+
+
+def invalidate(entity, ids=(), cascaded=False):
+    """Evict the list pages of ``entity`` and the detail pages of ``ids``.
+
+    ``cascaded``: documents of ``entity`` embed a changed one, which ones is
+    not known. Then, or past ``CACHE_INVALIDATE_MAX_IDS`` ids, every detail
+    page of ``entity`` is evicted with a single key.
+    """
+    if backend is None:
+        return
+    if cascaded or len(ids) > CACHE_INVALIDATE_MAX_IDS:
+        details = [f"{entity}:*"]
+    else:
+        details = [f"{entity}:{i}" for i in ids]
+    for scope in [entity, *details]:
+        backend.set(f"gen:{scope}", uuid.uuid4().hex, CACHE_TTLS[entity])
+
+
+def _on_entity_changed(entity, ids, cascaded=False):
+    invalidate(entity, ids, cascaded)
+
+
+entity_changed.connect(_on_entity_changed)
+
+
+def cached(entity):
+    """Serve repeated GETs of ``entity`` routes from the response cache.
+
+    Apply outermost, above ``@conditional`` and ``@blp.arguments``/
+    ``@blp.response``: a hit returns the stored response, or a 304 matched
+    against its stored ``ETag``, without touching Mongo or marshmallow.
+    """
+    ttl = CACHE_TTLS[entity]
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if backend is None:
+                return fn(*args, **kwargs)
+            ids = list(request.view_args.values())
+            scopes = [f"{entity}:*", f"{entity}:{ids[0]}"] if ids else [entity]
+            tokens = ":".join(_generation(scope, ttl) for scope in scopes)
+            key = f"{tokens}:{representation()}:{request.full_path}"
+
+            hit = backend.get(key)
+            if hit is not None:
+                status, headers, body = hit
+                resp = revalidate(Response(body, status=status, headers=headers))
+                resp.headers["X-Cache"] = "HIT"
+                return resp
+
+            resp = fn(*args, **kwargs)
+            if resp.status_code == 200 and not resp.is_streamed:
+                backend.set(
+                    key,
+                    (resp.status_code, list(resp.headers.items()), resp.get_data()),
+                    ttl,
+                )
+            resp.headers["X-Cache"] = "MISS"
+            return resp
+
+        return wrapper
+
+    return decorator
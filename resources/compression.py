@@ -0,0 +1,157 @@
+"""Response compression negotiated from ``Accept-Encoding``.
+
+JSON, NDJSON, MessagePack and text bodies are compressed with the client's
+best supported encoding, preferring ``zstd`` (``pip install zstandard``),
+then ``br`` (``pip install brotli``), ``gzip`` and ``deflate``. Bodies
+smaller than ``COMPRESS_MIN_SIZE`` bytes are sent as is: the headers would
+cost more than the saving. Streamed bodies (exports) are compressed chunk by
+chunk and flushed after each one, so rows still reach the client as they
+are read. A compressed response carries a distinct strong ``ETag`` (the
+identity tag plus ``-<encoding>``), which ``resources/conditional.py``
+matches when revalidating.
+"""
+
+import os
+import zlib
+from flask import request
+
+try:  # optional encodings
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION = os.getenv("COMPRESSION", "true").lower() == "true"
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+COMPRESS_LEVELS = {
+    "zstd": int(os.getenv("COMPRESS_LEVEL_ZSTD", "3")),
+    "br": int(os.getenv("COMPRESS_LEVEL_BR", "4")),
+    "gzip": int(os.getenv("COMPRESS_LEVEL_GZIP", "6")),
+    "deflate": int(os.getenv("COMPRESS_LEVEL_GZIP", "6")),  # same algorithm
+}
+
+
+# ─── Compressors
+# compress(data) -> bytes so far, flush() -> everything buffered (a complete
+# block the client can decode), finish() -> the end of the stream.
+class _Zlib:
+    def __init__(self, level, wbits):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+class _Brotli:
+    def __init__(self, level):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._obj.process(data)
+
+    def flush(self):
+        return self._obj.flush()
+
+    def finish(self):
+        return self._obj.finish()
+
+
+class _Zstd:
+    def __init__(self, level):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+_COMPRESSORS = {
+    "zstd": _Zstd if zstandard is not None else None,
+    "br": _Brotli if brotli is not None else None,
+    "gzip": lambda level: _Zlib(level, 16 + zlib.MAX_WBITS),
+    "deflate": lambda level: _Zlib(level, zlib.MAX_WBITS),  # zlib format
+}
+# In order of preference when the client accepts several equally.
+ENCODINGS = [name for name, make in _COMPRESSORS.items() if make is not None]
+
+
+def compressor(encoding):
+    return _COMPRESSORS[encoding](COMPRESS_LEVELS[encoding])
+
+
+def compress(data, encoding):
+    obj = compressor(encoding)
+    return obj.compress(data) + obj.finish()
+
+
+def _compress_stream(chunks, encoding):
+    obj = compressor(encoding)
+    for chunk in chunks:
+        if chunk:
+            yield obj.compress(chunk) + obj.flush()
+    yield obj.finish()
+
+
+# ─── Negotiation
+def negotiate():
+    """The encoding to use for this request, None for the identity."""
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def etag_variants(etag):
+    """Every tag a client may hold for the representation tagged ``etag``."""
+    return [etag, *(f"{etag}-{encoding}" for encoding in _COMPRESSORS)]
+
+
+def _compressible(response):
+    mimetype = response.mimetype or ""
+    return mimetype.startswith("text/") or mimetype.endswith(("json", "msgpack"))
+
+
+def compress_response(response):
+    """``after_request`` hook: compress ``response`` for the client."""
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or request.method == "HEAD"
+        or response.direct_passthrough  # files
+        or "Content-Encoding" in response.headers
+        or not _compressible(response)
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.iter_encoded(), encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_data(compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
+
+
+def init_app(app):
+    app.after_request(compress_response)
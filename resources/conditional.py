@@ -0,0 +1,177 @@
+import datetime
+import hashlib
+from functools import wraps
+from bson.errors import InvalidId
+from flask import Response, request
+from mongoengine.errors import ValidationError
+from pymongo.errors import OperationFailure
+from models.artifact import Artifact
+from models.artist import Artist
+from models.tribe import Tribe
+from models.generation import Generation
+from models.versioned import VALIDATOR_INDEX, now
+from resources.compression import etag_variants
+from resources.events import entity_changed
+from resources.serialization import representation
+
+DOCUMENTS = {"tribes": Tribe, "artists": Artist, "artifacts": Artifact}
+# Entity -> (reference field, entity of the document it embeds).
+PARENTS = {"artists": ("tribe", "tribes"), "artifacts": ("artist", "artists")}
+
+
+# ─── Validators
+# A detail route is validated by its document's version and the versions of
+# the documents it embeds (an artifact's artist and tribe), a list route by
+# the generation counter of its collection. Writing a parent therefore never
+# touches its descendants. The lookups read a handful of bytes; none loads
+# or serializes the documents being served.
+def _on_entity_changed(entity, ids, cascaded=False):
+    Generation.objects(id=entity).update_one(
+        inc__value=1, set__updated_at=now(), upsert=True
+    )
+
+
+entity_changed.connect(_on_entity_changed)
+
+
+def list_validator(entity):
+    gen = Generation.objects(id=entity).as_pymongo().first()
+    if gen is None:
+        return "0", None
+    return f"{gen['value']}:{gen['updated_at'].isoformat()}", gen["updated_at"]
+
+
+def _parents(entity):
+    """``(reference field, entity)`` of each document ``entity`` embeds."""
+    while entity in PARENTS:
+        field, entity = PARENTS[entity]
+        yield field, entity
+
+
+def _find_validator(entity, doc_id):
+    queryset = DOCUMENTS[entity].objects(id=doc_id)
+    if entity not in PARENTS:
+        queryset = queryset.only("version", "updated_at").as_pymongo()
+        try:
+            return queryset.hint(VALIDATOR_INDEX).first()
+        except OperationFailure:  # index not built yet
+            return queryset.first()
+
+    # One round trip joins the whole chain: artifact -> artist -> tribe.
+    pipeline, path = [], None
+    fields = {"version": 1, "updated_at": 1}
+    for field, parent in _parents(entity):
+        pipeline += [
+            {
+                "$lookup": {
+                    "from": DOCUMENTS[parent]._get_collection_name(),
+                    "localField": f"{path}.{field}" if path else field,
+                    "foreignField": "_id",
+                    "as": parent,
+                }
+            },
+            {"$unwind": {"path": f"${parent}", "preserveNullAndEmptyArrays": True}},
+        ]
+        fields.update({f"{parent}.version": 1, f"{parent}.updated_at": 1})
+        path = parent
+    return next(queryset.aggregate([*pipeline, {"$project": fields}]), None)
+
+
+def document_validator(entity, doc_id):
+    """``(validator, last_modified)`` of one document, None if it does not exist.
+
+    Both cover the documents it embeds: an artifact gets a new tag when its
+    artist or tribe is written, without the artifact itself being touched.
+    """
+    try:
+        doc = _find_validator(entity, doc_id)
+    except (ValidationError, InvalidId):
+        return None
+    if doc is None:
+        return None
+    docs = [doc, *(doc.get(parent) or {} for _, parent in _parents(entity))]
+    validator = ".".join(str(d.get("version", 0)) for d in docs)
+    stamps = [d["updated_at"] for d in docs if d.get("updated_at")]
+    return validator, max(stamps, default=None)
+
+
+def _etag(validator):
+    # The representation also depends on the query string (filters, pages,
+    # sparse fieldsets) and the negotiated media type, so both are part of
+    # the tag. Compression appends its encoding (resources/compression.py).
+    raw = f"{validator}|{request.full_path}|{representation()}".encode()
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _not_modified(etag, last_modified):
+    """The tag to answer 304 with if the client's copy is current, else None.
+
+    A client holding a compressed variant gets that variant's tag back.
+    """
+    if request.if_none_match:
+        for variant in etag_variants(etag):
+            if request.if_none_match.contains_weak(variant):
+                return variant
+        return None
+    if last_modified is not None and request.if_modified_since is not None:
+        last_modified = last_modified.replace(tzinfo=datetime.timezone.utc)
+        if last_modified.replace(microsecond=0) <= request.if_modified_since:
+            return etag
+    return None
+
+
+def revalidate(resp):
+    """``resp``, or an empty 304 with its tags if the client's copy is current.
+
+    Lets the response cache answer conditional requests from a stored
+    response's own ``ETag``/``Last-Modified``, without a validator lookup.
+    """
+    etag, _ = resp.get_etag()
+    current = etag and _not_modified(etag, resp.last_modified)
+    if not current:
+        return resp
+    not_modified = Response(status=304)
+    not_modified.set_etag(current)
+    not_modified.last_modified = resp.last_modified
+    return not_modified
+
+
+def conditional(entity):
+    """Add ``ETag``/``Last-Modified`` to GETs of ``entity`` and answer 304s.
+
+    Apply right under ``@cached``: cache hits never reach the validator
+    lookup. On a miss the validator is computed before the view runs, so a
+    matching ``If-None-Match`` costs one lookup and no document is loaded.
+    Validators are read first, so a response is never older than its tag.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            ids = list(request.view_args.values())
+            if ids:
+                validator = document_validator(entity, ids[0])
+                if validator is None:
+                    return fn(*args, **kwargs)
+            else:
+                validator = list_validator(entity)
+            token, last_modified = validator
+            etag = _etag(token)
+
+            current = _not_modified(etag, last_modified)
+            if current is not None:
+                resp, etag = Response(status=304), current
+            else:
+                resp = fn(*args, **kwargs)
+                if resp.status_code != 200:
+                    return resp
+            resp.set_etag(etag)
+            if last_modified is not None:
+                resp.last_modified = last_modified.replace(
+                    tzinfo=datetime.timezone.utc
+                )
+            return resp
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,49 @@
+from bson import DBRef
+from models.artist import Artist
+from models.tribe import Tribe
+
+
+def resolve_references(docs, field, document_cls, only=None):
+    """Batch-load the ``field`` reference of every doc with a single ``$in`` query.
+
+    The loaded instances are written straight into ``_data`` so MongoEngine
+    no longer dereferences them one by one when the schemas read the field.
+    References to missing documents resolve to ``None``. Returns the distinct
+    referenced instances, including ones that were already loaded. ``only``
+    restricts the fields loaded for the referenced documents.
+    """
+    refs = [doc._data.get(field) for doc in docs]
+    ids = {ref.id for ref in refs if isinstance(ref, DBRef)}
+    queryset = document_cls.objects(id__in=ids)
+    if only is not None:
+        queryset = queryset.only(*only)
+    by_id = {obj.id: obj for obj in queryset} if ids else {}
+    for doc, ref in zip(docs, refs):
+        if isinstance(ref, DBRef):
+            doc._data[field] = by_id.get(ref.id)
+        elif ref is not None:
+            by_id.setdefault(ref.id, ref)
+    return list(by_id.values())
+
+
+def _nested(projection, field):
+    return None if projection is None else projection.get(field)
+
+
+def prefetch_artists(artists, projection=None):
+    """Resolve ``artist.tribe`` for a batch of artists (one query).
+
+    ``projection`` is a sparse fieldset projection (resources/fieldsets.py).
+    Documents loaded without the reference hold None, so an unselected
+    reference costs no query at all.
+    """
+    resolve_references(artists, "tribe", Tribe, _nested(projection, "tribe"))
+    return artists
+
+
+def prefetch_artifacts(artifacts, projection=None):
+    """Resolve ``artifact.artist`` and ``artist.tribe`` (at most two queries)."""
+    artist_projection = _nested(projection, "artist")
+    artists = resolve_references(artifacts, "artist", Artist, artist_projection)
+    prefetch_artists(artists, artist_projection)
+    return artifacts
@@ -0,0 +1,111 @@
+import datetime
+import json
+from bson import ObjectId, json_util
+from flask.views import MethodView
+from flask_smorest import Blueprint
+from resources.auth_utils import admin_required
+from resources.pagination import sort_keys
+from resources.artifact_resource import filter_artifacts
+from resources.artist_resource import filter_artists
+from resources.tribe_resource import filter_tribes
+from models.artifact import Artifact
+from models.artist import Artist
+from models.versioned import VALIDATOR_INDEX
+from schemas.diagnostics_schema import QueryPlanSchema
+from schemas.pagination_schema import DEFAULT_PAGE_SIZE
+
+blp = Blueprint(
+    "Diagnostics",
+    "diagnostics",
+    url_prefix="/api/v1/diagnostics",
+    description="Operational diagnostics (admin only)",
+)
+
+_PROBE_ID = str(ObjectId("0" * 24))
+_PROBE_DATE = datetime.datetime(2000, 1, 1)
+
+
+def _page(filter_fn, args=None, sort="id"):
+    """Probe for a list route: its filter plus the keyset sort it pages by."""
+    prefix = "-" if sort.startswith("-") else ""
+    keys = [prefix + key for key in sort_keys(sort)]
+    return lambda: filter_fn(args or {}).order_by(*keys)
+
+
+# One representative query per list/filter path, built by the same functions
+# the routes (and the change cascade) use to query Mongo.
+EXPLAINED_QUERIES = {
+    "GET /api/v1/tribes/": _page(filter_tribes),
+    "GET /api/v1/tribes/?region=": _page(filter_tribes, {"region": "NT"}),
+    "GET /api/v1/artists/": _page(filter_artists),
+    "GET /api/v1/artists/?tribe=": _page(filter_artists, {"tribe": _PROBE_ID}),
+    "GET /api/v1/artists/?active_from=&active_to=": _page(
+        filter_artists, {"active_from": 1950, "active_to": 1980}
+    ),
+    "GET /api/v1/artifacts/": _page(filter_artifacts),
+    "GET /api/v1/artifacts/?artist=": _page(filter_artifacts, {"artist": _PROBE_ID}),
+    "GET /api/v1/artifacts/?tribe=": _page(filter_artifacts, {"tribe": _PROBE_ID}),
+    "GET /api/v1/artifacts/?era=&created_from=": _page(
+        filter_artifacts, {"era": "Contemporary", "created_from": _PROBE_DATE}
+    ),
+    "GET /api/v1/artifacts/?sort=-created_date": _page(
+        filter_artifacts, sort="-created_date"
+    ),
+    "GET /api/v1/search?q= (artifacts)": lambda: Artifact.objects.search_text(
+        "probe"
+    ),
+    "GET /api/v1/artifacts/<id> (ETag validator)": lambda: Artifact.objects(
+        id=_PROBE_ID
+    )
+    .only("version", "updated_at")
+    .hint(VALIDATOR_INDEX),
+    "artists by tribe (change cascade)": lambda: Artist.objects(
+        tribe__in=[_PROBE_ID]
+    ),
+    "artifacts by artist (change cascade)": lambda: Artifact.objects(
+        artist__in=[_PROBE_ID]
+    ),
+    "artifacts by snapshot tribe (read model fan-out)": lambda: Artifact.objects(
+        artist_snapshot__tribe__id=_PROBE_ID
+    ),
+}
+
+
+def _walk_plan(node, stages, indexes):
+    if isinstance(node, dict):
+        if "stage" in node:
+            stages.append(node["stage"])
+        if "indexName" in node:
+            indexes.append(node["indexName"])
+        for value in node.values():
+            _walk_plan(value, stages, indexes)
+    elif isinstance(node, list):
+        for value in node:
+            _walk_plan(value, stages, indexes)
+
+
+def explain_query(route, queryset):
+    queryset = queryset.limit(DEFAULT_PAGE_SIZE + 1)
+    plan = {
+        "route": route,
+        "collection": queryset._document._get_collection_name(),
+        "filter": json.loads(json_util.dumps(queryset._query)),
+    }
+    try:
+        winning = queryset.explain()["queryPlanner"]["winningPlan"]
+    except Exception as e:
+        plan["error"] = str(e)
+        return plan
+    stages, indexes = [], []
+    _walk_plan(winning, stages, indexes)
+    plan.update(stages=stages, indexes=indexes, collscan="COLLSCAN" in stages)
+    return plan
+
+
+@blp.route("/explain")
+class ExplainPlans(MethodView):
+    @admin_required
+    @blp.response(200, QueryPlanSchema(many=True))
+    def get(self):
+        """Winning query plans for every list/filter path (flags COLLSCANs)."""
+        return [explain_query(route, qs()) for route, qs in EXPLAINED_QUERIES.items()]
@@ -0,0 +1,31 @@
+from blinker import Namespace
+
+_signals = Namespace()
+
+# Sent with the entity name ("tribes", "artists", "artifacts") as sender and
+# the affected document ids after every successful write. Artists embed their
+# tribe and artifacts embed their artist (and its tribe), so the signal is
+# sent again for every entity embedding a changed one, with ``cascaded=True``
+# and no ids: the embedding documents are not looked up. Their detail
+# validators fold in the versions of the documents they embed
+# (resources/conditional.py), so only collection-wide state (list pages,
+# generation counters) has to follow a cascade.
+entity_changed = _signals.signal("entity-changed")
+
+# Sent first, for the written documents only: receivers that rewrite data
+# derived from them (the embedded read model's snapshots) finish before any
+# cache or validator moves, so nothing older can be cached under the new
+# generation.
+entity_written = _signals.signal("entity-written")
+
+# Entity -> the entities embedding it, nearest first.
+EMBEDDED_IN = {"tribes": ["artists", "artifacts"], "artists": ["artifacts"]}
+
+
+def notify_changed(entity, *ids):
+    """Announce that documents of ``entity`` were created, updated or deleted."""
+    ids = [str(i) for i in ids]
+    entity_written.send(entity, ids=ids)
+    entity_changed.send(entity, ids=ids, cascaded=False)
+    for embedding in EMBEDDED_IN.get(entity, ()):
+        entity_changed.send(embedding, ids=[], cascaded=True)
@@ -0,0 +1,45 @@
+import os
+from itertools import islice
+from flask import Response, stream_with_context
+from resources.serialization import dump, dumps
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+MIMETYPES = {"ndjson": "application/x-ndjson", "json": "application/json"}
+
+
+def _dumped_batches(queryset, schema_cls, prefetch):
+    # no_cache() stops MongoEngine from keeping every yielded document alive,
+    # so memory is bounded by one batch whatever the collection size. The
+    # generator wrapper matters: re-iterating a no-cache queryset restarts it.
+    queryset = queryset.order_by("id").no_cache().batch_size(EXPORT_BATCH_SIZE)
+    cursor = (doc for doc in queryset)
+    while batch := list(islice(cursor, EXPORT_BATCH_SIZE)):
+        if prefetch is not None:
+            prefetch(batch)
+        yield [dumps(row) for row in dump(schema_cls, batch, many=True)]
+
+
+def _ndjson(batches):
+    for rows in batches:
+        yield "".join(row + "\n" for row in rows)
+
+
+def _json_array(batches):
+    yield "["
+    separator = ""
+    for rows in batches:
+        yield separator + ",".join(rows)
+        separator = ","
+    yield "]"
+
+
+def stream_export(queryset, schema_cls, fmt, prefetch=None):
+    """Stream every document of ``queryset`` as NDJSON or a JSON array.
+
+    Rows are read from a batched cursor; ``prefetch`` resolves the references
+    of each batch (one query per referenced collection) before it is dumped.
+    """
+    batches = _dumped_batches(queryset, schema_cls, prefetch)
+    body = _ndjson(batches) if fmt == "ndjson" else _json_array(batches)
+    return Response(stream_with_context(body), mimetype=MIMETYPES[fmt])
@@ -0,0 +1,54 @@
+from collections import namedtuple
+from marshmallow import fields
+from resources.pagination import sort_keys
+
+# `only` is the marshmallow ``only`` tuple for dumping; `projection` maps model
+# attributes to the projection of the document they reference (None: all of
+# it). Both are None when the client did not ask for a sparse fieldset.
+Fieldset = namedtuple("Fieldset", ["only", "projection"])
+
+FULL = Fieldset(None, None)
+
+
+def _narrowed(requested, path):
+    return any(
+        names and (key == path or key.startswith(path + "."))
+        for key, names in requested.items()
+    )
+
+
+def _resolve(schema, requested, path):
+    only, projection = [], {}
+    for name in requested.get(path) or schema.fields:
+        field = schema.fields[name]
+        attribute = field.attribute or name
+        child = f"{path}.{name}" if path else name
+        if isinstance(field, fields.Nested) and _narrowed(requested, child):
+            nested_only, projection[attribute] = _resolve(
+                field.schema, requested, child
+            )
+            only += [f"{name}.{nested}" for nested in nested_only]
+        else:
+            only.append(name)
+            projection[attribute] = None
+    return only, projection
+
+
+def sparse_fieldset(schema_cls, requested):
+    """Resolve the ``fields=`` / ``<nested>.fields=`` query arguments.
+
+    ``requested`` maps a path of Nested fields ("" for the top level, then
+    e.g. "artist_info" or "artist_info.tribe_info") to the field names asked
+    for at that level, or None when that argument was not given.
+    """
+    if not any(requested.values()):
+        return FULL
+    only, projection = _resolve(schema_cls(), requested, "")
+    return Fieldset(tuple(only), projection)
+
+
+def project(queryset, projection, sort="id"):
+    """Push ``projection`` down to Mongo, keeping the keyset columns of ``sort``."""
+    if projection is None:
+        return queryset
+    return queryset.only(*projection, *sort_keys(sort))
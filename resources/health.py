@@ -0,0 +1,131 @@
+"""Liveness and readiness probes.
+
+``/health/live`` answers without touching MongoDB: the process is up and
+serving. ``/health/ready`` sends a ``ping`` bounded by
+``HEALTH_PING_TIMEOUT_MS`` (server selection and connection checkout
+included) and reuses its result for ``HEALTH_CHECK_INTERVAL`` seconds, so
+probing every few seconds from every pod costs at most one round trip per
+interval and worker. Both report the connection pool as counted by
+``PoolStats``, a pymongo ``ConnectionPoolListener`` passed to ``connect``:
+checked-out connections near ``max_pool_size`` or a non-zero wait queue
+show saturation before requests start timing out.
+"""
+
+import os
+import threading
+import time
+import pymongo
+from pymongo import common, monitoring
+from mongoengine import get_db
+
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "5"))
+HEALTH_PING_TIMEOUT_MS = int(os.getenv("HEALTH_PING_TIMEOUT_MS", "1000"))
+
+_FIELDS = ("connections", "checked_out", "wait_queue")
+
+
+# ─── Connection pool
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Open, checked-out and waiting connections per server, in O(1)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._servers = {}  # address -> {field: count, "max_pool_size": n}
+
+    def _add(self, event, **deltas):
+        with self._lock:
+            server = self._servers.get(event.address)
+            if server is None:
+                server = self._servers[event.address] = dict.fromkeys(_FIELDS, 0)
+            for field, delta in deltas.items():
+                server[field] += delta
+
+    def pool_created(self, event):
+        with self._lock:
+            server = self._servers[event.address] = dict.fromkeys(_FIELDS, 0)
+            # Only non-default options are listed.
+            max_size = event.options.get("maxPoolSize", common.MAX_POOL_SIZE)
+            server["max_pool_size"] = max_size
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._servers.pop(event.address, None)
+
+    def connection_created(self, event):
+        self._add(event, connections=1)
+
+    def connection_closed(self, event):
+        self._add(event, connections=-1)
+
+    def connection_check_out_started(self, event):
+        self._add(event, wait_queue=1)
+
+    def connection_checked_out(self, event):
+        self._add(event, wait_queue=-1, checked_out=1)
+
+    def connection_check_out_failed(self, event):
+        self._add(event, wait_queue=-1)
+
+    def connection_checked_in(self, event):
+        self._add(event, checked_out=-1)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def clear(self):
+        with self._lock:
+            self._servers.clear()
+
+    def snapshot(self):
+        """Totals over every server, and the counts per ``host:port``."""
+        with self._lock:
+            servers = {
+                f"{host}:{port}": dict(server)
+                for (host, port), server in self._servers.items()
+            }
+        totals = {f: sum(s[f] for s in servers.values()) for f in _FIELDS}
+        return {**totals, "servers": servers}
+
+
+pool = PoolStats()
+
+
+# ─── Cached ping
+_lock = threading.Lock()
+_last = None  # (monotonic time of the check, result)
+
+
+def ping():
+    start = time.perf_counter()
+    try:
+        with pymongo.timeout(HEALTH_PING_TIMEOUT_MS / 1000):
+            get_db().command("ping")
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+    return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+
+def check():
+    """The last ping, refreshed once ``HEALTH_CHECK_INTERVAL`` has passed.
+
+    A single thread pings at a time; the others wait for its result.
+    """
+    global _last
+    with _lock:
+        if _last is None or time.monotonic() - _last[0] >= HEALTH_CHECK_INTERVAL:
+            result = ping()
+            _last = (time.monotonic(), result)
+        checked_at, result = _last
+    return {**result, "age_s": round(time.monotonic() - checked_at, 3)}
+
+
+def clear():
+    global _last
+    with _lock:
+        _last = None
@@ -0,0 +1,296 @@
+"""Prometheus metrics for requests and MongoDB commands, served at /metrics.
+
+Every thread records into its own shard of preallocated values, so the hot
+path takes no lock and allocates nothing after a label set's first use; a
+scrape sums the shards. Shards of finished threads are folded into one, so
+servers that start a thread per request or recycle threads keep one shard
+per live thread. Per request, the time spent in MongoDB commands
+(from the pymongo ``CommandListener`` passed to ``connect``) and in
+serialization (``resources/serialization.py``) is accumulated next to the
+total latency.
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from flask import request
+from pymongo import monitoring
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+SIZE_BUCKETS = tuple(256 * 4**i for i in range(9))  # 256 B .. 16 MiB
+
+_local = threading.local()
+# (thread, {metric: {labels: value}}) per live thread that recorded
+_shards = []
+_retired = {}  # the sum of the shards of finished threads
+_shards_lock = threading.Lock()  # taken once per thread, and by scrapes
+
+
+def _retire_finished():
+    """Fold the shards of finished threads into ``_retired`` (lock held)."""
+    live = []
+    for thread, shard in _shards:
+        if thread.is_alive():
+            live.append((thread, shard))
+            continue
+        for metric, values in shard.items():
+            retired = _retired.setdefault(metric, {})
+            for labels, value in values.items():
+                retired[labels] = metric._add(retired.get(labels), value)
+    _shards[:] = live
+
+
+def _values(metric):
+    try:
+        shard = _local.shard
+    except AttributeError:
+        shard = _local.shard = {}
+        with _shards_lock:
+            _retire_finished()
+            _shards.append((threading.current_thread(), shard))
+    values = shard.get(metric)
+    if values is None:
+        values = shard[metric] = {}
+    return values
+
+
+# ─── Metric types
+class Metric:
+    kind = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name, self.help, self.labelnames = name, help, labelnames
+        registry.append(self)
+
+    def _merged(self):
+        with _shards_lock:
+            _retire_finished()
+            # _retired only changes under the lock: copy it here
+            shards = [{self: dict(_retired.get(self, {}))}]
+            shards += [shard for _, shard in _shards]
+        merged = {}
+        for shard in shards:
+            for labels, value in dict(shard.get(self, {})).items():
+                merged[labels] = self._add(merged.get(labels), value)
+        return merged
+
+    def _label_text(self, labels, extra=()):
+        pairs = [*zip(self.labelnames, labels), *extra]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in sorted(self._merged().items()):
+            lines += self._samples(labels, value)
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, labels=(), amount=1):
+        values = _values(self)
+        values[labels] = values.get(labels, 0) + amount
+
+    @staticmethod
+    def _add(total, value):
+        return (total or 0) + value
+
+    def _samples(self, labels, value):
+        return [f"{self.name}{self._label_text(labels)} {_number(value)}"]
+
+
+class Gauge(Counter):
+    """A counter that may go down (``inc(amount=-1)``)."""
+
+    kind = "gauge"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+
+    def observe(self, labels, value):
+        values = _values(self)
+        counts = values.get(labels)
+        if counts is None:
+            # one slot per bucket, +Inf, then the sum
+            counts = values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    @staticmethod
+    def _add(total, value):
+        return list(value) if total is None else [a + b for a, b in zip(total, value)]
+
+    def _samples(self, labels, counts):
+        lines, cumulative = [], 0
+        for bound, count in zip((*self.buckets, "+Inf"), counts):
+            cumulative += count
+            le = (("le", bound if bound == "+Inf" else f"{bound:g}"),)
+            text = self._label_text(labels, le)
+            lines.append(f"{self.name}_bucket{text} {cumulative}")
+        text = self._label_text(labels)
+        lines.append(f"{self.name}_sum{text} {_number(counts[-1])}")
+        lines.append(f"{self.name}_count{text} {cumulative}")
+        return lines
+
+
+def _number(value):
+    # Full precision: "{:g}" keeps 6 significant digits, so a counter past a
+    # million would only move in steps.
+    if isinstance(value, int):
+        return str(value)
+    if value != value or value in (float("inf"), float("-inf")):
+        return {"nan": "NaN", "inf": "+Inf", "-inf": "-Inf"}[repr(value)]
+    return repr(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+registry = []
+
+REQUEST_LABELS = ("method", "route")
+requests_total = Counter(
+    "http_requests_total", "HTTP requests handled.", (*REQUEST_LABELS, "status")
+)
+request_seconds = Histogram(
+    "http_request_duration_seconds", "Time to build a response.", REQUEST_LABELS
+)
+db_seconds = Histogram(
+    "http_request_db_seconds", "MongoDB command time per request.", REQUEST_LABELS
+)
+serialization_seconds = Histogram(
+    "http_request_serialization_seconds",
+    "Dumping and JSON encoding time per request.",
+    REQUEST_LABELS,
+)
+response_bytes = Histogram(
+    "http_response_size_bytes",
+    "Response body size (streamed bodies excluded).",
+    REQUEST_LABELS,
+    SIZE_BUCKETS,
+)
+in_flight = Gauge("http_requests_in_flight", "Requests being handled.")
+commands_total = Counter(
+    "mongodb_commands_total",
+    "MongoDB commands sent.",
+    ("collection", "command", "outcome"),
+)
+command_seconds = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command round trip time.",
+    ("collection", "command"),
+)
+
+
+def expose():
+    """Every metric in the Prometheus text exposition format."""
+    return "\n".join(line for metric in registry for line in metric.expose()) + "\n"
+
+
+# ─── Per-request accounting
+# [start, db seconds, serialization seconds] of the request on this thread.
+def _timings():
+    return getattr(_local, "timings", None)
+
+
+@contextmanager
+def serializing():
+    """Count the enclosed block as serialization time of the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _timings()
+        if timings is not None:
+            timings[2] += time.perf_counter() - start
+
+
+def _route():
+    rule = request.url_rule
+    return rule.rule if rule is not None else "unmatched"
+
+
+def before_request():
+    _local.timings = [time.perf_counter(), 0.0, 0.0]
+    in_flight.inc()
+
+
+def after_request(response):
+    timings = _timings()
+    if timings is None:
+        return response
+    labels = (request.method, _route())
+    request_seconds.observe(labels, time.perf_counter() - timings[0])
+    db_seconds.observe(labels, timings[1])
+    serialization_seconds.observe(labels, timings[2])
+    requests_total.inc((*labels, str(response.status_code)))
+    if not response.is_streamed and response.content_length is not None:
+        response_bytes.observe(labels, response.content_length)
+    return response
+
+
+def teardown_request(exc=None):
+    # After a streamed body is sent, so in-flight covers the whole response.
+    if getattr(_local, "timings", None) is not None:
+        _local.timings = None
+        in_flight.inc(amount=-1)
+
+
+def init_app(app):
+    app.before_request(before_request)
+    app.after_request(after_request)
+    app.teardown_request(teardown_request)
+
+
+# ─── MongoDB commands
+class CommandMetrics(monitoring.CommandListener):
+    """Counts and times every command per collection; pass to ``connect``.
+
+    pymongo publishes events on the thread running the command, so the time
+    also lands in that thread's current request.
+    """
+
+    def __init__(self):
+        self._collections = {}  # (connection, request id) -> collection
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        collection = target if isinstance(target, str) else ""
+        self._collections[(event.connection_id, event.request_id)] = collection
+
+    def _finished(self, event, outcome):
+        key = (event.connection_id, event.request_id)
+        collection = self._collections.pop(key, "")
+        seconds = event.duration_micros / 1e6
+        commands_total.inc((collection, event.command_name, outcome))
+        command_seconds.observe((collection, event.command_name), seconds)
+        timings = _timings()
+        if timings is not None:
+            timings[1] += seconds
+
+    def succeeded(self, event):
+        self._finished(event, "success")
+
+    def failed(self, event):
+        self._finished(event, "failure")
+
+
+def event_listeners():
+    """``event_listeners`` for ``connect`` (empty when metrics are off)."""
+    return [CommandMetrics()] if METRICS_ENABLED else []
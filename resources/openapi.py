@@ -0,0 +1,28 @@
+"""Serve the OpenAPI document from a file generated at build time.
+
+Documenting a blueprint makes flask-smorest walk every route and resolve
+every marshmallow schema into the spec, on each worker start. With
+``OPENAPI_SPEC_PATH`` set, ``PrebuiltSpecApi`` registers the blueprints
+without documenting them and serves that file at ``/openapi.json`` instead.
+Write it with ``flask --app app write-openapi <path>`` whenever routes or
+schemas change (e.g. in the image build).
+"""
+
+from flask import current_app
+from flask_smorest import Api
+
+
+class PrebuiltSpecApi(Api):
+    def __init__(self, app, spec_path, **kwargs):
+        with open(spec_path, "rb") as fh:
+            self._spec_json = fh.read()
+        super().__init__(app, **kwargs)
+
+    def register_blueprint(self, blp, *, parameters=None, **options):
+        # Api.register_blueprint without register_views_in_doc.
+        name = options.get("name", blp.name)
+        self._app.extensions["flask-smorest"]["blp_name_to_api"][name] = self
+        self._app.register_blueprint(blp, **options)
+
+    def _openapi_json(self):
+        return current_app.response_class(self._spec_json, mimetype="application/json")
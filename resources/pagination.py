@@ -0,0 +1,107 @@
+import base64
+import binascii
+from urllib.parse import urlencode
+from bson import ObjectId, json_util
+from flask import request
+from flask_smorest import abort
+from mongoengine import Q
+
+
+def encode_cursor(values):
+    """Pack the keyset values of the last row into an opaque URL-safe token."""
+    raw = json_util.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError, binascii.Error):
+        abort(400, message="Invalid cursor.")
+    if not isinstance(values, list) or not values:
+        abort(400, message="Invalid cursor.")
+    return values
+
+
+def _next_link(token):
+    args = request.args.copy()
+    args["cursor"] = token
+    return f'<{request.base_url}?{urlencode(list(args.items(multi=True)))}>; rel="next"'
+
+
+def sort_keys(sort):
+    """Keyset columns for ``sort``: the sort field, then ``_id`` as tie-breaker."""
+    field = sort.lstrip("-")
+    return ["id"] if field == "id" else [field, "id"]
+
+
+def _after(keys, values, descending):
+    """Filter selecting the rows that sort strictly after ``values``.
+
+    Mongo sorts missing/null values first, so they come before everything on
+    an ascending sort and after everything on a descending one.
+    """
+    last_id = values[-1]
+    id_op = "lt" if descending else "gt"
+    if keys == ["id"]:
+        return Q(**{f"id__{id_op}": last_id})
+    field, value = keys[0], values[0]
+    tie = Q(**{field: value, f"id__{id_op}": last_id})
+    if value is None:
+        return tie if descending else Q(**{f"{field}__ne": None}) | tie
+    after = Q(**{f"{field}__{id_op}": value}) | tie
+    return (after | Q(**{field: None})) if descending else after
+
+
+def paginate(queryset, limit, cursor=None, sort="id"):
+    """Return one page of ``queryset`` ordered by ``sort`` and its response headers.
+
+    ``sort`` is a field name, optionally prefixed with ``-``; ``_id`` breaks
+    ties so the keyset is unique. One extra row is fetched to find out whether
+    a next page exists, so the cost of a page never depends on the size of the
+    collection.
+    """
+    descending = sort.startswith("-")
+    keys = sort_keys(sort)
+    prefix = "-" if descending else ""
+
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(keys) or not isinstance(values[-1], ObjectId):
+            abort(400, message="Invalid cursor.")
+        queryset = queryset.filter(_after(keys, values, descending))
+    items = list(queryset.order_by(*(prefix + key for key in keys)).limit(limit + 1))
+
+    headers = {}
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        headers["Link"] = _next_link(encode_cursor([getattr(last, k) for k in keys]))
+    return items, headers
+
+
+def offset_from_cursor(cursor, max_offset):
+    """Offset carried by the cursor of a ranked (offset-paginated) route.
+
+    Ranking a page reads every hit before it, so offsets past ``max_offset``
+    are refused.
+    """
+    if not cursor:
+        return 0
+    values = decode_cursor(cursor)
+    if len(values) != 1 or type(values[0]) is not int or values[0] < 0:
+        abort(400, message="Invalid cursor.")
+    if values[0] > max_offset:
+        abort(400, message=f"Results past the first {max_offset} are not served.")
+    return values[0]
+
+
+def offset_page(hits, limit, offset, max_offset):
+    """Trim ``limit + 1`` ranked ``hits`` to a page and its response headers."""
+    headers = {}
+    if len(hits) > limit:
+        hits = hits[:limit]
+        if offset + limit <= max_offset:
+            headers["Link"] = _next_link(encode_cursor([offset + limit]))
+    return hits, headers
@@ -0,0 +1,98 @@
+"""Password hashing off the request thread, with admission control.
+
+Hashes are computed in a bounded pool (threads by default: hashlib's scrypt
+and pbkdf2 release the GIL; ``PASSWORD_HASH_POOL=process`` for processes), so
+a login burst can use at most ``PASSWORD_HASH_WORKERS`` cores while the
+other request threads keep serving reads. At most ``PASSWORD_HASH_QUEUE``
+hashes may be running or waiting; beyond that ``/auth`` requests get an
+immediate 429 instead of queueing behind them.
+
+Successful verifications are remembered for ``LOGIN_CACHE_TTL`` seconds
+under a keyed blake2b of the stored hash and the password, so repeated
+logins skip the slow hash. The key is random per process and never stored;
+a changed password changes the stored hash and misses.
+"""
+
+import hashlib
+import os
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask_smorest import abort
+from werkzeug.security import check_password_hash, generate_password_hash
+from models.user import PASSWORD_HASH_METHOD
+from resources.cache import MemoryBackend
+
+PASSWORD_HASH_POOL = os.getenv("PASSWORD_HASH_POOL", "thread").lower()  # | process
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+PASSWORD_HASH_QUEUE = int(
+    os.getenv("PASSWORD_HASH_QUEUE", str(4 * PASSWORD_HASH_WORKERS))
+)
+LOGIN_CACHE_TTL = int(os.getenv("LOGIN_CACHE_TTL", "300"))  # 0 disables
+LOGIN_CACHE_ENTRIES = int(os.getenv("LOGIN_CACHE_ENTRIES", "1024"))
+
+RETRY_AFTER = "1"
+
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_QUEUE)
+_pool = None
+_pool_lock = threading.Lock()
+
+_cache_key = secrets.token_bytes(32)
+verified = MemoryBackend(LOGIN_CACHE_ENTRIES)
+
+
+def _executor():
+    # Created on first use, i.e. after a pre-forking server has forked.
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if PASSWORD_HASH_POOL == "process":
+                # Imports multiprocessing: only when asked for.
+                from concurrent.futures import ProcessPoolExecutor
+
+                _pool = ProcessPoolExecutor(PASSWORD_HASH_WORKERS)
+            else:
+                _pool = ThreadPoolExecutor(
+                    PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+                )
+        return _pool
+
+
+def _run(fn, *args):
+    if not _slots.acquire(blocking=False):
+        abort(
+            429,
+            message="Too many authentication requests, retry shortly.",
+            headers={"Retry-After": RETRY_AFTER},
+        )
+    try:
+        future = _executor().submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    # The slot is held until the hash finishes, not until we stop waiting.
+    future.add_done_callback(lambda _: _slots.release())
+    return future.result()
+
+
+def hash_password(password):
+    return _run(generate_password_hash, password, PASSWORD_HASH_METHOD)
+
+
+def _fingerprint(password_hash, password):
+    raw = f"{password_hash}\0{password}".encode()
+    return hashlib.blake2b(raw, key=_cache_key, digest_size=16).hexdigest()
+
+
+def verify_password(password_hash, password):
+    if not LOGIN_CACHE_TTL:
+        return _run(check_password_hash, password_hash, password)
+    fingerprint = _fingerprint(password_hash, password)
+    if verified.get(fingerprint):
+        return True
+    ok = _run(check_password_hash, password_hash, password)
+    if ok:
+        verified.set(fingerprint, True, LOGIN_CACHE_TTL)
+    return ok
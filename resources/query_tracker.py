@@ -0,0 +1,218 @@
+"""Per-request MongoDB query tracking: slow requests and N+1 patterns.
+
+A pymongo ``CommandListener`` (passed to ``connect``) records every command
+sent while a tracker is active on the current thread. With
+``QUERY_TRACKING=log`` (the default when ``FLASK_DEBUG`` is set) each request
+is tracked and the ones over budget are logged: more than
+``QUERY_MAX_COUNT`` commands, more than ``QUERY_MAX_DB_MS`` of database time,
+or the same query shape (the command with every value replaced by ``?``)
+sent more than ``QUERY_MAX_REPEATS`` times, the mark of an N+1 loop.
+``QUERY_TRACKING=raise`` raises ``QueryBudgetExceeded`` instead, which fails
+the test that made the request.
+
+Tests can also assert budgets directly::
+
+    with track_queries() as queries:
+        client.get("/api/v1/artifacts/")
+    assert queries.count <= 4
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from flask import request
+from pymongo import monitoring
+
+log = logging.getLogger(__name__)
+
+_DEBUG = os.getenv("FLASK_DEBUG", "").lower() in ("1", "true")
+# off | log | raise
+QUERY_TRACKING = os.getenv("QUERY_TRACKING", "log" if _DEBUG else "off").lower()
+QUERY_MAX_COUNT = int(os.getenv("QUERY_MAX_COUNT", "20"))
+QUERY_MAX_DB_MS = float(os.getenv("QUERY_MAX_DB_MS", "250"))
+QUERY_MAX_REPEATS = int(os.getenv("QUERY_MAX_REPEATS", "5"))
+
+# Fields that identify the session/transport rather than the query.
+_META_FIELDS = {
+    "lsid",
+    "$db",
+    "$clusterTime",
+    "$readPreference",
+    "txnNumber",
+    "autocommit",
+    "startTransaction",
+    "readConcern",
+    "writeConcern",
+}
+# Walking a cursor is not an N+1: its commands never count as repeats.
+_CURSOR_COMMANDS = {"getMore", "killCursors", "endSessions"}
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def shape(value):
+    """``value`` with every scalar replaced by ``"?"``; ``$in`` lists collapse."""
+    if isinstance(value, dict):
+        return {key: shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) and value:
+        if all(isinstance(item, dict) for item in value):  # e.g. a pipeline
+            return [shape(item) for item in value]
+    return "?"
+
+
+class Query:
+    __slots__ = ("command", "collection", "shape", "duration_ms")
+
+    def __init__(self, command, collection, shape):
+        self.command, self.collection, self.shape = command, collection, shape
+        self.duration_ms = 0.0
+
+    def __repr__(self):
+        return f"<{self.command} {self.collection} {self.shape}>"
+
+
+class QueryLog:
+    """The commands sent while it was active, in order."""
+
+    def __init__(self):
+        self.queries = []
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def db_ms(self):
+        return sum(query.duration_ms for query in self.queries)
+
+    def repeats(self):
+        """``[(query shape, times sent), ...]``, most repeated first."""
+        shapes = Counter(
+            (query.command, query.collection, query.shape)
+            for query in self.queries
+            if query.command not in _CURSOR_COMMANDS
+        )
+        return [(" ".join(key), n) for key, n in shapes.most_common()]
+
+    def problems(self, max_count=None, max_db_ms=None, max_repeats=None):
+        """Why this log is over budget (the ``QUERY_MAX_*`` ones by default)."""
+        max_count = QUERY_MAX_COUNT if max_count is None else max_count
+        max_db_ms = QUERY_MAX_DB_MS if max_db_ms is None else max_db_ms
+        max_repeats = QUERY_MAX_REPEATS if max_repeats is None else max_repeats
+        found = []
+        if self.count > max_count:
+            found.append(f"{self.count} queries (budget {max_count})")
+        if self.db_ms > max_db_ms:
+            found.append(f"{self.db_ms:.1f} ms in MongoDB (budget {max_db_ms:g} ms)")
+        for query_shape, n in self.repeats():
+            if n <= max_repeats:
+                break
+            found.append(f"{n}x {query_shape}")
+        return found
+
+
+# ─── Command listener
+_local = threading.local()
+
+
+def _active():
+    return getattr(_local, "logs", None)
+
+
+def _pending():
+    # (connection, request id) -> Query, until its duration is known
+    try:
+        return _local.pending
+    except AttributeError:
+        _local.pending = {}
+        return _local.pending
+
+
+class QueryListener(monitoring.CommandListener):
+    def started(self, event):
+        logs = _active()
+        if not logs:
+            return
+        command = {
+            key: value
+            for key, value in event.command.items()
+            if key not in _META_FIELDS and key != event.command_name
+        }
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = command.pop("collection", "")
+        query = Query(
+            event.command_name,
+            target if isinstance(target, str) else "",
+            json.dumps(shape(command), default=str),
+        )
+        for query_log in logs:
+            query_log.queries.append(query)
+        _pending()[(event.connection_id, event.request_id)] = query
+
+    def _finished(self, event):
+        query = _pending().pop((event.connection_id, event.request_id), None)
+        if query is not None:
+            query.duration_ms = event.duration_micros / 1000
+
+    succeeded = failed = _finished
+
+
+listener = QueryListener()
+
+
+def _start():
+    query_log = QueryLog()
+    logs = _local.logs = _active() or []
+    logs.append(query_log)
+    return query_log
+
+
+def _stop(query_log):
+    _local.logs.remove(query_log)
+
+
+@contextmanager
+def track_queries():
+    """Record the commands sent by this thread inside the block."""
+    query_log = _start()
+    try:
+        yield query_log
+    finally:
+        _stop(query_log)
+
+
+# ─── Request hooks
+def before_request():
+    if QUERY_TRACKING != "off":
+        _local.request_log = _start()
+
+
+def after_request(response):
+    query_log = getattr(_local, "request_log", None)
+    problems = query_log.problems() if query_log is not None else []
+    if problems:
+        summary = f"{request.method} {request.full_path}: " + "; ".join(problems)
+        if QUERY_TRACKING == "raise":
+            raise QueryBudgetExceeded(summary)
+        log.warning("Query budget exceeded: %s", summary)
+    return response
+
+
+def teardown_request(exc=None):
+    query_log = getattr(_local, "request_log", None)
+    if query_log is not None:
+        _local.request_log = None
+        _stop(query_log)
+
+
+def init_app(app):
+    """Install the request hooks (inert while ``QUERY_TRACKING=off``)."""
+    app.before_request(before_request)
+    app.after_request(after_request)
+    app.teardown_request(teardown_request)
@@ -0,0 +1,179 @@
+"""Token-bucket rate limiting per client, per blueprint and method.
+
+``RATE_LIMITS`` is a comma-separated list of ``<scope>=<requests>/<seconds>``
+rules, where the scope is ``<Blueprint>:<METHOD>``, ``<Blueprint>`` or ``*``
+(every blueprint route); the most specific rule wins. Each client gets one
+bucket per rule that holds ``requests`` tokens and refills at
+``requests / seconds`` tokens per second. Clients are keyed by their JWT
+identity, or by IP address when unauthenticated. Behind a load balancer
+that address is the balancer's unless ``TRUSTED_PROXIES`` is set (see
+app.py), and every anonymous client would share one bucket.
+
+Limiting is off unless enabled: buckets live in this process
+(``RATE_LIMIT_BACKEND=memory``, at most ``RATE_LIMIT_MAX_BUCKETS``, least
+recently used first out) or in a diskcache shared by every worker on the host
+(``disk``), where each update is one SQLite transaction. Routes outside
+blueprints (health, docs) are never limited.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from flask import g, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_smorest import abort
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "none").lower()  # | memory | disk
+RATE_LIMIT_MAX_BUCKETS = int(os.getenv("RATE_LIMIT_MAX_BUCKETS", "100000"))
+RATE_LIMIT_DIR = os.getenv("RATE_LIMIT_DIR", ".cache/ratelimit")
+RATE_LIMITS = os.getenv("RATE_LIMITS", "*=600/60,Artifacts:GET=120/60")
+
+
+class Rule:
+    __slots__ = ("scope", "capacity", "period", "rate")
+
+    def __init__(self, scope, capacity, period):
+        self.scope, self.capacity, self.period = scope, capacity, period
+        self.rate = capacity / period  # tokens per second
+
+
+def parse_rules(spec):
+    """``{scope: Rule}`` from a ``RATE_LIMITS`` string."""
+    rules = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        scope, _, limit = item.partition("=")
+        requests, _, seconds = limit.partition("/")
+        try:
+            rule = Rule(scope.strip(), int(requests), float(seconds or 1))
+        except ValueError:
+            raise ValueError(f"Invalid RATE_LIMITS rule: {item!r}") from None
+        if rule.capacity <= 0 or rule.period <= 0:
+            raise ValueError(f"Invalid RATE_LIMITS rule: {item!r}")
+        rules[rule.scope] = rule
+    return rules
+
+
+def _refill(state, rule, now):
+    tokens, stamp = state if state is not None else (rule.capacity, now)
+    return min(rule.capacity, tokens + (now - stamp) * rule.rate)
+
+
+# ─── Stores
+# `take` spends one token from the bucket `key` if it has one and returns
+# (allowed, tokens left).
+class MemoryStore:
+    """LRU of buckets: the least recently used one goes first when full (an
+    idle bucket has refilled anyway, so dropping it changes no decision)."""
+
+    def __init__(self, max_buckets=RATE_LIMIT_MAX_BUCKETS):
+        self._max_buckets = max_buckets
+        self._buckets = OrderedDict()  # key -> (tokens, timestamp)
+        self._lock = threading.Lock()
+
+    def take(self, key, rule, now):
+        with self._lock:
+            tokens = _refill(self._buckets.get(key), rule, now)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self._max_buckets:
+                self._buckets.popitem(last=False)
+        return allowed, tokens
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class DiskStore:
+    def __init__(self, directory):
+        import diskcache
+
+        self._cache = diskcache.Cache(directory)
+
+    def take(self, key, rule, now):
+        with self._cache.transact():
+            tokens = _refill(self._cache.get(key), rule, now)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            # Idle buckets refill completely within one period: let them go.
+            self._cache.set(key, (tokens, now), expire=rule.period)
+        return allowed, tokens
+
+    def clear(self):
+        self._cache.clear()
+
+
+def _make_store(name):
+    if name == "memory":
+        return MemoryStore()
+    if name == "disk":
+        return DiskStore(RATE_LIMIT_DIR)
+    return None
+
+
+rules = parse_rules(RATE_LIMITS)
+store = _make_store(RATE_LIMIT_BACKEND)
+
+
+def clear():
+    if store is not None:
+        store.clear()
+
+
+# ─── Request hooks
+def rule_for(blueprint, method):
+    return (
+        rules.get(f"{blueprint}:{method}") or rules.get(blueprint) or rules.get("*")
+    )
+
+
+def client_key():
+    # Decoding a token costs ~20µs: only try when one was sent.
+    if "Authorization" in request.headers:
+        try:
+            if verify_jwt_in_request(optional=True):
+                return f"user:{get_jwt_identity()}"
+        except Exception:  # invalid/expired token: the view will reject it
+            pass
+    return f"ip:{request.remote_addr}"
+
+
+def _headers(rule, tokens):
+    # draft-ietf-httpapi-ratelimit-headers: the bucket is full again in `reset`.
+    return {
+        "RateLimit-Limit": str(rule.capacity),
+        "RateLimit-Remaining": str(int(tokens)),
+        "RateLimit-Reset": str(math.ceil((rule.capacity - tokens) / rule.rate)),
+        "RateLimit-Policy": f"{rule.capacity};w={rule.period:g}",
+    }
+
+
+def check_rate_limit():
+    """``before_request`` hook: spend a token or answer 429."""
+    if store is None or request.blueprint is None or request.method == "OPTIONS":
+        return
+    rule = rule_for(request.blueprint, request.method)
+    if rule is None:
+        return
+    key = f"{rule.scope}|{client_key()}"
+    allowed, tokens = store.take(key, rule, time.time())
+    headers = _headers(rule, tokens)
+    if not allowed:
+        headers["Retry-After"] = str(math.ceil((1 - tokens) / rule.rate))
+        abort(429, message="Rate limit exceeded.", headers=headers)
+    g.rate_limit_headers = headers
+
+
+def add_rate_limit_headers(response):
+    """``after_request`` hook."""
+    response.headers.extend(g.pop("rate_limit_headers", {}))
+    return response
@@ -0,0 +1,114 @@
+import os
+from bson import ObjectId
+from models.artifact import Artifact
+from models.artist import Artist
+from models.snapshot import ArtistSnapshot, TribeSnapshot
+from models.tribe import Tribe
+from resources.dereference import prefetch_artifacts, prefetch_artists
+from resources.events import entity_written
+
+# `reference` resolves artist_info through the artist/tribe references;
+# `embedded` serves it from the snapshot stored on each artifact, so an
+# artifact read is a single fetch. Snapshots are only maintained while the
+# embedded model is on: run `flask --app app rebuild-read-model` after
+# switching it on.
+ARTIFACT_READ_MODEL = os.getenv("ARTIFACT_READ_MODEL", "reference").lower()
+EMBEDDED = ARTIFACT_READ_MODEL == "embedded"
+
+REBUILD_BATCH_SIZE = 500
+
+
+def _snapshots(artist_ids):
+    """``{artist ObjectId: ArtistSnapshot}``, built with two ``$in`` queries."""
+    artists = prefetch_artists(list(Artist.objects(id__in=artist_ids)))
+    return {artist.id: ArtistSnapshot.of(artist) for artist in artists}
+
+
+def _write_snapshots(artist_ids, queryset_for):
+    snapshots = _snapshots(artist_ids)
+    for artist_id in artist_ids:
+        snapshot = snapshots.get(ObjectId(artist_id))
+        queryset_for(artist_id).update(set__artist_snapshot=snapshot)
+
+
+def refresh_artists(ids):
+    """Re-snapshot the artists ``ids`` into all of their artifacts."""
+    _write_snapshots(ids, lambda artist_id: Artifact.objects(artist=artist_id))
+
+
+def refresh_tribes(ids):
+    """Fan a tribe change out to the snapshot of every artifact embedding it."""
+    tribes = {str(tribe.id): tribe for tribe in Tribe.objects(id__in=ids)}
+    for tribe_id in ids:
+        Artifact.objects(artist_snapshot__tribe__id=tribe_id).update(
+            set__artist_snapshot__tribe=TribeSnapshot.of(tribes.get(tribe_id))
+        )
+
+
+def refresh_artifacts(ids):
+    """Snapshot the current artist into newly written artifacts ``ids``."""
+    by_artist = {}
+    rows = Artifact.objects(id__in=ids).only("artist").as_pymongo()
+    for row in rows:
+        by_artist.setdefault(str(row["artist"]), []).append(row["_id"])
+    _write_snapshots(
+        list(by_artist),
+        lambda artist_id: Artifact.objects(id__in=by_artist[artist_id]),
+    )
+
+
+def rebuild_snapshots():
+    """Backfill the snapshot of every artifact; returns the artists processed."""
+    artist_ids = [str(i) for i in Artifact._get_collection().distinct("artist")]
+    for start in range(0, len(artist_ids), REBUILD_BATCH_SIZE):
+        refresh_artists(artist_ids[start : start + REBUILD_BATCH_SIZE])
+    return len(artist_ids)
+
+
+def _on_entity_written(entity, ids):
+    # A tribe change is fanned out by tribe id in one update, not per artist.
+    if not EMBEDDED or not ids:
+        return
+    if entity == "tribes":
+        refresh_tribes(ids)
+    elif entity == "artists":
+        refresh_artists(ids)
+    elif entity == "artifacts":
+        refresh_artifacts(ids)
+
+
+entity_written.connect(_on_entity_written)
+
+
+def prefetch_artifact_reads(artifacts, projection=None):
+    """``prefetch_artifacts`` for the read path of the active read model.
+
+    With the embedded model, snapshots stand in for the artist references;
+    only artifacts without a snapshot still resolve them.
+    """
+    if EMBEDDED:
+        for artifact in artifacts:
+            if artifact.artist_snapshot is not None:
+                artifact._data["artist"] = artifact.artist_snapshot
+    return prefetch_artifacts(artifacts, projection)
+
+
+def _paths(prefix, projection):
+    if projection is None:
+        return [prefix]
+    return [
+        path
+        for field, nested in projection.items()
+        for path in _paths(f"{prefix}.{field}", nested)
+    ]
+
+
+def artifact_projection(projection):
+    """Sparse fieldset projection for artifacts under the active read model.
+
+    With the embedded model the selected artist fields are read from the
+    snapshot; the reference is kept for artifacts not snapshotted yet.
+    """
+    if not EMBEDDED or projection is None or "artist" not in projection:
+        return projection
+    return [*projection, *_paths("artist_snapshot", projection["artist"])]
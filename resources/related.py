@@ -0,0 +1,265 @@
+"""Related-artifact recommendations from hashed feature vectors.
+
+Every artifact is a row of one contiguous float32 matrix: the words of its
+title and description, its era, its artist and its tribe are hashed into
+``RELATED_DIMENSIONS`` buckets and the row is L2-normalised, so one
+matrix-vector product scores every artifact by cosine similarity and
+``argpartition`` picks the top k without sorting the rest.
+
+The matrix is built on first use and patched on writes: directly from
+``entity_changed`` for this process's writes, and by re-reading artifacts
+updated since the last sync, and those of artists updated since, when the
+collection's generation counter moved (artist writes, writes from other
+workers). Deletes leave nothing to re-read, so hits are checked against the
+collection before they are returned and rows found missing are dropped.
+With ``RELATED_INDEX_PATH`` set, a built matrix is saved with ``np.save``
+and later processes memory-map it instead of rebuilding.
+"""
+
+import datetime
+import os
+import threading
+import zlib
+import numpy as np
+from mongoengine import Q
+from models.artifact import Artifact
+from models.artist import Artist
+from models.generation import Generation
+from models.versioned import now
+from resources.events import entity_changed
+from resources.search import tokenize
+
+RELATED_DIMENSIONS = int(os.getenv("RELATED_DIMENSIONS", "256"))
+RELATED_INDEX_PATH = os.getenv("RELATED_INDEX_PATH")  # unset: memory only
+
+FEATURE_WEIGHTS = {
+    "title": 2.0,
+    "description": 1.0,
+    "era": 1.5,
+    "artist": 2.0,
+    "tribe": 1.0,
+}
+
+# Writes stamp `updated_at` with the writing server's clock; re-read a little
+# further back than the last sync to absorb skew between workers.
+CLOCK_SKEW = datetime.timedelta(seconds=5)
+
+_FIELDS = ("title", "description", "era", "artist")
+
+
+def _features(row, tribe_id):
+    for field in ("title", "description"):
+        for token in tokenize(row.get(field)):
+            yield f"{field}:{token}", FEATURE_WEIGHTS[field]
+    if row.get("era"):
+        yield f"era:{row['era'].lower()}", FEATURE_WEIGHTS["era"]
+    if row.get("artist"):
+        yield f"artist:{row['artist']}", FEATURE_WEIGHTS["artist"]
+    if tribe_id:
+        yield f"tribe:{tribe_id}", FEATURE_WEIGHTS["tribe"]
+
+
+def vectorize(rows, tribes, dimensions=RELATED_DIMENSIONS):
+    """Normalised hashed feature vectors of raw artifact ``rows``.
+
+    ``tribes`` maps artist ids to tribe ids. crc32 keeps the hashing stable
+    across processes (unlike ``hash``); its top bit gives the sign, which
+    keeps collisions from only ever adding up.
+    """
+    vectors = np.zeros((len(rows), dimensions), dtype=np.float32)
+    for i, row in enumerate(rows):
+        for feature, weight in _features(row, tribes.get(row.get("artist"))):
+            h = zlib.crc32(feature.encode())
+            vectors[i, h % dimensions] += weight if h & 0x80000000 else -weight
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+def _load_rows(queryset):
+    rows = list(queryset.only(*_FIELDS).as_pymongo())
+    artist_ids = {row["artist"] for row in rows if row.get("artist")}
+    artists = Artist.objects(id__in=list(artist_ids)).only("tribe").as_pymongo()
+    return rows, {a["_id"]: a.get("tribe") for a in artists}
+
+
+def _generation():
+    gen = Generation.objects(id="artifacts").as_pymongo().first()
+    return gen["value"] if gen else 0
+
+
+class RelatedIndex:
+    def __init__(self, path=RELATED_INDEX_PATH):
+        self._path = path
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.vectors = np.zeros((0, RELATED_DIMENSIONS), dtype=np.float32)
+            self.alive = np.zeros(0, dtype=bool)
+            self.ids = []  # row -> artifact id (str), None once deleted
+            self.rows = {}  # artifact id -> row
+            self.size = 0
+            self.built = False
+            self.generation = None
+            self.synced_at = None
+
+    # ─── Building
+    def _reserve(self, n):
+        if self.size + n <= len(self.vectors):
+            return
+        capacity = max(1024, 2 * len(self.vectors), self.size + n)
+        grown = np.zeros((capacity, RELATED_DIMENSIONS), dtype=np.float32)
+        grown[: self.size] = self.vectors[: self.size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self.size] = self.alive[: self.size]
+        self.vectors, self.alive = grown, alive
+
+    def _put(self, rows, tribes):
+        vectors = vectorize(rows, tribes)
+        self._reserve(len(rows))
+        for row, vector in zip(rows, vectors):
+            doc_id = str(row["_id"])
+            index = self.rows.get(doc_id)
+            if index is None:
+                index = self.rows[doc_id] = self.size
+                self.ids.append(doc_id)
+                self.size += 1
+            self.vectors[index] = vector
+            self.alive[index] = True
+
+    def _drop(self, doc_id):
+        index = self.rows.pop(doc_id, None)
+        if index is not None:
+            self.alive[index] = False
+            self.ids[index] = None
+
+    def build(self):
+        with self._lock:
+            self.clear()
+            self.generation = _generation()
+            self.synced_at = now()
+            self._put(*_load_rows(Artifact.objects))
+            self.built = True
+            if self._path:
+                self.save()
+
+    def save(self):
+        os.makedirs(self._path, exist_ok=True)
+        for name, array in (
+            ("vectors", self.vectors[: self.size]),
+            ("ids", np.array([i or "" for i in self.ids], dtype="U24")),
+            ("synced_at", np.array([self.synced_at], dtype="datetime64[ms]")),
+        ):
+            tmp = os.path.join(self._path, f"{name}.tmp.npy")
+            np.save(tmp, array)
+            os.replace(tmp, os.path.join(self._path, f"{name}.npy"))
+
+    def _load(self):
+        try:
+            files = {
+                name: os.path.join(self._path, f"{name}.npy")
+                for name in ("vectors", "ids", "synced_at")
+            }
+            vectors = np.load(files["vectors"], mmap_mode="c")
+            ids = np.load(files["ids"]).tolist()
+            synced_at = np.load(files["synced_at"])[0].astype(datetime.datetime)
+        except (OSError, ValueError):
+            return False
+        if vectors.shape[1:] != (RELATED_DIMENSIONS,) or len(ids) != len(vectors):
+            return False
+        # Copy-on-write mapping: pages are shared until a row is patched.
+        self.vectors, self.size = vectors, len(ids)
+        self.ids = [i or None for i in ids]
+        self.alive = np.array([bool(i) for i in ids], dtype=bool)
+        self.rows = {doc_id: row for row, doc_id in enumerate(self.ids) if doc_id}
+        self.synced_at, self.built = synced_at, True
+        return True
+
+    def ensure(self):
+        """Build, load or catch up the matrix before it is queried."""
+        with self._lock:
+            if not self.built:
+                if not (self._path and self._load()):
+                    self.build()
+                    return
+            generation = _generation()
+            if generation != self.generation:
+                self.generation = generation
+                self._catch_up()
+
+    def _catch_up(self):
+        since, self.synced_at = self.synced_at, now()
+        since -= CLOCK_SKEW
+        # An artist may have changed tribe, which its artifacts are not
+        # touched for: re-read those too.
+        artists = list(Artist.objects(updated_at__gte=since).scalar("id"))
+        changed = Artifact.objects(Q(updated_at__gte=since) | Q(artist__in=artists))
+        self._put(*_load_rows(changed))
+
+    # ─── Writes
+    def update(self, ids):
+        """Re-vectorize artifacts ``ids``; deleted ones are removed."""
+        with self._lock:
+            if not self.built:
+                return
+            rows, tribes = _load_rows(Artifact.objects(id__in=ids))
+            found = {str(row["_id"]) for row in rows}
+            for doc_id in set(ids) - found:
+                self._drop(doc_id)
+            self._put(rows, tribes)
+
+    # ─── Queries
+    def _top(self, artifact_id, k):
+        with self._lock:
+            index = self.rows.get(artifact_id)
+            if index is None:
+                return None
+            matrix = self.vectors[: self.size]
+            scores = matrix @ matrix[index]
+            scores[~self.alive[: self.size]] = -np.inf
+            scores[index] = -np.inf
+            k = min(k, self.size - 1)
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [
+                (self.ids[row], float(scores[row]))
+                for row in top
+                if np.isfinite(scores[row])
+            ]
+
+    def related(self, artifact_id, k):
+        """``[(artifact id, score), ...]`` of the ``k`` most similar artifacts.
+
+        Returns None when ``artifact_id`` is not indexed.
+        """
+        self.ensure()
+        while True:
+            hits = self._top(artifact_id, k)
+            if hits is None:
+                return None
+            # Deleted by another worker: drop the rows and score again.
+            ids = [artifact_id, *(doc_id for doc_id, _ in hits)]
+            found = {str(i) for i in Artifact.objects(id__in=ids).scalar("id")}
+            missing = set(ids) - found
+            if not missing:
+                return hits
+            with self._lock:
+                for doc_id in missing:
+                    self._drop(doc_id)
+
+
+index = RelatedIndex()
+
+
+def _on_entity_changed(entity, ids, cascaded=False):
+    # Artist changes (cascaded, without ids) are picked up by ``_catch_up``
+    # once the artifacts generation has moved.
+    if entity == "artifacts" and ids:
+        index.update(ids)
+
+
+entity_changed.connect(_on_entity_changed)
@@ -0,0 +1,214 @@
+"""Ranked full-text search over artifacts, artists and tribes.
+
+Queries run against the Mongo text indexes declared on the models. Where
+``$text`` is not available (mongomock, or before the indexes are built) they
+fall back to an in-process inverted index, built from the collections on
+first use and updated incrementally from ``entity_changed``. The fallback
+lives in each worker process and only sees that process's writes.
+"""
+
+import heapq
+import math
+import os
+import re
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from pymongo.errors import OperationFailure
+from models.artifact import Artifact
+from models.artist import Artist
+from models.tribe import Tribe
+from resources.events import entity_changed
+
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto").lower()  # auto | text | memory
+# Deepest hit a cursor may start at: a page costs offset + limit hits.
+SEARCH_MAX_OFFSET = int(os.getenv("SEARCH_MAX_OFFSET", "1000"))
+
+# entity -> (document, field shown as the hit's label, extra fields returned)
+SEARCHABLE = {
+    "artifacts": (Artifact, "title", ("image_url",)),
+    "artists": (Artist, "name", ()),
+    "tribes": (Tribe, "name", ()),
+}
+
+_TOKEN = re.compile(r"\w\w+")
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+@lru_cache(maxsize=None)
+def text_weights(document):
+    """``{field: weight}`` of the text index declared in ``document.meta``."""
+    for spec in document._meta["index_specs"]:
+        fields = [name for name, kind in spec["fields"] if kind == "text"]
+        if fields:
+            weights = spec.get("weights", {})
+            return {name: weights.get(name, 1) for name in fields}
+    raise LookupError(f"{document.__name__} declares no text index")
+
+
+def _projection(entity):
+    _, label, extra = SEARCHABLE[entity]
+    return [label, *extra]
+
+
+def _hit(entity, row, score):
+    label, *extra = _projection(entity)
+    hit = {"type": entity, "id": str(row["_id"]), "score": score}
+    hit["label"] = row.get(label)
+    hit.update((field, row.get(field)) for field in extra)
+    return hit
+
+
+# ─── Mongo text indexes
+def text_search(q, entities, n):
+    """Top ``n`` hits per entity by ``textScore``; raises if ``$text`` fails."""
+    hits = []
+    for entity in entities:
+        document = SEARCHABLE[entity][0]
+        projection = {field: 1 for field in _projection(entity)}
+        projection["score"] = {"$meta": "textScore"}
+        cursor = (
+            document._get_collection()
+            .find({"$text": {"$search": q}}, projection)
+            .sort([("score", {"$meta": "textScore"})])
+            .limit(n)
+        )
+        hits += [_hit(entity, row, row["score"]) for row in cursor]
+    return hits
+
+
+# ─── In-process fallback
+class InvertedIndex:
+    """Token -> weighted postings over every searchable document.
+
+    Scores are the text-index weight of the matching field times the term's
+    inverse document frequency, summed over the query terms.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(dict)  # token -> {(entity, id): weight}
+        self._docs = {}  # (entity, id) -> (row, tokens)
+        self._lock = threading.RLock()
+        self.built = False
+
+    def clear(self):
+        """Forget everything; the next search rebuilds from the collections."""
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            self.built = False
+
+    def build(self):
+        with self._lock:
+            if self.built:
+                return
+            for entity, (document, _, _) in SEARCHABLE.items():
+                fields = [*text_weights(document), *_projection(entity)]
+                rows = document.objects.only(*fields).as_pymongo().no_cache()
+                for row in rows:
+                    self._add(entity, row)
+            self.built = True
+
+    def _add(self, entity, row):
+        key = (entity, str(row["_id"]))
+        weights = defaultdict(float)
+        for field, weight in text_weights(SEARCHABLE[entity][0]).items():
+            for token in tokenize(row.get(field)):
+                weights[token] += weight
+        for token, weight in weights.items():
+            self._postings[token][key] = weight
+        # Keep only what a hit shows, not the indexed text.
+        shown = {field: row.get(field) for field in _projection(entity)}
+        self._docs[key] = ({"_id": row["_id"], **shown}, list(weights))
+
+    def _remove(self, key):
+        _, tokens = self._docs.pop(key, (None, ()))
+        for token in tokens:
+            postings = self._postings[token]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[token]
+
+    def update(self, entity, ids):
+        """Re-read documents ``ids`` of ``entity``; deleted ones are dropped."""
+        with self._lock:
+            if not self.built:
+                return
+            document = SEARCHABLE[entity][0]
+            fields = [*text_weights(document), *_projection(entity)]
+            rows = document.objects(id__in=ids).only(*fields).as_pymongo()
+            for doc_id in ids:
+                self._remove((entity, str(doc_id)))
+            for row in rows:
+                self._add(entity, row)
+
+    def search(self, q, entities, n):
+        self.build()
+        scores = defaultdict(float)
+        with self._lock:
+            total = len(self._docs)
+            for token in set(tokenize(q)):
+                postings = self._postings.get(token)
+                if not postings:
+                    continue
+                idf = math.log(1 + total / len(postings))
+                for key, weight in postings.items():
+                    if key[0] in entities:
+                        scores[key] += weight * idf
+            top = heapq.nsmallest(n, scores.items(), key=lambda kv: (-kv[1], kv[0]))
+            return [
+                _hit(entity, self._docs[(entity, doc_id)][0], score)
+                for (entity, doc_id), score in top
+            ]
+
+
+index = InvertedIndex()
+
+
+def _on_entity_changed(entity, ids, cascaded=False):
+    # Cascades only touch embedded copies, never the indexed text fields.
+    if not cascaded and ids and entity in SEARCHABLE:
+        index.update(entity, ids)
+
+
+entity_changed.connect(_on_entity_changed)
+
+
+# ─── Entry point
+_text_supported = None if SEARCH_BACKEND == "auto" else SEARCH_BACKEND == "text"
+
+
+def _probe_text():
+    """Whether the server implements ``$text`` at all (checked once)."""
+    global _text_supported
+    if _text_supported is None:
+        try:
+            Tribe._get_collection().find_one({"$text": {"$search": "probe"}})
+            _text_supported = True
+        except NotImplementedError:  # mongomock
+            _text_supported = False
+        except OperationFailure:  # implemented, index missing: still supported
+            _text_supported = True
+    return _text_supported
+
+
+def search(q, entities, limit, offset=0):
+    """Hits ``offset`` to ``offset + limit`` (plus one, to detect a next page).
+
+    Hits of all entities are ranked together by score, then type and id.
+    """
+    n = offset + limit + 1
+    hits = None
+    if _probe_text():
+        try:
+            hits = text_search(q, entities, n)
+        except OperationFailure:  # text index not built (yet)
+            if SEARCH_BACKEND == "text":
+                raise
+    if hits is None:
+        hits = index.search(q, entities, n)
+    hits.sort(key=lambda hit: (-hit["score"], hit["type"], hit["id"]))
+    return hits[offset:n]
@@ -0,0 +1,23 @@
+from flask.views import MethodView
+from flask_smorest import Blueprint
+from resources.pagination import offset_from_cursor, offset_page
+from resources.search import SEARCH_MAX_OFFSET, search
+from schemas.search_schema import SearchArgsSchema, SearchHitSchema
+
+blp = Blueprint(
+    "Search",
+    "search",
+    url_prefix="/api/v1/search",
+    description="Ranked full-text search over artifacts, artists and tribes",
+)
+
+
+@blp.route("")
+class Search(MethodView):
+    @blp.arguments(SearchArgsSchema, location="query")
+    @blp.response(200, SearchHitSchema(many=True))
+    def get(self, args):
+        """Hits ranked by relevance; page through them with the `next` Link."""
+        offset = offset_from_cursor(args.get("cursor"), SEARCH_MAX_OFFSET)
+        hits = search(args["q"], set(args["types"]), args["limit"], offset)
+        return offset_page(hits, args["limit"], offset, SEARCH_MAX_OFFSET)
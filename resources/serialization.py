@@ -0,0 +1,147 @@
+import os
+from functools import lru_cache
+from flask import current_app, request
+from resources.metrics import serializing
+from schemas.fast import get_dumper
+
+try:  # optional fast JSON backend
+    import orjson
+except ImportError:
+    orjson = None
+try:  # optional MessagePack representation
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Dump Out schemas with the precompiled functions from schemas/fast.py instead
+# of marshmallow. Output is identical either way; the schemas still drive docs.
+FAST_SERIALIZATION = os.getenv("FAST_SERIALIZATION", "false").lower() == "true"
+
+# ─── Representations, negotiated from Accept by render()
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+# {"data": ..., "artists": {id: artist}, "tribes": {id: tribe}}: every nested
+# artist_info/tribe_info is replaced by its id and listed once by id.
+NORMALIZED_JSON = "application/vnd.gallery.normalized+json"
+NORMALIZED_MSGPACK = "application/vnd.gallery.normalized+msgpack"
+REPRESENTATIONS = [JSON, NORMALIZED_JSON]
+if msgpack is not None:
+    REPRESENTATIONS += [MSGPACK, NORMALIZED_MSGPACK]
+SIDE_TABLES = {"artist_info": "artists", "tribe_info": "tribes"}
+
+
+@lru_cache(maxsize=None)
+def _schema(schema_cls, many, only):
+    return schema_cls(many=many, only=only)
+
+
+def dump(schema_cls, data, many=False, only=None):
+    """``schema_cls(many=many, only=only).dump(data)``, compiled in fast mode."""
+    with serializing():
+        if not FAST_SERIALIZATION:
+            return _schema(schema_cls, many, only).dump(data)
+        dump_one = get_dumper(schema_cls, only)
+        return [dump_one(obj) for obj in data] if many else dump_one(data)
+
+
+def _orjson_compatible():
+    # orjson matches Flask's compact, key-sorted, ASCII-escaped output as long
+    # as the encoded text is pure ASCII; callers check that on the result.
+    if orjson is None:
+        return False
+    provider = current_app.json
+    compact = provider.compact
+    if compact is None:
+        compact = not current_app.debug
+    return compact and provider.sort_keys and provider.ensure_ascii
+
+
+def dumps(payload):
+    """Encode ``payload`` exactly like Flask's compact ``jsonify`` body."""
+    with serializing():
+        return _dumps(payload)
+
+
+def _dumps(payload):
+    if FAST_SERIALIZATION and _orjson_compatible():
+        raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        if raw.isascii():
+            return raw.decode()
+    return current_app.json.dumps(payload, separators=(",", ":"))
+
+
+def json_response(payload, status=200):
+    with serializing():
+        return _json_response(payload, status)
+
+
+def _json_response(payload, status):
+    if FAST_SERIALIZATION and _orjson_compatible():
+        raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        if raw.isascii():
+            return current_app.response_class(
+                raw + b"\n", status=status, mimetype=current_app.json.mimetype
+            )
+    resp = current_app.json.response(payload)
+    resp.status_code = status
+    return resp
+
+
+def representation():
+    """The media type ``render`` answers this request with (JSON by default)."""
+    if not request.accept_mimetypes:
+        return JSON
+    return request.accept_mimetypes.best_match(REPRESENTATIONS, default=JSON)
+
+
+def _normalized(obj, tables):
+    obj = dict(obj)
+    for field, table in SIDE_TABLES.items():
+        nested = obj.get(field)
+        # A sparse fieldset may leave out the id: keep the object inline then.
+        if isinstance(nested, dict) and "id" in nested:
+            if nested["id"] not in tables[table]:
+                tables[table][nested["id"]] = _normalized(nested, tables)
+            obj[field] = nested["id"]
+    return obj
+
+
+def normalize(payload):
+    """The normalized form of a dumped object or list (see NORMALIZED_JSON)."""
+    tables = {table: {} for table in SIDE_TABLES.values()}
+    if isinstance(payload, list):
+        data = [_normalized(obj, tables) for obj in payload]
+    else:
+        data = _normalized(payload, tables)
+    return {"data": data, **tables}
+
+
+def _encode(payload, mimetype, status):
+    if mimetype in (NORMALIZED_JSON, NORMALIZED_MSGPACK):
+        payload = normalize(payload)
+    if mimetype in (MSGPACK, NORMALIZED_MSGPACK):
+        return current_app.response_class(
+            msgpack.packb(payload), status=status, mimetype=mimetype
+        )
+    resp = _json_response(payload, status)
+    resp.mimetype = mimetype
+    return resp
+
+
+def render(schema_cls, data, many=False, status=200, only=None):
+    """Finished response for a ``@blp.response(status, schema_cls)`` view.
+
+    Dumped here rather than by flask-smorest, with the compiled dumper in fast
+    mode and marshmallow otherwise: a sparse fieldset (``only``) needs a
+    narrowed schema, and serialization time is measured in one place. The
+    body is encoded in the representation negotiated from ``Accept``.
+    """
+    payload = dump(schema_cls, data, many=many, only=only)
+    mimetype = representation()
+    if mimetype == JSON:
+        resp = json_response(payload, status)
+    else:
+        with serializing():
+            resp = _encode(payload, mimetype, status)
+    resp.vary.add("Accept")
+    return resp
@@ -0,0 +1,181 @@
+"""Dashboard statistics computed by Mongo aggregation pipelines.
+
+Each statistic is one pipeline run on the filtered queryset (mongoengine
+prepends the filter as ``$match``) that returns ``{key, label, count}`` rows,
+so a dashboard never downloads the documents it counts. Results are memoized
+per filter under the generation counters of every collection a pipeline
+reads: a write anywhere bumps a counter (resources/conditional.py) and the
+next call recomputes, in every worker.
+"""
+
+import datetime
+import os
+from models.generation import Generation
+from resources.cache import MemoryBackend
+
+STATS_CACHE_ENTRIES = int(os.getenv("STATS_CACHE_ENTRIES", "1024"))
+
+memo = MemoryBackend(STATS_CACHE_ENTRIES)
+
+_COUNT = {"count": {"$sum": 1}}
+
+
+def _lookup(collection, local, to):
+    return [
+        {
+            "$lookup": {
+                "from": collection,
+                "localField": local,
+                "foreignField": "_id",
+                "as": to,
+            }
+        },
+        {"$unwind": f"${to}"},
+    ]
+
+
+# ─── Pipelines
+# Artifacts are grouped by artist before any $lookup, so each join runs once
+# per distinct artist/tribe rather than once per artifact.
+_ARTIFACTS_BY_TRIBE = [
+    {"$group": {"_id": "$artist", **_COUNT}},
+    *_lookup("artists", "_id", "artist"),
+    {"$group": {"_id": "$artist.tribe", "count": {"$sum": "$count"}}},
+]
+_ARTISTS_BY_TRIBE = [{"$group": {"_id": "$tribe", **_COUNT}}]
+
+
+def _with_tribe_names(by_tribe):
+    return [
+        *by_tribe,
+        *_lookup("tribes", "_id", "tribe"),
+        {"$project": {"label": "$tribe.name", "count": 1}},
+    ]
+
+
+def _by_region(by_tribe):
+    return [
+        *by_tribe,
+        *_lookup("tribes", "_id", "tribe"),
+        {"$group": {"_id": "$tribe.region", "count": {"$sum": "$count"}}},
+    ]
+
+
+def _year(value):
+    return value.year if isinstance(value, datetime.datetime) else value
+
+
+def _decades(lo, hi):
+    first, last = lo - lo % 10, hi - hi % 10 + 10
+    return list(range(first, last + 1, 10))
+
+
+def _bucket_by_decade(queryset, value, to_boundary):
+    """``$bucket`` of ``value`` on the decades spanned by the matched documents.
+
+    A first ``$group`` finds the range; documents without a value fall into
+    the ``None`` bucket.
+    """
+    bounds = list(
+        queryset.aggregate(
+            [{"$group": {"_id": None, "lo": {"$min": value}, "hi": {"$max": value}}}]
+        )
+    )
+    if not bounds or bounds[0]["lo"] is None:
+        return [{"$group": {"_id": None, **_COUNT}}]
+    lo, hi = (_year(bounds[0][end]) for end in ("lo", "hi"))
+    return [
+        {
+            "$bucket": {
+                "groupBy": value,
+                "boundaries": [to_boundary(year) for year in _decades(lo, hi)],
+                "default": None,
+                "output": _COUNT,
+            }
+        }
+    ]
+
+
+def _artifact_decades(queryset):
+    return _bucket_by_decade(
+        queryset, "$created_date", lambda year: datetime.datetime(year, 1, 1)
+    )
+
+
+def _artist_decades(queryset):
+    # Bucketed by the first year of `active_years` ([start, end]).
+    return _bucket_by_decade(
+        queryset, {"$arrayElemAt": ["$active_years", 0]}, lambda year: year
+    )
+
+
+# entity -> dimension -> pipeline builder taking the filtered queryset
+PIPELINES = {
+    "artifacts": {
+        "tribe": lambda qs: _with_tribe_names(_ARTIFACTS_BY_TRIBE),
+        "region": lambda qs: _by_region(_ARTIFACTS_BY_TRIBE),
+        "era": lambda qs: [{"$group": {"_id": "$era", **_COUNT}}],
+        "decade": _artifact_decades,
+    },
+    "artists": {
+        "tribe": lambda qs: _with_tribe_names(_ARTISTS_BY_TRIBE),
+        "region": lambda qs: _by_region(_ARTISTS_BY_TRIBE),
+        "decade": _artist_decades,
+    },
+    "tribes": {
+        "region": lambda qs: [{"$group": {"_id": "$region", **_COUNT}}],
+    },
+}
+
+# Collections a statistic of the entity reads (their counters key the memo).
+DEPENDENCIES = {
+    "artifacts": ("artifacts", "artists", "tribes"),
+    "artists": ("artists", "tribes"),
+    "tribes": ("tribes",),
+}
+
+
+def _row(row):
+    key = _year(row["_id"])
+    out = {"key": None if key in (None, "") else str(key), "count": row["count"]}
+    if "label" in row:
+        out["label"] = row["label"]
+    return out
+
+
+def _generations(entities):
+    rows = Generation.objects(id__in=entities).as_pymongo()
+    values = {row["_id"]: row["value"] for row in rows}
+    return tuple(values.get(entity, 0) for entity in entities)
+
+
+def aggregate(entity, dimension, filter_queryset, args):
+    """Rows of one statistic, largest count first (decades in order).
+
+    ``args`` are the filter arguments; they key the memo together with the
+    generation counters. ``filter_queryset(args)`` builds the query, which
+    may cost queries of its own (a tribe filter resolves its artists), so it
+    only runs on a memo miss.
+    """
+    key = (
+        entity,
+        dimension,
+        repr(sorted(args.items())),
+        _generations(DEPENDENCIES[entity]),
+    )
+    rows = memo.get(key)
+    if rows is None:
+        queryset = filter_queryset(args)
+        pipeline = PIPELINES[entity][dimension](queryset)
+        rows = list(queryset.aggregate(pipeline))
+        if dimension == "decade":
+            rows.sort(key=lambda row: (row["_id"] is None, _year(row["_id"]) or 0))
+        else:
+            rows.sort(key=lambda row: (-row["count"], str(row["_id"] or "")))
+        rows = [_row(row) for row in rows]
+        memo.set(key, rows)
+    return rows
+
+
+def clear():
+    memo.clear()
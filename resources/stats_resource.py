@@ -0,0 +1,50 @@
+from flask.views import MethodView
+from flask_smorest import Blueprint, abort
+from resources.artifact_resource import filter_artifacts
+from resources.artist_resource import filter_artists
+from resources.tribe_resource import filter_tribes
+from resources.stats import PIPELINES, aggregate
+from schemas.artifact_schema import ArtifactFilterArgsSchema
+from schemas.artist_schema import ArtistFilterArgsSchema
+from schemas.tribe_schema import TribeFilterArgsSchema
+from schemas.stats_schema import StatsRowSchema
+
+blp = Blueprint(
+    "Stats",
+    "stats",
+    url_prefix="/api/v1/stats",
+    description="Dashboard counts aggregated by the database",
+)
+
+
+def statistic(entity, dimension, filter_queryset, args):
+    if dimension not in PIPELINES[entity]:
+        abort(404, message="Statistic not found.")
+    return aggregate(entity, dimension, filter_queryset, args)
+
+
+@blp.route("/artifacts/by-<string:dimension>")
+class ArtifactStats(MethodView):
+    @blp.arguments(ArtifactFilterArgsSchema, location="query")
+    @blp.response(200, StatsRowSchema(many=True))
+    def get(self, args, dimension):
+        """Artifact counts by `tribe`, `region`, `era` or `decade` (created)."""
+        return statistic("artifacts", dimension, filter_artifacts, args)
+
+
+@blp.route("/artists/by-<string:dimension>")
+class ArtistStats(MethodView):
+    @blp.arguments(ArtistFilterArgsSchema, location="query")
+    @blp.response(200, StatsRowSchema(many=True))
+    def get(self, args, dimension):
+        """Artist counts by `tribe`, `region` or `decade` (first active year)."""
+        return statistic("artists", dimension, filter_artists, args)
+
+
+@blp.route("/tribes/by-<string:dimension>")
+class TribeStats(MethodView):
+    @blp.arguments(TribeFilterArgsSchema, location="query")
+    @blp.response(200, StatsRowSchema(many=True))
+    def get(self, args, dimension):
+        """Tribe counts by `region`."""
+        return statistic("tribes", dimension, filter_tribes, args)
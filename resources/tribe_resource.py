@@ -1,8 +1,32 @@
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
 from resources.auth_utils import admin_required
+from resources.pagination import paginate
+from resources.cache import cached
+from resources.conditional import conditional
+from resources.export import stream_export
+from resources.serialization import render
+from resources.fieldsets import project, sparse_fieldset
+from resources.bulk import (
+    check_batch_size,
+    delete_documents,
+    insert_documents,
+    succeeded_ids,
+    summarize,
+    update_documents,
+)
+from resources.events import notify_changed
 from models.tribe import Tribe
-from schemas.tribe_schema import TribeInSchema, TribePatchSchema, TribeOutSchema
+from schemas.tribe_schema import (
+    TribeInSchema,
+    TribePatchSchema,
+    TribeBulkPatchSchema,
+    TribeOutSchema,
+    TribeFieldsArgsSchema,
+    TribeQueryArgsSchema,
+    TribeExportArgsSchema,
+)
+from schemas.bulk_schema import BulkDeleteSchema, BulkResultSchema
 from mongoengine.errors import ValidationError
 from bson.errors import InvalidId
 
@@ -14,45 +38,130 @@ blp = Blueprint(
 )
 
 
+def filter_tribes(args):
+    """Compile list query arguments into a single tribes query."""
+    queryset = Tribe.objects
+    if "region" in args:
+        queryset = queryset.filter(region=args["region"])
+    return queryset
+
+
+def tribe_fieldset(args):
+    return sparse_fieldset(TribeOutSchema, {"": args.get("fieldset")})
+
+
 @blp.route("/")
 class TribesList(MethodView):
+    @cached("tribes")
+    @conditional("tribes")
+    @blp.arguments(TribeQueryArgsSchema, location="query")
     @blp.response(200, TribeOutSchema(many=True))
-    def get(self):
-        return list(Tribe.objects.all())
+    def get(self, args):
+        fieldset = tribe_fieldset(args)
+        items, headers = paginate(
+            project(filter_tribes(args), fieldset.projection),
+            args["limit"],
+            args.get("cursor"),
+        )
+        return render(TribeOutSchema, items, many=True, only=fieldset.only), headers
 
     @admin_required
     @blp.arguments(TribeInSchema)
     @blp.response(201, TribeOutSchema)
     def post(self, new_data):
-        return Tribe(**new_data).save()
+        tribe = Tribe(**new_data).save()
+        notify_changed("tribes", tribe.id)
+        return tribe
+
+
+@blp.route("/bulk")
+class TribesBulk(MethodView):
+    @admin_required
+    @blp.arguments(TribeInSchema(many=True))
+    @blp.response(200, BulkResultSchema)
+    def post(self, items):
+        check_batch_size(items)
+        docs = [(index, Tribe(**item)) for index, item in enumerate(items)]
+        results = insert_documents(Tribe, docs)
+        notify_changed("tribes", *succeeded_ids(results))
+        return summarize(results)
+
+    @admin_required
+    @blp.arguments(TribeBulkPatchSchema(many=True))
+    @blp.response(200, BulkResultSchema)
+    def put(self, items):
+        check_batch_size(items)
+        updates = []
+        for index, item in enumerate(items):
+            fields = dict(item)
+            updates.append((index, fields.pop("id"), fields))
+        results = update_documents(Tribe, updates)
+        notify_changed("tribes", *succeeded_ids(results))
+        return summarize(results)
+
+    @admin_required
+    @blp.arguments(BulkDeleteSchema)
+    @blp.response(200, BulkResultSchema)
+    def delete(self, data):
+        check_batch_size(data["ids"])
+        results = delete_documents(Tribe, data["ids"])
+        notify_changed("tribes", *succeeded_ids(results))
+        return summarize(results)
+
+
+@blp.route("/export")
+class TribesExport(MethodView):
+    @conditional("tribes")
+    @blp.arguments(TribeExportArgsSchema, location="query")
+    @blp.response(
+        200,
+        TribeOutSchema(many=True),
+        description="NDJSON stream (default) or a JSON array, see `format`",
+    )
+    def get(self, args):
+        return stream_export(filter_tribes(args), TribeOutSchema, args["format"])
 
 
 @blp.route("/<string:tribe_id>")
 class TribeDetail(MethodView):
+    @cached("tribes")
+    @conditional("tribes")
+    @blp.arguments(TribeFieldsArgsSchema, location="query")
     @blp.response(200, TribeOutSchema)
-    def get(self, tribe_id):
+    def get(self, args, tribe_id):
+        fieldset = tribe_fieldset(args)
         try:
-            return Tribe.objects.get(id=tribe_id)
+            tribe = project(Tribe.objects, fieldset.projection).get(id=tribe_id)
         except (Tribe.DoesNotExist, ValidationError, InvalidId):
             abort(404, message="Tribe not found.")
+        return render(TribeOutSchema, tribe, only=fieldset.only)
 
     @admin_required
     @blp.arguments(TribePatchSchema)
     @blp.response(200, TribeOutSchema)
     def put(self, update_data, tribe_id):
+        # One findAndModify round trip that returns the updated document.
         try:
-            tribe_obj = Tribe.objects.get(id=tribe_id)
-        except (Tribe.DoesNotExist, ValidationError, InvalidId):
+            tribes = Tribe.objects(id=tribe_id)
+            if update_data:
+                tribe_obj = tribes.modify(new=True, **update_data)
+            else:
+                tribe_obj = tribes.first()
+        except (ValidationError, InvalidId):
+            tribe_obj = None
+        if tribe_obj is None:
             abort(404, message="Tribe not found.")
-        tribe_obj.update(**update_data)
-        return Tribe.objects.get(id=tribe_id)
+        notify_changed("tribes", tribe_id)
+        return tribe_obj
 
     @admin_required
     @blp.response(204)
     def delete(self, tribe_id):
         try:
-            tribe_obj = Tribe.objects.get(id=tribe_id)
-        except (Tribe.DoesNotExist, ValidationError, InvalidId):
+            deleted = Tribe.objects(id=tribe_id).delete()
+        except (ValidationError, InvalidId):
+            deleted = 0
+        if not deleted:
             abort(404, message="Tribe not found.")
-        tribe_obj.delete()
+        notify_changed("tribes", tribe_id)
         return "", 204
@@ -1,5 +1,10 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 from schemas.artist_schema import ArtistOutSchema
+from schemas.tribe_schema import TribeOutSchema
+from schemas.fieldset_schema import sparse_fields
+from schemas.pagination_schema import ExportArgsSchema, PageArgsSchema, object_id
+
+ARTIFACT_SORTS = ("id", "-id", "created_date", "-created_date", "title", "-title")
 
 
 class ArtifactInSchema(Schema):
@@ -26,6 +31,13 @@ class ArtifactPatchSchema(Schema):
     created_date = fields.DateTime()
 
 
+class ArtifactBulkPatchSchema(ArtifactPatchSchema):
+    class Meta:
+        name = "ArtifactBulkPatch"
+
+    id = fields.String(required=True, validate=object_id)
+
+
 class ArtifactOutSchema(Schema):
     class Meta:
         name = "Artifact"
@@ -37,3 +49,52 @@ class ArtifactOutSchema(Schema):
     era = fields.String()
     created_date = fields.DateTime()
     artist_info = fields.Nested(ArtistOutSchema, dump_only=True, attribute="artist")
+
+
+class ArtifactFilterArgsSchema(Schema):
+    class Meta:
+        name = "ArtifactFilterArgs"
+
+    artist = fields.String(validate=object_id, metadata={"description": "Artist ID"})
+    tribe = fields.String(validate=object_id, metadata={"description": "Tribe ID"})
+    era = fields.String()
+    created_from = fields.DateTime(metadata={"description": "created_date >= value"})
+    created_to = fields.DateTime(metadata={"description": "created_date <= value"})
+
+
+class ArtifactFieldsArgsSchema(Schema):
+    class Meta:
+        name = "ArtifactFieldsArgs"
+
+    fieldset = sparse_fields(ArtifactOutSchema, "fields")
+    artist_fieldset = sparse_fields(ArtistOutSchema, "artist_info.fields")
+    tribe_fieldset = sparse_fields(TribeOutSchema, "artist_info.tribe_info.fields")
+
+
+class ArtifactQueryArgsSchema(
+    ArtifactFilterArgsSchema, ArtifactFieldsArgsSchema, PageArgsSchema
+):
+    class Meta:
+        name = "ArtifactQueryArgs"
+
+    sort = fields.String(
+        load_default="id",
+        validate=validate.OneOf(ARTIFACT_SORTS),
+        metadata={"description": "Sort key, prefix with `-` for descending"},
+    )
+
+
+class ArtifactExportArgsSchema(ArtifactFilterArgsSchema, ExportArgsSchema):
+    class Meta:
+        name = "ArtifactExportArgs"
+
+
+class ArtifactRelatedArgsSchema(ArtifactFieldsArgsSchema):
+    class Meta:
+        name = "ArtifactRelatedArgs"
+
+    k = fields.Integer(
+        load_default=10,
+        validate=validate.Range(min=1, max=50),
+        metadata={"description": "Number of related artifacts"},
+    )
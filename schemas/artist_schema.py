@@ -1,5 +1,7 @@
 from marshmallow import Schema, fields
 from schemas.tribe_schema import TribeOutSchema
+from schemas.fieldset_schema import sparse_fields
+from schemas.pagination_schema import ExportArgsSchema, PageArgsSchema, object_id
 
 
 class ArtistInSchema(Schema):
@@ -22,6 +24,13 @@ class ArtistPatchSchema(Schema):
     active_years = fields.List(fields.Integer())
 
 
+class ArtistBulkPatchSchema(ArtistPatchSchema):
+    class Meta:
+        name = "ArtistBulkPatch"
+
+    id = fields.String(required=True, validate=object_id)
+
+
 class ArtistOutSchema(Schema):
     class Meta:
         name = "Artist"
@@ -31,3 +40,36 @@ class ArtistOutSchema(Schema):
     bio = fields.String()
     active_years = fields.List(fields.Integer())
     tribe_info = fields.Nested(TribeOutSchema, dump_only=True, attribute="tribe")
+
+
+class ArtistFilterArgsSchema(Schema):
+    class Meta:
+        name = "ArtistFilterArgs"
+
+    tribe = fields.String(validate=object_id, metadata={"description": "Tribe ID"})
+    active_from = fields.Integer(
+        metadata={"description": "Artists active in or after this year"}
+    )
+    active_to = fields.Integer(
+        metadata={"description": "Artists active in or before this year"}
+    )
+
+
+class ArtistFieldsArgsSchema(Schema):
+    class Meta:
+        name = "ArtistFieldsArgs"
+
+    fieldset = sparse_fields(ArtistOutSchema, "fields")
+    tribe_fieldset = sparse_fields(TribeOutSchema, "tribe_info.fields")
+
+
+class ArtistQueryArgsSchema(
+    ArtistFilterArgsSchema, ArtistFieldsArgsSchema, PageArgsSchema
+):
+    class Meta:
+        name = "ArtistQueryArgs"
+
+
+class ArtistExportArgsSchema(ArtistFilterArgsSchema, ExportArgsSchema):
+    class Meta:
+        name = "ArtistExportArgs"
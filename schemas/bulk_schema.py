@@ -0,0 +1,28 @@
+from marshmallow import Schema, fields
+from schemas.pagination_schema import object_id
+
+
+class BulkDeleteSchema(Schema):
+    class Meta:
+        name = "BulkDelete"
+
+    ids = fields.List(fields.String(validate=object_id), required=True)
+
+
+class BulkItemResultSchema(Schema):
+    class Meta:
+        name = "BulkItemResult"
+
+    index = fields.Integer(metadata={"description": "Position in the request array"})
+    status = fields.Integer(metadata={"description": "HTTP-style status of the item"})
+    id = fields.String()
+    message = fields.String()
+
+
+class BulkResultSchema(Schema):
+    class Meta:
+        name = "BulkResult"
+
+    succeeded = fields.Integer()
+    failed = fields.Integer()
+    items = fields.List(fields.Nested(BulkItemResultSchema))
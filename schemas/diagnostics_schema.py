@@ -0,0 +1,14 @@
+from marshmallow import Schema, fields
+
+
+class QueryPlanSchema(Schema):
+    class Meta:
+        name = "QueryPlan"
+
+    route = fields.String()
+    collection = fields.String()
+    filter = fields.Dict()
+    stages = fields.List(fields.String())
+    indexes = fields.List(fields.String())
+    collscan = fields.Boolean()
+    error = fields.String()
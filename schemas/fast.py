@@ -0,0 +1,102 @@
+"""Precompiled dump functions generated from the marshmallow Out schemas.
+
+The schemas stay the single source of truth (and of the OpenAPI docs); this
+module only turns a schema's field list into one flat Python function, so the
+hot read path avoids marshmallow's per-field dispatch. Anything the compiler
+does not specialise falls back to the marshmallow field itself, keeping the
+output identical to ``Schema.dump``.
+"""
+
+import datetime as dt
+from functools import lru_cache
+from marshmallow import fields, missing
+
+# Field types with a specialised expression; `{v}` is a non-None value.
+_EXPRESSIONS = {
+    fields.String: "({v} if type({v}) is str else _text({v}))",
+    fields.Integer: "int({v})",
+    fields.DateTime: "_isoformat({v})",
+}
+
+
+def _text(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+class _Compiler:
+    def __init__(self):
+        self.namespace = {
+            "_MISSING": missing,
+            "_text": _text,
+            "_isoformat": dt.datetime.isoformat,
+        }
+        self.counter = 0
+
+    def bind(self, prefix, value):
+        self.counter += 1
+        name = f"_{prefix}{self.counter}"
+        self.namespace[name] = value
+        return name
+
+    def expression(self, field, var):
+        """Source for serializing ``var`` (known not to be None), or None."""
+        kind = type(field)
+        if kind is fields.DateTime and field.format not in (None, "iso"):
+            return None
+        if kind is fields.Integer and field.as_string:
+            return None
+        if kind in _EXPRESSIONS:
+            return _EXPRESSIONS[kind].format(v=var)
+        if kind is fields.List:
+            item = self.expression(field.inner, "_e")
+            if item is None:
+                return None
+            return f"[None if _e is None else {item} for _e in {var}]"
+        if kind is fields.Nested:
+            nested = self.bind("nested", compile_schema(field.schema))
+            if field.many or field.schema.many:
+                return f"[{nested}(_o) for _o in {var}]"
+            return f"{nested}({var})"
+        return None
+
+    def compile(self, schema):
+        lines = ["def dump(obj):", "    out = {}"]
+        for name, field in schema.dump_fields.items():
+            key = field.data_key if field.data_key is not None else name
+            attribute = field.attribute or name
+            expr = self.expression(field, "v")
+            if expr is None or "." in attribute or field.dump_default is not missing:
+                # Unspecialised: let the marshmallow field do the whole job.
+                bound = self.bind("field", field)
+                lines += [
+                    f"    v = {bound}.serialize({name!r}, obj)",
+                    "    if v is not _MISSING:",
+                    f"        out[{key!r}] = v",
+                ]
+                continue
+            lines += [
+                f"    v = getattr(obj, {attribute!r}, _MISSING)",
+                "    if v is not _MISSING:",
+                f"        out[{key!r}] = None if v is None else {expr}",
+            ]
+        lines.append("    return out")
+        exec("\n".join(lines), self.namespace)
+        return self.namespace["dump"]
+
+
+def compile_schema(schema):
+    """Return ``dump(obj) -> dict`` equivalent to ``schema.dump(obj)`` for one object.
+
+    Values are read with ``getattr`` (MongoEngine documents resolve item and
+    attribute access identically). Schemas with pre/post-dump hooks are not
+    compiled; their own ``dump`` is returned instead.
+    """
+    if any(schema._hooks.values()):
+        return lambda obj: schema.dump(obj, many=False)
+    return _Compiler().compile(schema)
+
+
+@lru_cache(maxsize=None)
+def get_dumper(schema_cls, only=None):
+    """Compiled dumper for ``schema_cls(only=only)``, built once per process."""
+    return compile_schema(schema_cls(only=only))
@@ -0,0 +1,13 @@
+from marshmallow import fields, validate
+from webargs.fields import DelimitedList
+
+
+def sparse_fields(schema_cls, data_key):
+    """Comma-separated ``fields=`` style query argument for ``schema_cls``."""
+    names = list(schema_cls().fields)
+    return DelimitedList(
+        fields.String(),
+        data_key=data_key,
+        validate=validate.ContainsOnly(names),
+        metadata={"description": f"Only return these fields: {', '.join(names)}"},
+    )
@@ -0,0 +1,31 @@
+from marshmallow import Schema, fields, validate
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+object_id = validate.Regexp(r"^[0-9a-fA-F]{24}$", error="Not a valid ID.")
+
+
+class PageArgsSchema(Schema):
+    class Meta:
+        name = "PageArgs"
+
+    limit = fields.Integer(
+        load_default=DEFAULT_PAGE_SIZE,
+        validate=validate.Range(min=1, max=MAX_PAGE_SIZE),
+        metadata={"description": f"Page size (max {MAX_PAGE_SIZE})"},
+    )
+    cursor = fields.String(
+        metadata={"description": "Opaque cursor taken from the `next` Link header"}
+    )
+
+
+class ExportArgsSchema(Schema):
+    class Meta:
+        name = "ExportArgs"
+
+    format = fields.String(
+        load_default="ndjson",
+        validate=validate.OneOf(("ndjson", "json")),
+        metadata={"description": "`ndjson` (one row per line) or a `json` array"},
+    )
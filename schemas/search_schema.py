@@ -0,0 +1,33 @@
+from marshmallow import Schema, fields, validate
+from webargs.fields import DelimitedList
+from schemas.pagination_schema import PageArgsSchema
+
+SEARCH_TYPES = ("artifacts", "artists", "tribes")
+
+
+class SearchArgsSchema(PageArgsSchema):
+    class Meta:
+        name = "SearchArgs"
+
+    q = fields.String(
+        required=True,
+        validate=validate.Length(min=1, max=200),
+        metadata={"description": "Search terms"},
+    )
+    types = DelimitedList(
+        fields.String(validate=validate.OneOf(SEARCH_TYPES)),
+        data_key="type",
+        load_default=list(SEARCH_TYPES),
+        metadata={"description": "Restrict to some of: " + ", ".join(SEARCH_TYPES)},
+    )
+
+
+class SearchHitSchema(Schema):
+    class Meta:
+        name = "SearchHit"
+
+    type = fields.String(metadata={"description": "artifacts, artists or tribes"})
+    id = fields.String()
+    score = fields.Float()
+    label = fields.String(metadata={"description": "Artifact title or name"})
+    image_url = fields.String(metadata={"description": "Artifacts only"})
@@ -0,0 +1,13 @@
+from marshmallow import Schema, fields
+
+
+class StatsRowSchema(Schema):
+    class Meta:
+        name = "StatsRow"
+
+    key = fields.String(
+        allow_none=True,
+        metadata={"description": "Tribe ID, region, era or decade (e.g. 1960)"},
+    )
+    label = fields.String(metadata={"description": "Tribe name (tribe statistics)"})
+    count = fields.Integer()
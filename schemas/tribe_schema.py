@@ -1,4 +1,6 @@
 from marshmallow import Schema, fields
+from schemas.fieldset_schema import sparse_fields
+from schemas.pagination_schema import ExportArgsSchema, PageArgsSchema, object_id
 
 
 class TribeInSchema(Schema):
@@ -19,6 +21,13 @@ class TribePatchSchema(Schema):
     description = fields.String()
 
 
+class TribeBulkPatchSchema(TribePatchSchema):
+    class Meta:
+        name = "TribeBulkPatch"
+
+    id = fields.String(required=True, validate=object_id)
+
+
 class TribeOutSchema(Schema):
     class Meta:
         name = "Tribe"
@@ -27,3 +36,29 @@ class TribeOutSchema(Schema):
     name = fields.String()
     region = fields.String()
     description = fields.String()
+
+
+class TribeFilterArgsSchema(Schema):
+    class Meta:
+        name = "TribeFilterArgs"
+
+    region = fields.String()
+
+
+class TribeFieldsArgsSchema(Schema):
+    class Meta:
+        name = "TribeFieldsArgs"
+
+    fieldset = sparse_fields(TribeOutSchema, "fields")
+
+
+class TribeQueryArgsSchema(
+    TribeFilterArgsSchema, TribeFieldsArgsSchema, PageArgsSchema
+):
+    class Meta:
+        name = "TribeQueryArgs"
+
+
+class TribeExportArgsSchema(TribeFilterArgsSchema, ExportArgsSchema):
+    class Meta:
+        name = "TribeExportArgs"
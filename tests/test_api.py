@@ -1,4 +1,5 @@
-import os, sys, datetime, pytest
+import os, sys, datetime, json, pytest
+from types import SimpleNamespace
 from dotenv import load_dotenv
 import pytest
 
@@ -13,6 +14,8 @@ from models.user import User
 from models.tribe import Tribe
 from models.artist import Artist
 from models.artifact import Artifact
+from resources import cache, health, metrics, passwords, query_tracker, ratelimit
+from resources import compression, related, search, stats
 
 # ─── DB setup ───────────────────────────────────────────────
 load_dotenv()
@@ -30,7 +33,7 @@ connect(
     alias="default",
     tls=_mongo_tls_enabled(),
 tlsCAFile=certifi.where() if _mongo_tls_enabled() else None,
-
+    event_listeners=[*metrics.event_listeners(), query_tracker.listener],
 )
 
 
@@ -41,6 +44,12 @@ def _clear_db():
     Tribe.drop_collection()
     Artist.drop_collection()
     Artifact.drop_collection()
+    cache.clear()
+    search.index.clear()
+    related.index.clear()
+    stats.clear()
+    ratelimit.clear()
+    health.clear()
 
 
 # ─── Flask test-client ─────────────────────────────────────
@@ -75,6 +84,46 @@ def test_health(client):
     assert r.get_json()["db_status"] == "OK"
 
 
+def test_health_probes(client, monkeypatch):
+    print("[test_health_probes] live/ready are cached and report the pool")
+    assert client.get("/health/live").get_json()["status"] == "OK"
+    assert "collections" not in client.get("/health/db").get_json()
+
+    pings = []
+    monkeypatch.setattr(health, "ping", lambda: pings.append(1) or {"ok": True})
+    health.clear()
+    for _ in range(3):
+        r = client.get("/health/ready")
+        assert r.status_code == 200 and r.get_json()["db"]["ok"]
+    assert len(pings) == 1  # cached for HEALTH_CHECK_INTERVAL
+
+    monkeypatch.setattr(health, "HEALTH_CHECK_INTERVAL", 0)
+    monkeypatch.setattr(health, "ping", lambda: {"ok": False, "error": "down"})
+    r = client.get("/health/ready")
+    assert r.status_code == 503
+    assert r.get_json()["db_status"] == "ERROR"
+    assert r.get_json()["db"]["error"] == "down"
+
+    # pool counts from pymongo's CMAP events
+    stats = health.PoolStats()
+    address = ("db", 27017)
+    event = SimpleNamespace(address=address, options={"maxPoolSize": 2})
+    stats.pool_created(event)
+    for name in ("connection_created", "connection_check_out_started"):
+        getattr(stats, name)(event)
+        getattr(stats, name)(event)
+    stats.connection_checked_out(event)
+    snapshot = stats.snapshot()
+    assert snapshot["servers"]["db:27017"]["max_pool_size"] == 2
+    assert (snapshot["connections"], snapshot["checked_out"]) == (2, 1)
+    assert snapshot["wait_queue"] == 1
+    stats.connection_check_out_failed(event)
+    stats.connection_checked_in(event)
+    assert (stats.snapshot()["checked_out"], stats.snapshot()["wait_queue"]) == (0, 0)
+    stats.pool_closed(event)
+    assert stats.snapshot()["servers"] == {}
+
+
 # ─── Unauth check (write should 401) -----------------------
 def test_unauthorized_write(client):
     print("[test_unauthorized_write] POST /api/v1/tribes/ without token → 401")
@@ -196,6 +245,1136 @@ def test_artifacts_crud(client, auth_header):
     )
 
 
+# ─── Nested serialization ----------------------------------
+def test_artifact_list_nested_info(client, auth_header):
+    print(
+        "[test_artifact_list_nested_info] artifacts of 2 artists → batched artist/tribe info"
+    )
+    tid = client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Yolngu", "region": "NT"}
+    ).get_json()["id"]
+    artist_ids = [
+        client.post(
+            "/api/v1/artists/",
+            headers=auth_header,
+            json={"name": name, "tribe": tid, "active_years": [1960, 2000]},
+        ).get_json()["id"]
+        for name in ("A1", "A2")
+    ]
+    for i, aid in enumerate(artist_ids * 2):
+        client.post(
+            "/api/v1/artifacts/", headers=auth_header, json={"title": f"Art{i}", "artist": aid}
+        )
+
+    items = client.get("/api/v1/artifacts/").get_json()
+    assert len(items) == 4
+    assert [a["artist_info"]["name"] for a in items] == ["A1", "A2", "A1", "A2"]
+    assert {a["artist_info"]["tribe_info"]["name"] for a in items} == {"Yolngu"}
+
+
+def test_fast_serialization_byte_parity(client, auth_header, monkeypatch):
+    print("[test_fast_serialization_byte_parity] compiled dumpers → identical bytes")
+    from resources import serialization
+
+    tid = client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Yolŋu", "region": "NT"}
+    ).get_json()["id"]
+    aid = client.post(
+        "/api/v1/artists/",
+        headers=auth_header,
+        json={"name": "A1", "tribe": tid, "active_years": [1960, 2000]},
+    ).get_json()["id"]
+    art = client.post(
+        "/api/v1/artifacts/",
+        headers=auth_header,
+        json={"title": "Art", "artist": aid, "created_date": "2001-02-03T04:05:06"},
+    ).get_json()["id"]
+
+    urls = [
+        "/api/v1/tribes/",
+        f"/api/v1/tribes/{tid}",
+        "/api/v1/artists/",
+        f"/api/v1/artists/{aid}",
+        "/api/v1/artifacts/",
+        f"/api/v1/artifacts/{art}",
+    ]
+    bodies = {}
+    for fast in (False, True):
+        monkeypatch.setattr(serialization, "FAST_SERIALIZATION", fast)
+        cache.clear()
+        bodies[fast] = [client.get(url).get_data() for url in urls]
+    assert bodies[True] == bodies[False]
+
+
+# ─── Filtering & sorting -----------------------------------
+def _follow_pages(client, url):
+    items = []
+    while url:
+        r = client.get(url)
+        items += r.get_json()
+        link = r.headers.get("Link")
+        url = link[link.index("<") + 1 : link.index(">")] if link else None
+    return items
+
+
+def test_list_filters(client, auth_header):
+    print("[test_list_filters] tribe/era/date/active-years/region filters → matching rows")
+    t1 = client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Kaurna", "region": "SA"}
+    ).get_json()["id"]
+    t2 = client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Eora", "region": "NSW"}
+    ).get_json()["id"]
+    a1 = client.post(
+        "/api/v1/artists/",
+        headers=auth_header,
+        json={"name": "Old", "tribe": t1, "active_years": [1930, 1960]},
+    ).get_json()["id"]
+    a2 = client.post(
+        "/api/v1/artists/",
+        headers=auth_header,
+        json={"name": "New", "tribe": t2, "active_years": [1990, 2020]},
+    ).get_json()["id"]
+    for title, aid, era, date in [
+        ("Shield", a1, "Traditional", "1950-01-01T00:00:00"),
+        ("Canvas", a2, "Contemporary", "2005-01-01T00:00:00"),
+        ("Print", a2, "Contemporary", "2015-01-01T00:00:00"),
+    ]:
+        client.post(
+            "/api/v1/artifacts/",
+            headers=auth_header,
+            json={"title": title, "artist": aid, "era": era, "created_date": date},
+        )
+
+    def titles(query):
+        return [a["title"] for a in client.get(f"/api/v1/artifacts/?{query}").get_json()]
+
+    assert titles(f"tribe={t2}") == ["Canvas", "Print"]
+    assert titles(f"artist={a1}") == ["Shield"]
+    assert titles("era=Contemporary&created_from=2010-01-01T00:00:00") == ["Print"]
+    assert titles("created_to=2010-01-01T00:00:00&sort=-created_date") == [
+        "Canvas",
+        "Shield",
+    ]
+    assert client.get("/api/v1/artifacts/?artist=nope").status_code == 422
+    assert client.get("/api/v1/artifacts/?sort=bio").status_code == 422
+
+    artists = client.get("/api/v1/artists/?active_from=1955&active_to=1995").get_json()
+    assert {a["name"] for a in artists} == {"Old", "New"}
+    artists = client.get("/api/v1/artists/?active_from=1961&active_to=1989").get_json()
+    assert artists == []
+    assert [a["name"] for a in client.get(f"/api/v1/artists/?tribe={t1}").get_json()] == [
+        "Old"
+    ]
+    assert [t["name"] for t in client.get("/api/v1/tribes/?region=NSW").get_json()] == [
+        "Eora"
+    ]
+
+
+def test_sorted_keyset_pagination(client, auth_header):
+    print("[test_sorted_keyset_pagination] sort=-created_date, limit=1 → every row once, in order")
+    tid = client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Tiwi", "region": "NT"}
+    ).get_json()["id"]
+    aid = client.post(
+        "/api/v1/artists/",
+        headers=auth_header,
+        json={"name": "A", "tribe": tid, "active_years": [1900, 2000]},
+    ).get_json()["id"]
+    for title, date in [
+        ("a", "2001-01-01T00:00:00"),
+        ("b", "2003-01-01T00:00:00"),
+        ("c", None),
+        ("d", "2003-01-01T00:00:00"),
+        ("e", "2002-01-01T00:00:00"),
+    ]:
+        payload = {"title": title, "artist": aid}
+        if date:
+            payload["created_date"] = date
+        client.post("/api/v1/artifacts/", headers=auth_header, json=payload)
+
+    desc = _follow_pages(client, "/api/v1/artifacts/?sort=-created_date&limit=1")
+    assert [a["title"] for a in desc] == ["d", "b", "e", "a", "c"]
+    asc = _follow_pages(client, "/api/v1/artifacts/?sort=created_date&limit=2")
+    assert [a["title"] for a in asc] == ["c", "a", "e", "b", "d"]
+
+
+# ─── Sparse fieldsets --------------------------------------
+def test_sparse_fieldsets(client, auth_header, monkeypatch):
+    print("[test_sparse_fieldsets] fields= trims output and skips unselected refs")
+    from resources import dereference
+
+    resolved = []
+    resolve = dereference.resolve_references
+
+    def spy(docs, field, document_cls, only=None):
+        refs = resolve(docs, field, document_cls, only)
+        resolved.append((field, only, len(refs)))
+        return refs
+
+    monkeypatch.setattr(dereference, "resolve_references", spy)
+
+    tid = client.post(
+        "/api/v1/tribes/",
+        headers=auth_header,
+        json={"name": "Yolngu", "region": "NT", "description": "long text"},
+    ).get_json()["id"]
+    aid = client.post(
+        "/api/v1/artists/",
+        headers=auth_header,
+        json={"name": "A1", "bio": "long bio", "tribe": tid, "active_years": [1960]},
+    ).get_json()["id"]
+    for i in range(3):
+        client.post(
+            "/api/v1/artifacts/",
+            headers=auth_header,
+            json={"title": f"Art{i}", "artist": aid, "image_url": f"u{i}"},
+        )
+
+    resolved.clear()
+    r = client.get("/api/v1/artifacts/?fields=id,title,image_url&limit=2")
+    assert r.status_code == 200
+    assert [sorted(a) for a in r.get_json()] == [["id", "image_url", "title"]] * 2
+    assert "next" in r.headers["Link"]
+    assert all(count == 0 for _, _, count in resolved)
+
+    resolved.clear()
+    items = client.get(
+        "/api/v1/artifacts/?fields=title,artist_info&artist_info.fields=name"
+    ).get_json()
+    assert items[0] == {"title": "Art0", "artist_info": {"name": "A1"}}
+    assert [(f, count) for f, _, count in resolved] == [("artist", 1), ("tribe", 0)]
+    assert list(resolved[0][1]) == ["name"]
+
+    item = client.get(
+        "/api/v1/artifacts/?artist_info.tribe_info.fields=name"
+    ).get_json()[0]
+    assert item["description"] == "" and item["artist_info"]["bio"] == "long bio"
+    assert item["artist_info"]["tribe_info"] == {"name": "Yolngu"}
+
+    r = client.get(
+        f"/api/v1/artists/{aid}?fields=name,tribe_info&tribe_info.fields=region"
+    )
+    assert r.get_json() == {"name": "A1", "tribe_info": {"region": "NT"}}
+    assert client.get(f"/api/v1/tribes/{tid}?fields=name").get_json() == {
+        "name": "Yolngu"
+    }
+    assert client.get("/api/v1/tribes/?fields=id").get_json() == [{"id": tid}]
+
+    assert client.get("/api/v1/artifacts/?fields=bio").status_code == 422
+    assert client.get("/api/v1/artists/?tribe_info.fields=bio").status_code == 422
+
+
+# ─── Bulk endpoints ----------------------------------------
+def test_bulk_create_update_delete(client, auth_header):
+    print("[test_bulk_create_update_delete] bulk tribes/artists/artifacts → per-item results")
+    r = client.post(
+        "/api/v1/tribes/bulk",
+        headers=auth_header,
+        json=[{"name": "Wurundjeri", "region": "VIC"}, {"name": "Bunurong", "region": "VIC"}],
+    )
+    assert r.status_code == 200
+    tribes = r.get_json()
+    assert tribes["succeeded"] == 2 and tribes["failed"] == 0
+    tid = tribes["items"][0]["id"]
+
+    artists = client.post(
+        "/api/v1/artists/bulk",
+        headers=auth_header,
+        json=[
+            {"name": "A1", "tribe": tid, "active_years": [1980, 2000]},
+            {"name": "A2", "tribe": "000000000000000000000000", "active_years": [1, 2]},
+        ],
+    ).get_json()
+    assert [i["status"] for i in artists["items"]] == [201, 404]
+    aid = artists["items"][0]["id"]
+
+    created = client.post(
+        "/api/v1/artifacts/bulk",
+        headers=auth_header,
+        json=[{"title": f"Art{i}", "artist": aid} for i in range(3)],
+    ).get_json()
+    assert created["succeeded"] == 3
+    art_ids = [i["id"] for i in created["items"]]
+    assert len(client.get(f"/api/v1/artifacts/?artist={aid}").get_json()) == 3
+
+    updated = client.put(
+        "/api/v1/artifacts/bulk",
+        headers=auth_header,
+        json=[
+            {"id": art_ids[0], "era": "Contemporary"},
+            {"id": "000000000000000000000000", "era": "X"},
+            {"id": art_ids[1], "artist": "000000000000000000000000"},
+        ],
+    ).get_json()
+    assert [i["status"] for i in updated["items"]] == [200, 404, 404]
+    assert client.get(f"/api/v1/artifacts/{art_ids[0]}").get_json()["era"] == "Contemporary"
+
+    deleted = client.delete(
+        "/api/v1/artifacts/bulk",
+        headers=auth_header,
+        json={"ids": [art_ids[2], "000000000000000000000000"]},
+    ).get_json()
+    assert [i["status"] for i in deleted["items"]] == [204, 404]
+    assert len(client.get("/api/v1/artifacts/").get_json()) == 2
+
+
+def test_bulk_validation_and_auth(client, auth_header):
+    print("[test_bulk_validation_and_auth] bulk without token → 401, invalid item → 422")
+    assert client.post("/api/v1/tribes/bulk", json=[]).status_code == 401
+    r = client.post(
+        "/api/v1/tribes/bulk", headers=auth_header, json=[{"name": "X", "region": "Y"}, {}]
+    )
+    assert r.status_code == 422
+
+
+# ─── Streaming export --------------------------------------
+def test_streaming_export(client, auth_header, monkeypatch):
+    print("[test_streaming_export] 5 artifacts, batch size 2 → NDJSON and JSON array")
+    from resources import export
+
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+    tid = client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Gunditjmara", "region": "VIC"}
+    ).get_json()["id"]
+    aid = client.post(
+        "/api/v1/artists/",
+        headers=auth_header,
+        json={"name": "A", "tribe": tid, "active_years": [1970, 1990]},
+    ).get_json()["id"]
+    for i in range(5):
+        client.post(
+            "/api/v1/artifacts/", headers=auth_header, json={"title": f"Art{i}", "artist": aid}
+        )
+
+    r = client.get("/api/v1/artifacts/export")
+    assert r.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in r.get_data(as_text=True).splitlines()]
+    assert [row["title"] for row in rows] == [f"Art{i}" for i in range(5)]
+    assert rows == client.get("/api/v1/artifacts/").get_json()
+
+    r = client.get(f"/api/v1/artifacts/export?format=json&artist={aid}")
+    assert r.get_json() == rows
+    assert client.get("/api/v1/tribes/export?format=json").get_json()[0]["id"] == tid
+    assert client.get("/api/v1/artists/export?format=xml").status_code == 422
+
+
+# ─── Search ------------------------------------------------
+def test_search(client, auth_header, monkeypatch):
+    print("[test_search] /api/v1/search → ranked, typed, paginated, kept up to date")
+    tid = client.post(
+        "/api/v1/tribes/",
+        headers=auth_header,
+        json={"name": "Yolngu", "region": "NT", "description": "bark painters"},
+    ).get_json()["id"]
+    aid = client.post(
+        "/api/v1/artists/",
+        headers=auth_header,
+        json={
+            "name": "Emily",
+            "bio": "Paints on bark",
+            "tribe": tid,
+            "active_years": [1960, 2000],
+        },
+    ).get_json()["id"]
+    bark = client.post(
+        "/api/v1/artifacts/",
+        headers=auth_header,
+        json={"title": "Bark Painting", "artist": aid, "image_url": "u1"},
+    ).get_json()["id"]
+    sand = client.post(
+        "/api/v1/artifacts/",
+        headers=auth_header,
+        json={"title": "Sand drawing", "description": "not bark", "artist": aid},
+    ).get_json()["id"]
+
+    hits = client.get("/api/v1/search?q=bark").get_json()
+    assert [(h["type"], h["id"]) for h in hits][0] == ("artifacts", bark)
+    assert {h["type"] for h in hits} == {"artifacts", "artists", "tribes"}
+    assert hits[0]["label"] == "Bark Painting" and hits[0]["image_url"] == "u1"
+    scores = [h["score"] for h in hits]
+    assert scores == sorted(scores, reverse=True)
+
+    typed = client.get("/api/v1/search?q=bark&type=artists,tribes").get_json()
+    assert {h["type"] for h in typed} == {"artists", "tribes"}
+    pages = _follow_pages(client, "/api/v1/search?q=bark&limit=1")
+    assert [h["id"] for h in pages] == [h["id"] for h in hits]
+
+    # the index follows writes
+    client.put(
+        f"/api/v1/artifacts/{sand}", headers=auth_header, json={"description": "ochre"}
+    )
+    client.delete(f"/api/v1/artifacts/{bark}", headers=auth_header)
+    assert client.get("/api/v1/search?q=bark&type=artifacts").get_json() == []
+    assert [h["id"] for h in client.get("/api/v1/search?q=OCHRE").get_json()] == [sand]
+
+    assert client.get("/api/v1/search").status_code == 422
+    assert client.get("/api/v1/search?q=x&type=users").status_code == 422
+    assert client.get("/api/v1/search?q=x&cursor=bad").status_code == 400
+
+    # offsets are bounded: no cursor past SEARCH_MAX_OFFSET is issued or served
+    from resources import search_resource
+    from resources.pagination import encode_cursor
+
+    deep = encode_cursor([10**9])
+    assert client.get(f"/api/v1/search?q=x&cursor={deep}").status_code == 400
+    client.post(
+        "/api/v1/tribes/bulk",
+        headers=auth_header,
+        json=[{"name": f"Ochre {i}", "region": "WA"} for i in range(3)],
+    )
+    monkeypatch.setattr(search_resource, "SEARCH_MAX_OFFSET", 1)
+    pages = _follow_pages(client, "/api/v1/search?q=ochre&limit=1")
+    assert len(pages) == 2  # offsets 0 and 1 of 3 hits, then no next link
+    r = client.get(f"/api/v1/search?q=ochre&cursor={encode_cursor([2])}")
+    assert r.status_code == 400
+
+
+# ─── Related artifacts -------------------------------------
+def test_related_artifacts(client, auth_header):
+    print("[test_related_artifacts] /artifacts/<id>/related → ranked by similarity")
+    tid = client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Yolngu", "region": "NT"}
+    ).get_json()["id"]
+    a1, a2 = (
+        client.post(
+            "/api/v1/artists/",
+            headers=auth_header,
+            json={"name": name, "tribe": tid, "active_years": [1960]},
+        ).get_json()["id"]
+        for name in ("Emily", "Rover")
+    )
+
+    def artifact(title, artist, era="Contemporary"):
+        return client.post(
+            "/api/v1/artifacts/",
+            headers=auth_header,
+            json={"title": title, "artist": artist, "era": era},
+        ).get_json()["id"]
+
+    seed = artifact("Bark painting of the river", a1)
+    near = artifact("River bark painting", a1)
+    mid = artifact("Ochre river", a2)
+    far = artifact("Carved spear", a2, era="Ancient")
+
+    r = client.get(f"/api/v1/artifacts/{seed}/related?k=3")
+    assert r.status_code == 200
+    assert [a["id"] for a in r.get_json()] == [near, mid, far]
+    assert r.get_json()[0]["artist_info"]["tribe_info"]["name"] == "Yolngu"
+    assert client.get(f"/api/v1/artifacts/{seed}/related?k=1").get_json()[0][
+        "id"
+    ] == near
+    r = client.get(f"/api/v1/artifacts/{seed}/related?fields=title")
+    assert r.get_json()[0] == {"title": "River bark painting"}
+
+    # the matrix follows writes
+    late = artifact("Bark painting of the river at night", a1)
+    client.delete(f"/api/v1/artifacts/{near}", headers=auth_header)
+    ids = [a["id"] for a in client.get(f"/api/v1/artifacts/{seed}/related").get_json()]
+    assert ids[0] == late and near not in ids and seed not in ids
+
+    # deletes by other workers send no signal here: hits are checked in Mongo
+    Artifact.objects(id=late).delete()
+    ids = [a["id"] for a in client.get(f"/api/v1/artifacts/{seed}/related").get_json()]
+    assert ids == [mid, far]
+    assert late not in related.index.rows
+    Artifact.objects(id=seed).delete()
+    assert client.get(f"/api/v1/artifacts/{seed}/related").status_code == 404
+
+    assert client.get(f"/api/v1/artifacts/{near}/related").status_code == 404
+    assert client.get("/api/v1/artifacts/bad/related").status_code == 404
+    assert client.get(f"/api/v1/artifacts/{seed}/related?k=0").status_code == 422
+
+
+# ─── Statistics --------------------------------------------
+def test_stats(client, auth_header):
+    print("[test_stats] /api/v1/stats/... → aggregated counts, filtered, kept fresh")
+    t1, t2 = (
+        client.post(
+            "/api/v1/tribes/", headers=auth_header, json={"name": n, "region": r}
+        ).get_json()["id"]
+        for n, r in (("Yolngu", "NT"), ("Pitjantjatjara", "SA"))
+    )
+    a1, a2 = (
+        client.post(
+            "/api/v1/artists/",
+            headers=auth_header,
+            json={"name": n, "tribe": t, "active_years": years},
+        ).get_json()["id"]
+        for n, t, years in (("Emily", t1, [1968, 1990]), ("Rover", t2, [1975, 2000]))
+    )
+    for title, artist, era, year in (
+        ("A", a1, "Modern", 1962),
+        ("B", a1, "Modern", 1969),
+        ("C", a1, "Contemporary", 1985),
+        ("D", a2, "Contemporary", 2001),
+    ):
+        client.post(
+            "/api/v1/artifacts/",
+            headers=auth_header,
+            json={
+                "title": title,
+                "artist": artist,
+                "era": era,
+                "created_date": f"{year}-06-01T00:00:00",
+            },
+        )
+
+    r = client.get("/api/v1/stats/artifacts/by-tribe")
+    assert r.get_json() == [
+        {"key": t1, "label": "Yolngu", "count": 3},
+        {"key": t2, "label": "Pitjantjatjara", "count": 1},
+    ]
+    assert client.get("/api/v1/stats/artifacts/by-region").get_json() == [
+        {"key": "NT", "count": 3},
+        {"key": "SA", "count": 1},
+    ]
+    assert client.get("/api/v1/stats/artifacts/by-decade").get_json() == [
+        {"key": "1960", "count": 2},
+        {"key": "1980", "count": 1},
+        {"key": "2000", "count": 1},
+    ]
+    r = client.get("/api/v1/stats/artifacts/by-era?created_from=1980-01-01T00:00:00")
+    assert r.get_json() == [{"key": "Contemporary", "count": 2}]
+    assert client.get("/api/v1/stats/artists/by-decade").get_json() == [
+        {"key": "1960", "count": 1},
+        {"key": "1970", "count": 1},
+    ]
+    assert client.get(f"/api/v1/stats/artists/by-tribe?tribe={t2}").get_json() == [
+        {"key": t2, "label": "Pitjantjatjara", "count": 1}
+    ]
+    assert client.get("/api/v1/stats/tribes/by-region").get_json() == [
+        {"key": "NT", "count": 1},
+        {"key": "SA", "count": 1},
+    ]
+
+    # a memo hit reads the generation counters only, even with a tribe filter
+    url = f"/api/v1/stats/artifacts/by-era?tribe={t1}"
+    client.get(url)
+    with query_tracker.track_queries() as log:
+        assert client.get(url).status_code == 200
+    assert log.count == 1
+
+    # memoized results follow writes, including cascaded ones
+    client.put(f"/api/v1/tribes/{t1}", headers=auth_header, json={"region": "SA"})
+    assert client.get("/api/v1/stats/artifacts/by-region").get_json() == [
+        {"key": "SA", "count": 4}
+    ]
+
+    assert client.get("/api/v1/stats/artifacts/by-colour").status_code == 404
+    assert client.get("/api/v1/stats/artists/by-era").status_code == 404
+    assert client.get("/api/v1/stats/artifacts/by-era?tribe=bad").status_code == 422
+
+
+# ─── Rate limiting -----------------------------------------
+def test_rate_limit(client, auth_header, monkeypatch, tmp_path):
+    print("[test_rate_limit] token bucket per client/blueprint/method → 429")
+    monkeypatch.setattr(ratelimit, "store", ratelimit.MemoryStore())
+    monkeypatch.setattr(
+        ratelimit, "rules", ratelimit.parse_rules("*=100/60,Artifacts:GET=2/60")
+    )
+    r = client.get("/api/v1/artifacts/")
+    assert r.status_code == 200
+    assert r.headers["RateLimit-Limit"] == "2"
+    assert r.headers["RateLimit-Remaining"] == "1"
+    assert r.headers["RateLimit-Policy"] == "2;w=60"
+    assert client.get("/api/v1/artifacts/").headers["RateLimit-Remaining"] == "0"
+    r = client.get("/api/v1/artifacts/")
+    assert r.status_code == 429 and int(r.headers["Retry-After"]) <= 30
+    assert r.get_json()["message"] == "Rate limit exceeded."
+
+    # other methods/blueprints, other clients and non-blueprint routes are apart
+    assert client.get("/api/v1/tribes/").headers["RateLimit-Limit"] == "100"
+    assert client.get("/api/v1/artifacts/", headers=auth_header).status_code == 200
+    assert "RateLimit-Limit" not in client.get("/health/db").headers
+
+    # buckets refill with time; the disk store is shared between processes
+    rule = ratelimit.Rule("x", 1, 10)
+    for store in (ratelimit.MemoryStore(), ratelimit.DiskStore(str(tmp_path))):
+        assert store.take("k", rule, 100.0)[0]
+        assert not store.take("k", rule, 105.0)[0]
+        assert store.take("k", rule, 110.0)[0]
+
+    # memory stays bounded: the least recently used buckets go first
+    store = ratelimit.MemoryStore(max_buckets=3)
+    for key in ("a", "b", "c", "a", "d"):
+        store.take(key, rule, 100.0)
+    assert len(store) == 3
+    assert not store.take("a", rule, 100.0)[0]  # kept: used recently
+    assert store.take("b", rule, 100.0)[0]  # evicted, so a fresh bucket
+
+    # the limiter's own cost per request is microseconds
+    store, n = ratelimit.MemoryStore(), 20000
+    start = ratelimit.time.perf_counter()
+    for i in range(n):
+        store.take(f"k{i % 100}", ratelimit.rule_for("Artifacts", "GET"), i * 0.001)
+    assert (ratelimit.time.perf_counter() - start) / n < 50e-6
+
+    with pytest.raises(ValueError):
+        ratelimit.parse_rules("Artifacts=lots")
+
+
+# ─── Metrics -----------------------------------------------
+def _samples(client):
+    text = client.get("/metrics").get_data(as_text=True)
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if line[:1] != "#")
+
+
+@pytest.mark.skipif(not metrics.METRICS_ENABLED, reason="METRICS_ENABLED=false")
+def test_metrics(client):
+    print("[test_metrics] /metrics → request, serialization and command metrics")
+    route = 'method="GET",route="/api/v1/tribes/"'
+    before = _samples(client)
+    client.get("/api/v1/tribes/")
+    client.get("/api/v1/tribes/")
+    r = client.get("/metrics")
+    assert r.status_code == 200 and r.mimetype == "text/plain"
+    after = _samples(client)
+
+    def delta(name):
+        return float(after.get(name, 0)) - float(before.get(name, 0))
+
+    assert delta(f'http_requests_total{{{route},status="200"}}') == 2
+    assert delta(f"http_request_duration_seconds_count{{{route}}}") == 2
+    assert delta(f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}') == 2
+    assert delta(f"http_request_serialization_seconds_sum{{{route}}}") > 0
+    assert delta(f"http_response_size_bytes_count{{{route}}}") == 2
+    assert after["http_requests_in_flight"] == "1"  # the scrape itself
+
+    # commands are counted per collection, and timed into the current request
+    before, listener = _samples(client), metrics.CommandMetrics()
+    for request_id, name, command in (
+        (1, "find", {"find": "tribes"}),
+        (2, "getMore", {"getMore": 7, "collection": "tribes"}),
+    ):
+        event = SimpleNamespace(
+            command_name=name,
+            command=command,
+            connection_id=("db", 27017),
+            request_id=request_id,
+            duration_micros=1500,
+        )
+        listener.started(event)
+        listener.succeeded(event)
+    after = _samples(client)
+    labels = 'collection="tribes",command='
+    assert delta(f'mongodb_commands_total{{{labels}"find",outcome="success"}}') == 1
+    assert delta(f'mongodb_command_duration_seconds_sum{{{labels}"getMore"}}') == 0.0015
+
+    # shards of finished threads are folded, their counts kept
+    import threading
+
+    counter = metrics.Counter("test_thread_total", "Recorded by short threads.")
+    try:
+        for _ in range(20):
+            thread = threading.Thread(target=counter.inc, args=((), 2))
+            thread.start()
+            thread.join()
+        assert counter._merged() == {(): 40}
+        assert len(metrics._shards) <= threading.active_count()
+    finally:
+        metrics.registry.remove(counter)
+
+    # values past a million keep every digit
+    counter = metrics.Counter("test_big_total", "Large values.")
+    histogram = metrics.Histogram("test_big_seconds", "Large sums.")
+    try:
+        counter.inc((), 1234567)
+        histogram.observe((), 1234567.125)
+        assert "test_big_total 1234567" in counter.expose()
+        assert "test_big_seconds_sum 1234567.125" in histogram.expose()
+    finally:
+        metrics.registry.remove(counter)
+        metrics.registry.remove(histogram)
+
+
+# ─── Query budgets -----------------------------------------
+def test_query_budgets(client, auth_header, monkeypatch):
+    print("[test_query_budgets] list/detail reads cost a fixed number of queries")
+    tribes = client.post(
+        "/api/v1/tribes/bulk",
+        headers=auth_header,
+        json=[{"name": f"T{i}", "region": "NT"} for i in range(3)],
+    ).get_json()["items"]
+    artists = client.post(
+        "/api/v1/artists/bulk",
+        headers=auth_header,
+        json=[
+            {"name": f"A{i}", "tribe": tribes[i % 3]["id"], "active_years": [1, 2]}
+            for i in range(6)
+        ],
+    ).get_json()["items"]
+    artifacts = client.post(
+        "/api/v1/artifacts/bulk",
+        headers=auth_header,
+        json=[{"title": f"X{i}", "artist": artists[i % 6]["id"]} for i in range(30)],
+    ).get_json()["items"]
+
+    def queries(url):
+        with query_tracker.track_queries() as log:
+            assert client.get(url).status_code == 200
+        return log.count
+
+    # ETag validator + artifacts + one $in each for artists and tribes,
+    # whatever the page size (the embedded read model needs only the first two)
+    small, large = (queries(f"/api/v1/artifacts/?limit={n}") for n in (5, 30))
+    assert small == large <= 4
+    assert queries("/api/v1/artifacts/?limit=30") == 0  # cached
+    assert queries(f"/api/v1/artifacts/{artifacts[0]['id']}") <= 4
+    assert queries(f"/api/v1/artifacts/{artifacts[0]['id']}") == 0  # cached
+    assert queries("/api/v1/artists/?limit=30") <= 3
+    assert queries("/api/v1/tribes/?limit=30") <= 2
+
+    # an N+1 loop is reported, and raises in `raise` mode
+    with query_tracker.track_queries() as log:
+        for artist in artists:
+            Artist.objects(id=artist["id"]).first()
+    assert any(p.startswith("6x find artists") for p in log.problems(max_repeats=5))
+    monkeypatch.setattr(query_tracker, "QUERY_TRACKING", "raise")
+    monkeypatch.setattr(query_tracker, "QUERY_MAX_COUNT", 0)
+    with pytest.raises(query_tracker.QueryBudgetExceeded):
+        client.get("/api/v1/tribes/?limit=2")
+
+
+# ─── Prebuilt OpenAPI spec ---------------------------------
+def test_prebuilt_openapi_spec(client, tmp_path):
+    print("[test_prebuilt_openapi_spec] written spec is served as generated")
+    import app as app_module
+    from flask import Flask
+
+    path = tmp_path / "openapi.json"
+    result = app.test_cli_runner().invoke(args=["write-openapi", str(path)])
+    assert result.exit_code == 0, result.output
+    generated = client.get("/openapi.json").get_json()
+    assert json.loads(path.read_text()) == generated
+
+    prebuilt = Flask("prebuilt")
+    app_module.register_api(prebuilt, str(path))
+    with prebuilt.test_client() as c:
+        assert c.get("/openapi.json").get_json() == generated
+        assert c.get("/api/v1/tribes/").status_code == 200
+
+
+# ─── Compression & compact representations -----------------
+def _artifacts_of_shared_artists(client, auth_header, count=30):
+    tid = client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Yorta", "region": "VIC"}
+    ).get_json()["id"]
+    aids = [
+        client.post(
+            "/api/v1/artists/",
+            headers=auth_header,
+            json={"name": f"A{i}", "tribe": tid, "active_years": [1970, 2000]},
+        ).get_json()["id"]
+        for i in range(3)
+    ]
+    client.post(
+        "/api/v1/artifacts/bulk",
+        headers=auth_header,
+        json=[{"title": f"X{i}", "artist": aids[i % 3]} for i in range(count)],
+    )
+    return aids
+
+
+@pytest.mark.skipif(not compression.COMPRESSION, reason="COMPRESSION=false")
+def test_response_compression(client, auth_header):
+    print("[test_response_compression] negotiated encodings, per-encoding ETags")
+    import gzip, zlib
+
+    _artifacts_of_shared_artists(client, auth_header)
+    url = "/api/v1/artifacts/?limit=30"
+    plain = client.get(url)
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    decoders = {"gzip": gzip.decompress, "deflate": zlib.decompress}
+    if compression.brotli is not None:
+        decoders["br"] = compression.brotli.decompress
+    if compression.zstandard is not None:
+        zstd = compression.zstandard.ZstdDecompressor()
+        decoders["zstd"] = lambda data: zstd.decompressobj().decompress(data)
+    etags = {plain.headers["ETag"]}
+    for encoding, decode in decoders.items():
+        r = client.get(url, headers={"Accept-Encoding": encoding})
+        assert r.headers["Content-Encoding"] == encoding
+        assert decode(r.get_data()) == plain.get_data()
+        assert len(r.get_data()) < len(plain.get_data()) / 4
+        etags.add(r.headers["ETag"])
+        # revalidating the compressed copy
+        r = client.get(
+            url,
+            headers={"Accept-Encoding": encoding, "If-None-Match": r.headers["ETag"]},
+        )
+        assert r.status_code == 304 and r.headers["ETag"] in etags
+    assert len(etags) == len(decoders) + 1
+
+    # preference among equals, q-values and the size threshold
+    r = client.get(url, headers={"Accept-Encoding": "deflate, gzip"})
+    assert r.headers["Content-Encoding"] == "gzip"
+    r = client.get(url, headers={"Accept-Encoding": "gzip;q=0.5, deflate"})
+    assert r.headers["Content-Encoding"] == "deflate"
+    small = client.get("/api/v1/tribes/", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+
+    # streamed exports are compressed chunk by chunk
+    export = "/api/v1/artifacts/export?format=ndjson"
+    r = client.get(export, headers={"Accept-Encoding": "gzip"})
+    assert r.is_streamed and r.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(r.get_data()) == client.get(export).get_data()
+
+
+def test_compact_representations(client, auth_header):
+    print("[test_compact_representations] normalized and msgpack bodies via Accept")
+    from resources import serialization
+
+    _artifacts_of_shared_artists(client, auth_header)
+    url = "/api/v1/artifacts/?limit=30"
+    rows = client.get(url).get_json()
+
+    accept = {"Accept": serialization.NORMALIZED_JSON}
+    r = client.get(url, headers=accept)
+    assert r.mimetype == serialization.NORMALIZED_JSON
+    assert "Accept" in r.headers["Vary"]
+    body = r.get_json()
+    assert len(body["artists"]) == 3 and len(body["tribes"]) == 1
+
+    def denormalize(obj):
+        artist = dict(body["artists"][obj["artist_info"]])
+        artist["tribe_info"] = body["tribes"][artist["tribe_info"]]
+        return {**obj, "artist_info": artist}
+
+    assert [denormalize(obj) for obj in body["data"]] == rows
+    # negotiated types have their own tags and cache entries
+    assert r.headers["ETag"] != client.get(url).headers["ETag"]
+    if cache.backend is not None:
+        assert client.get(url, headers=accept).headers["X-Cache"] == "HIT"
+    assert client.get(url).get_json() == rows
+
+    # single documents, and objects whose id is not in the fieldset stay inline
+    detail = client.get(f"/api/v1/artifacts/{rows[0]['id']}", headers=accept)
+    assert denormalize(detail.get_json()["data"]) == rows[0]
+    sparse = client.get(f"{url}&artist_info.fields=name", headers=accept).get_json()
+    assert sparse["artists"] == {} and sparse["data"][0]["artist_info"] == {"name": "A0"}
+
+    if serialization.msgpack is not None:
+        r = client.get(url, headers={"Accept": serialization.MSGPACK})
+        assert r.mimetype == serialization.MSGPACK
+        assert serialization.msgpack.unpackb(r.get_data()) == rows
+    # unknown types fall back to JSON
+    assert client.get(url, headers={"Accept": "text/csv"}).get_json() == rows
+
+
+# ─── Embedded read model -----------------------------------
+def test_embedded_read_model(client, auth_header, monkeypatch):
+    print("[test_embedded_read_model] snapshots served, fanned out and rebuilt")
+    from resources import read_model
+
+    monkeypatch.setattr(read_model, "EMBEDDED", True)
+    tid = client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Yolngu", "region": "NT"}
+    ).get_json()["id"]
+    aid = client.post(
+        "/api/v1/artists/",
+        headers=auth_header,
+        json={"name": "A1", "tribe": tid, "active_years": [1960, 2000]},
+    ).get_json()["id"]
+    art = client.post(
+        "/api/v1/artifacts/", headers=auth_header, json={"title": "Art", "artist": aid}
+    ).get_json()["id"]
+    client.post(
+        "/api/v1/artifacts/bulk",
+        headers=auth_header,
+        json=[{"title": "Bulk", "artist": aid}],
+    )
+    detail = f"/api/v1/artifacts/{art}"
+
+    # same bytes as the reference model
+    embedded = [client.get(u).get_data() for u in (detail, "/api/v1/artifacts/")]
+    monkeypatch.setattr(read_model, "EMBEDDED", False)
+    cache.clear()
+    assert [client.get(u).get_data() for u in (detail, "/api/v1/artifacts/")] == embedded
+    monkeypatch.setattr(read_model, "EMBEDDED", True)
+
+    # fan-out of artist and tribe updates, done before any cache or validator
+    # hears of the change
+    from resources.events import entity_changed
+
+    seen, send = [], entity_changed.send
+
+    def check_then_send(*args, **kwargs):
+        snapshot = Artifact.objects.get(id=art).artist_snapshot
+        seen.append((snapshot.name, snapshot.tribe.region))
+        return send(*args, **kwargs)
+
+    monkeypatch.setattr(entity_changed, "send", check_then_send)
+    client.put(f"/api/v1/artists/{aid}", headers=auth_header, json={"name": "A2"})
+    client.put(f"/api/v1/tribes/{tid}", headers=auth_header, json={"region": "WA"})
+    monkeypatch.setattr(entity_changed, "send", send)
+    assert seen[0] == ("A2", "NT") and seen[-1] == ("A2", "WA")
+    snapshot = Artifact.objects.get(id=art).artist_snapshot
+    assert (snapshot.name, snapshot.tribe.region) == ("A2", "WA")
+
+    # reads no longer join: hide the artists from Mongo behind the API's back
+    Artist._get_collection().rename("artists_hidden")
+    try:
+        items = client.get("/api/v1/artifacts/?fields=title,artist_info").get_json()
+        assert {a["artist_info"]["name"] for a in items} == {"A2"}
+        info = client.get(detail).get_json()["artist_info"]
+        assert info["tribe_info"]["region"] == "WA"
+    finally:
+        Artist._get_collection().database["artists_hidden"].rename("artists")
+
+    client.delete(f"/api/v1/tribes/{tid}", headers=auth_header)
+    assert client.get(detail).get_json()["artist_info"]["tribe_info"] is None
+
+    Artifact._get_collection().update_many({}, {"$unset": {"artist_snapshot": ""}})
+    result = app.test_cli_runner().invoke(args=["rebuild-read-model"])
+    assert "1 artists" in result.output
+    assert Artifact.objects.get(id=art).artist_snapshot.name == "A2"
+
+
+# ─── Conditional GET ---------------------------------------
+def test_conditional_get(client, auth_header):
+    print("[test_conditional_get] ETag/Last-Modified → 304, writes change validators")
+    from resources import read_model
+
+    tid = client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Yolngu", "region": "NT"}
+    ).get_json()["id"]
+    aid = client.post(
+        "/api/v1/artists/",
+        headers=auth_header,
+        json={"name": "A1", "tribe": tid, "active_years": [1960, 2000]},
+    ).get_json()["id"]
+    art = client.post(
+        "/api/v1/artifacts/", headers=auth_header, json={"title": "Art", "artist": aid}
+    ).get_json()["id"]
+    detail, listing = f"/api/v1/artifacts/{art}", "/api/v1/artifacts/"
+
+    r = client.get(detail)
+    etag, last_modified = r.headers["ETag"], r.headers["Last-Modified"]
+    r = client.get(detail, headers={"If-None-Match": etag})
+    assert r.status_code == 304 and r.get_data() == b""
+    assert r.headers.get("X-Cache", "HIT") == "HIT"  # the view did not run
+    r = client.get(detail, headers={"If-Modified-Since": last_modified})
+    assert r.status_code == 304
+    # another representation of the same document has its own tag
+    assert client.get(f"{detail}?fields=title").headers["ETag"] != etag
+
+    list_etag = client.get(listing).headers["ETag"]
+    assert client.get(listing, headers={"If-None-Match": list_etag}).status_code == 304
+    assert "ETag" in client.get("/api/v1/artifacts/export").headers
+
+    # the artifact embeds its artist and tribe: writing either changes both
+    # tags, without the artifact itself being rewritten
+    client.put(f"/api/v1/artists/{aid}", headers=auth_header, json={"bio": "New"})
+    r = client.get(detail, headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["ETag"] != etag
+    etag = r.headers["ETag"]
+    assert client.get(listing, headers={"If-None-Match": list_etag}).status_code == 200
+    client.put(f"/api/v1/tribes/{tid}", headers=auth_header, json={"region": "SA"})
+    r = client.get(detail, headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["ETag"] != etag
+    etag = r.headers["ETag"]
+    if not read_model.EMBEDDED:  # the embedded read model rewrites snapshots
+        assert Artifact.objects.get(id=art).version == 1
+
+    client.put(detail, headers=auth_header, json={"era": "Contemporary"})
+    assert client.get(detail, headers={"If-None-Match": etag}).status_code == 200
+    version = Artifact.objects.get(id=art).version
+    assert version >= 2  # create, put
+    client.put(
+        "/api/v1/artifacts/bulk", headers=auth_header, json=[{"id": art, "era": "X"}]
+    )
+    assert Artifact.objects.get(id=art).version > version
+
+    r = client.get("/api/v1/artifacts/ffffffffffffffffffffffff")
+    assert r.status_code == 404 and "ETag" not in r.headers
+
+
+# ─── Response cache ----------------------------------------
+def test_response_cache_cascading_invalidation(client, auth_header):
+    print(
+        "[test_response_cache_cascading_invalidation] cached artifact → tribe update → fresh tribe_info"
+    )
+    tid = client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Arrernte", "region": "NT"}
+    ).get_json()["id"]
+    aid = client.post(
+        "/api/v1/artists/",
+        headers=auth_header,
+        json={"name": "A1", "tribe": tid, "active_years": [1930, 1959]},
+    ).get_json()["id"]
+    art_id = client.post(
+        "/api/v1/artifacts/", headers=auth_header, json={"title": "Art", "artist": aid}
+    ).get_json()["id"]
+
+    assert client.get(f"/api/v1/artifacts/{art_id}").headers["X-Cache"] == "MISS"
+    assert client.get(f"/api/v1/artifacts/{art_id}").headers["X-Cache"] == "HIT"
+    assert client.get("/api/v1/artifacts/").headers["X-Cache"] == "MISS"
+    assert client.get("/api/v1/artifacts/").headers["X-Cache"] == "HIT"
+
+    client.put(f"/api/v1/tribes/{tid}", headers=auth_header, json={"region": "SA"})
+
+    r = client.get(f"/api/v1/artifacts/{art_id}")
+    assert r.headers["X-Cache"] == "MISS"
+    assert r.get_json()["artist_info"]["tribe_info"]["region"] == "SA"
+    r = client.get("/api/v1/artifacts/")
+    assert r.headers["X-Cache"] == "MISS"
+    assert r.get_json()[0]["artist_info"]["tribe_info"]["region"] == "SA"
+
+
+@pytest.mark.skipif(cache.backend is None, reason="CACHE_BACKEND=none")
+def test_response_cache_bounded_invalidation(client, auth_header, monkeypatch):
+    print("[test_response_cache_bounded_invalidation] large bulk write → 2 keys set")
+    monkeypatch.setattr(cache, "CACHE_INVALIDATE_MAX_IDS", 2)
+    tid = client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Tiwi", "region": "NT"}
+    ).get_json()["id"]
+    detail = f"/api/v1/tribes/{tid}"
+    assert client.get(detail).headers["X-Cache"] == "MISS"
+    assert client.get(detail).headers["X-Cache"] == "HIT"
+
+    written = []
+    set_ = cache.backend.set
+    monkeypatch.setattr(
+        cache.backend, "set", lambda key, *a: written.append(key) or set_(key, *a)
+    )
+    cache.invalidate("tribes", ["a", "b"])
+    assert written == ["gen:tribes", "gen:tribes:a", "gen:tribes:b"]
+    written.clear()
+    cache.invalidate("tribes", ["a", "b", tid])
+    assert written == ["gen:tribes", "gen:tribes:*"]
+    assert client.get(detail).headers["X-Cache"] == "MISS"
+
+
+# ─── Pagination --------------------------------------------
+def test_list_pagination(client, auth_header):
+    print("[test_list_pagination] 3 tribes, limit=2 → follow next link → last page")
+    for name in ("T1", "T2", "T3"):
+        client.post(
+            "/api/v1/tribes/", headers=auth_header, json={"name": name, "region": "R"}
+        )
+
+    r = client.get("/api/v1/tribes/?limit=2")
+    assert [t["name"] for t in r.get_json()] == ["T1", "T2"]
+    link = r.headers["Link"]
+    assert link.endswith('rel="next"')
+
+    next_url = link[link.index("<") + 1 : link.index(">")]
+    r = client.get(next_url)
+    assert [t["name"] for t in r.get_json()] == ["T3"]
+    assert "Link" not in r.headers
+
+
+def test_list_pagination_bad_args(client):
+    print("[test_list_pagination_bad_args] bad cursor → 400, limit out of range → 422")
+    assert client.get("/api/v1/artifacts/?cursor=not-a-cursor").status_code == 400
+    assert client.get("/api/v1/artifacts/?limit=0").status_code == 422
+    assert client.get("/api/v1/artifacts/?limit=100000").status_code == 422
+
+
+# ─── Indexes & diagnostics ---------------------------------
+def test_declared_indexes_are_created():
+    print("[test_declared_indexes_are_created] ensure_indexes → artist/tribe indexes exist")
+    from models.indexes import ensure_indexes
+
+    ensure_indexes()
+    assert "artist_1__id_1" in Artifact._get_collection().index_information()
+    assert "tribe_1__id_1" in Artist._get_collection().index_information()
+
+
+def test_unique_indexes_required_before_writes(client, auth_header, monkeypatch):
+    print("[test_unique_indexes_required_before_writes] first write → unique indexes")
+    import threading
+    from models import indexes
+    from mongoengine.errors import NotUniqueError
+
+    Tribe.drop_collection()
+    monkeypatch.setattr(indexes, "_unique_ready", threading.Event())
+    assert client.get("/api/v1/tribes/").status_code == 200
+    assert "name_1" not in Tribe._get_collection().index_information()
+    client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Kaurna", "region": "SA"}
+    )
+    assert Tribe._get_collection().index_information()["name_1"]["unique"]
+    assert User._get_collection().index_information()["username_1"]["unique"]
+    assert "artist_1__id_1" not in Artifact._get_collection().index_information()
+    with pytest.raises(NotUniqueError):
+        Tribe(name="Kaurna", region="SA").save()
+
+
+def test_index_build_retries(monkeypatch):
+    print("[test_index_build_retries] Mongo down at boot → background build retries")
+    import threading
+    from models import indexes
+
+    attempts = []
+
+    def ensure_indexes():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("mongo down")
+
+    monkeypatch.setattr(indexes, "_unique_ready", threading.Event())
+    monkeypatch.setattr(indexes, "ensure_indexes", ensure_indexes)
+    monkeypatch.setattr(indexes.time, "sleep", lambda s: None)
+    indexes.ensure_indexes_in_background().join(timeout=5)
+    assert len(attempts) == 3 and indexes._unique_ready.is_set()
+
+
+def test_preloaded_app_defers_db_init(monkeypatch):
+    print("[test_preloaded_app_defers_db_init] MONGO_CONNECT_AFTER_FORK → no init_db")
+    import app as app_module
+
+    calls = []
+    monkeypatch.setattr(app_module, "init_db", lambda: calls.append("init_db"))
+    monkeypatch.setenv("MONGO_CONNECT_AFTER_FORK", "true")
+    app_module.create_app()
+    assert calls == []
+    monkeypatch.delenv("MONGO_CONNECT_AFTER_FORK")
+    app_module.create_app()
+    assert calls == ["init_db"]
+
+
+def test_explain_diagnostics(client, auth_header):
+    print("[test_explain_diagnostics] GET /api/v1/diagnostics/explain → no COLLSCAN")
+    from models.indexes import ensure_indexes
+
+    ensure_indexes()
+    # Documents in every collection: an empty one is planned as EOF.
+    tribes = client.post(
+        "/api/v1/tribes/bulk",
+        headers=auth_header,
+        json=[{"name": f"T{i}", "region": "NT"} for i in range(5)],
+    ).get_json()["items"]
+    artists = client.post(
+        "/api/v1/artists/bulk",
+        headers=auth_header,
+        json=[
+            {"name": f"A{i}", "tribe": tribes[i % 5]["id"], "active_years": [1, 2]}
+            for i in range(10)
+        ],
+    ).get_json()["items"]
+    client.post(
+        "/api/v1/artifacts/bulk",
+        headers=auth_header,
+        json=[
+            {"title": f"X{i}", "artist": artists[i % 10]["id"], "era": "Contemporary"}
+            for i in range(30)
+        ],
+    )
+
+    assert client.get("/api/v1/diagnostics/explain").status_code == 401
+    r = client.get("/api/v1/diagnostics/explain", headers=auth_header)
+    assert r.status_code == 200
+    plans = r.get_json()
+    assert {p["collection"] for p in plans} == {"tribes", "artists", "artifacts"}
+    for plan in plans:
+        assert "error" not in plan, plan
+        assert plan["collscan"] is False, plan
+
+
 # ─── Auth edge cases ---------------------------------------
 def test_register_duplicate_username(client):
     print("[test_register_duplicate_username] register same user twice → 400")
@@ -220,6 +1399,33 @@ def test_login_bad_credentials(client):
     assert r.status_code == 401
 
 
+def test_login_verification_cache(client, monkeypatch):
+    print("[test_login_verification_cache] repeat login skips the hash, 429 when full")
+    creds = {"username": "carol", "password": "secret"}
+    client.post("/auth/register", json=creds)
+    stored = User.objects.get(username="carol").password_hash
+    assert stored.startswith(passwords.PASSWORD_HASH_METHOD)
+
+    passwords.verified.clear()
+    monkeypatch.setattr(passwords, "LOGIN_CACHE_TTL", 300)
+    calls = []
+    run = passwords._run
+    monkeypatch.setattr(passwords, "_run", lambda *a: calls.append(a) or run(*a))
+    for _ in range(3):
+        assert client.post("/auth/login", json=creds).status_code == 200
+    assert len(calls) == 1
+    bad = {"username": "carol", "password": "nope"}
+    assert client.post("/auth/login", json=bad).status_code == 401
+    assert client.post("/auth/login", json=bad).status_code == 401
+    assert len(calls) == 3  # failures are never cached
+
+    # no free hashing slot → immediate 429
+    monkeypatch.setattr(passwords, "_slots", passwords.threading.Semaphore(0))
+    r = client.post("/auth/register", json={"username": "dave", "password": "pw"})
+    assert r.status_code == 429 and r.headers["Retry-After"] == "1"
+    assert client.post("/auth/login", json=bad).status_code == 429
+
+
 # ─── Validation errors -------------------------------------
 @pytest.mark.parametrize(
     "route,payload",
@@ -251,6 +1457,42 @@ def test_404_on_unknown_tribe(client, auth_header):
     )
 
 
+def test_404_on_unknown_artifact_and_artist(client, auth_header):
+    print("[test_404_on_unknown_artifact_and_artist] PUT/DELETE unknown ObjectIds → 404")
+    missing = "000000000000000000000000"
+    for route, patch in [
+        (f"/api/v1/artifacts/{missing}", {"era": "X"}),
+        (f"/api/v1/artists/{missing}", {"bio": "X"}),
+    ]:
+        assert client.put(route, headers=auth_header, json={}).status_code == 404
+        assert client.put(route, headers=auth_header, json=patch).status_code == 404
+        assert client.delete(route, headers=auth_header).status_code == 404
+
+
+def test_update_artifact_artist(client, auth_header):
+    print("[test_update_artifact_artist] PUT artifact with new artist → nested info follows")
+    tid = client.post(
+        "/api/v1/tribes/", headers=auth_header, json={"name": "Warlpiri", "region": "NT"}
+    ).get_json()["id"]
+    a1, a2 = (
+        client.post(
+            "/api/v1/artists/",
+            headers=auth_header,
+            json={"name": name, "tribe": tid, "active_years": [1970, 2010]},
+        ).get_json()["id"]
+        for name in ("First", "Second")
+    )
+    art_id = client.post(
+        "/api/v1/artifacts/", headers=auth_header, json={"title": "Art", "artist": a1}
+    ).get_json()["id"]
+
+    r = client.put(f"/api/v1/artifacts/{art_id}", headers=auth_header, json={"artist": a2})
+    assert r.status_code == 200
+    assert r.get_json()["artist_info"]["name"] == "Second"
+    assert r.get_json()["artist_info"]["tribe_info"]["name"] == "Warlpiri"
+    assert client.get(f"/api/v1/artifacts/{art_id}").get_json()["artist_info"]["id"] == a2
+
+
 def test_create_artist_with_bad_tribe(client, auth_header):
     print(
         "[test_create_artist_with_bad_tribe] POST /api/v1/artists/ with non-existent tribe → 404"
@@ -321,12 +1563,14 @@ def cleanup_test_db(request):
         from models.tribe import Tribe
         from models.artist import Artist
         from models.artifact import Artifact
+        from models.generation import Generation
 
         print("\n[cleanup_test_db] Dropping test collections…")
         User.drop_collection()
         Tribe.drop_collection()
         Artist.drop_collection()
         Artifact.drop_collection()
+        Generation.drop_collection()
         print("[cleanup_test_db] Done.")
 
     request.addfinalizer(teardown)
@@ -0,0 +1,138 @@
+import os, sys
+
+# make project root importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+from pymongo import monitoring
+from bench import dataset, runner, scenarios
+from models.artifact import Artifact
+from models.artist import Artist
+from models.tribe import Tribe
+from bench.compare import compare
+from bench.replay import read_log, replay
+from bench.runner import ClientTarget, percentile, run_target
+from bench.startup import parse_importtime
+
+
+def _report(**scenario):
+    row = {"errors": 0, "p50_ms": 10.0, "p95_ms": 20.0, "rps": 100.0}
+    row["commands_per_request"] = 3.0
+    row.update(scenario)
+    return {"runs": [{"target": "client", "scenarios": {"artifacts.list": row}}]}
+
+
+def test_percentile_nearest_rank():
+    print("[test_percentile_nearest_rank] 1..100 → p50=50, p95=95; empty → None")
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 100) == 100
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) is None
+
+
+def test_compare_flags_regressions():
+    print("[test_compare_flags_regressions] slower p95/rps, extra commands → flagged")
+    baseline = _report()
+    assert compare(baseline, _report(p50_ms=10.9, rps=91.0))[1] == []
+
+    _, regressions = compare(baseline, _report(p95_ms=23.0, rps=80.0))
+    assert {row[2] for row in regressions} == {"p95_ms", "rps"}
+
+    # Any extra command per request or error is a regression.
+    _, regressions = compare(baseline, _report(commands_per_request=4.0, errors=1))
+    assert {row[2] for row in regressions} == {"commands_per_request", "errors"}
+
+    # Scenarios missing from the baseline are skipped.
+    current = _report()
+    current["runs"][0]["target"] = "wsgi"
+    assert compare(baseline, current) == ([], [])
+
+
+class _FakeTarget:
+    name = "fake"
+
+    def __init__(self):
+        self.sent = []
+
+    def request(self, method, path, json=None, headers=None):
+        self.sent.append((method, path, json, headers))
+        return (404 if path.startswith("/missing") else 200), b"{}"
+
+
+def test_replay_log():
+    print("[test_replay_log] JSON-lines log → timed requests with role tokens")
+    lines = [
+        json.dumps({"ts": 100.0, "path": "/a", "query": {"q": "x"}, "role": "user"}),
+        "",
+        json.dumps(
+            {
+                "ts": "1970-01-01T00:01:40.05Z",
+                "method": "post",
+                "path": "/a",
+                "body": {"n": 1},
+                "role": "admin",
+            }
+        ),
+        json.dumps({"ts": 100.1, "path": "/missing"}),
+    ]
+    entries = list(read_log(lines))
+    assert [e["path"] for e in entries] == ["/a?q=x", "/a", "/missing"]
+    assert entries[1]["method"] == "POST" and entries[1]["ts"] == 100.05
+
+    target = _FakeTarget()
+    tokens = {"user": "u-token", "admin": "a-token"}
+    result = replay(target, entries, lambda m, p: f"{m} {p.split('?')[0]}", tokens)
+    assert result["requests"] == 3
+    assert result["duration_s"] >= 0.1  # the recorded 100 ms span was kept
+    assert set(result["routes"]) == {"GET /a", "POST /a", "GET /missing"}
+    assert result["routes"]["GET /missing"]["error_rate"] == 1.0
+    headers = {path: headers for _, path, _, headers in target.sent}
+    assert headers["/a?q=x"] == {"Authorization": "Bearer u-token"}
+    assert headers["/missing"] is None
+
+    fast = replay(_FakeTarget(), entries, lambda m, p: p, tokens, speed=0)
+    assert fast["duration_s"] < 0.1
+
+
+def test_parse_importtime():
+    print("[test_parse_importtime] -X importtime output → slowest top-level imports")
+    text = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |     numpy.core",
+            "import time:       500 |       4000 |   numpy",
+            "import time:       200 |        200 |   flask",
+            "import time:       300 |       4500 | app",
+            "import time:        50 |         50 | unrelated",
+        ]
+    )
+    assert parse_importtime(text) == [("numpy", 4.0), ("flask", 0.2)]
+    assert parse_importtime(text, top=1) == [("numpy", 4.0)]
+
+
+def test_read_scenarios_smoke():
+    print("[test_read_scenarios_smoke] tiny dataset, every read scenario → no 5xx")
+    import app as app_module
+    from models.generation import Generation
+    from resources import cache, related, search, stats
+
+    monitoring.register(runner.commands)
+    app_module.connect_db()  # the counter only sees clients created after it
+    try:
+        sizes = dataset.seed(tribes=3, artists=6, artifacts=20)
+        ctx = scenarios.Context(sizes, credentials=None)
+        report = run_target(
+            ClientTarget(app_module.app), scenarios.READS, ctx, 2, concurrency=1
+        )
+        assert set(report["scenarios"]) == {s.name for s in scenarios.READS}
+        for name, result in report["scenarios"].items():
+            assert result["requests"] == 2, name
+            assert not any(int(s) >= 500 for s in result["statuses"]), (name, result)
+            assert result["commands_per_request"] is not None, name
+    finally:
+        for document in (Tribe, Artist, Artifact, Generation):
+            document.drop_collection()
+        for state in (cache, search.index, related.index, stats):
+            state.clear()
@@ -0,0 +1,110 @@
+import os, sys, datetime, json
+import pytest
+from bson import ObjectId
+from marshmallow import Schema, fields
+
+# make project root importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import app
+from models.tribe import Tribe
+from models.artist import Artist
+from models.artifact import Artifact
+from schemas.tribe_schema import TribeOutSchema
+from schemas.artist_schema import ArtistOutSchema
+from schemas.artifact_schema import ArtifactOutSchema
+from schemas.fast import compile_schema
+from resources import serialization
+
+
+# ─── Fixtures: unsaved documents covering the edge cases ────
+def _tribe(**kw):
+    data = dict(id=ObjectId(), name="Yolŋu", region="NT", description="Arnhem Land")
+    data.update(kw)
+    return Tribe(**data)
+
+
+def _artist(**kw):
+    data = dict(
+        id=ObjectId(), name="Artist", bio="", tribe=_tribe(), active_years=[1950, 1990]
+    )
+    data.update(kw)
+    return Artist(**data)
+
+
+def _artifact(**kw):
+    data = dict(
+        id=ObjectId(),
+        title="Bark painting",
+        description="Ochre on bark",
+        image_url="https://example.org/a.jpg",
+        artist=_artist(),
+        era="Contemporary",
+        created_date=datetime.datetime(2001, 2, 3, 4, 5, 6, 789),
+    )
+    data.update(kw)
+    return Artifact(**data)
+
+
+CASES = [
+    (TribeOutSchema, _tribe()),
+    (TribeOutSchema, _tribe(description=None)),
+    (TribeOutSchema, Tribe(name="Unsaved", region="SA")),
+    (ArtistOutSchema, _artist()),
+    (ArtistOutSchema, _artist(active_years=[])),
+    (ArtistOutSchema, _artist(tribe=None, bio=None)),
+    (ArtifactOutSchema, _artifact()),
+    (ArtifactOutSchema, _artifact(created_date=None, era=None)),
+    (ArtifactOutSchema, _artifact(artist=None)),
+    (ArtifactOutSchema, _artifact(title="Ngurra — “Country” ✓")),
+    (
+        ArtifactOutSchema,
+        _artifact(
+            created_date=datetime.datetime(1999, 12, 31, tzinfo=datetime.timezone.utc)
+        ),
+    ),
+]
+
+
+@pytest.mark.parametrize("schema_cls,doc", CASES)
+def test_compiled_dump_matches_marshmallow(schema_cls, doc):
+    print(f"[test_compiled_dump_matches_marshmallow] {schema_cls.__name__}")
+    assert compile_schema(schema_cls())(doc) == schema_cls().dump(doc)
+
+
+class _FallbackSchema(Schema):
+    # Field kinds the compiler does not specialise must still match exactly.
+    flag = fields.Boolean()
+    count = fields.Integer(as_string=True)
+    stamp = fields.DateTime(format="%Y-%m-%d")
+    label = fields.String(dump_default="n/a")
+    region = fields.String(attribute="tribe.region")
+    shout = fields.Method("make_shout")
+    years = fields.List(fields.Integer())
+
+    def make_shout(self, obj):
+        return obj.name.upper()
+
+
+def test_compiled_dump_fallback_fields():
+    print("[test_compiled_dump_fallback_fields] unspecialised fields → marshmallow")
+    artist = _artist()
+    artist.flag, artist.count = True, 7
+    artist.stamp = datetime.datetime(2020, 1, 2)
+    schema = _FallbackSchema()
+    assert compile_schema(schema)(artist) == schema.dump(artist)
+
+
+@pytest.mark.parametrize("schema_cls,doc", CASES)
+def test_encoded_bytes_match_jsonify(schema_cls, doc, monkeypatch):
+    print(f"[test_encoded_bytes_match_jsonify] {schema_cls.__name__}")
+    monkeypatch.setattr(serialization, "FAST_SERIALIZATION", True)
+    payload = schema_cls().dump(doc)
+    with app.app_context():
+        app.config["TESTING"] = True
+        from flask import jsonify
+
+        expected = jsonify(payload).get_data()
+        assert serialization.json_response(payload).get_data() == expected
+        assert serialization.dumps(payload) + "\n" == expected.decode()
+        assert json.loads(expected) == payload